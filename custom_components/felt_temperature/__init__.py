@@ -1,33 +1,68 @@
 from __future__ import annotations
 
 import logging
-
-from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.typing import ConfigType
+from typing import TYPE_CHECKING
 
 from .const import DOMAIN
 
+# Home Assistant is only imported for type checking so that the calculation
+# core (core.py, utci.py) can be imported by tools running outside of it.
+if TYPE_CHECKING:
+    from homeassistant.config_entries import ConfigEntry
+    from homeassistant.core import HomeAssistant
+    from homeassistant.helpers.typing import ConfigType
+
 _LOGGER = logging.getLogger(__name__)
 
-PLATFORMS = [Platform.SENSOR]
+PLATFORMS = ["sensor"]
 
 
 async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     """Set up the Felt Temperature integration from yaml (legacy)."""
+    from .calculate import async_setup_calculate_service
+
+    async_setup_calculate_service(hass)
     return True
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Felt Temperature from a config entry."""
+    from .sources import async_track_source_registry_updates
+
     hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN][entry.entry_id] = entry.data
 
+    entry.async_on_unload(async_track_source_registry_updates(hass, entry))
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
     return True
 
 
+async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Apply a changed entry, in place if only its sources changed."""
+    from .sensor import async_reconfigure_in_place
+
+    if not async_reconfigure_in_place(hass, entry):
+        await hass.config_entries.async_reload(entry.entry_id)
+
+
+async def async_migrate_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    """Migrate an old config entry to the current version."""
+    from .sources import async_migrate_legacy_sources
+
+    if entry.version > 3:
+        return False
+
+    if entry.version < 3:
+        # Version 3 stores the source of every role instead of a list of
+        # sources that was classified on every update.
+        hass.config_entries.async_update_entry(
+            entry, data=async_migrate_legacy_sources(hass, entry), version=3
+        )
+        _LOGGER.debug("Migrated %s to version 3", entry.title)
+    return True
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload Felt Temperature config entry."""
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
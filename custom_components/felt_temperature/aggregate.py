@@ -0,0 +1,89 @@
+"""Incremental combination of the values of several sources of one input."""
+
+from __future__ import annotations
+
+from bisect import bisect_left, insort
+from collections.abc import Mapping
+import math
+
+from .const import AGGREGATION_MEDIAN, AGGREGATION_TRIMMED_MEAN
+
+# Share of the values dropped at each end by the trimmed mean.
+TRIM_FRACTION = 0.2
+
+
+class SourceAggregate:
+    """Median, trimmed mean or weighted mean of the current source values.
+
+    Only the source that changed is updated: its old value is removed from
+    a sorted list and from the running sums and the new value is inserted,
+    so an update costs a binary search and a list shift instead of a pass
+    over every source. Reading the median or the weighted mean is O(1), the
+    trimmed mean sums the trimmed ends only.
+
+    A source without a valid value is evicted until it reports again. NaN
+    and infinite values count as invalid, they cannot be ordered in the
+    sorted list and would poison the running sums.
+    """
+
+    __slots__ = (
+        "_method",
+        "_sorted",
+        "_sum",
+        "_values",
+        "_weight_total",
+        "_weighted_sum",
+        "_weights",
+    )
+
+    def __init__(self, method: str, weights: Mapping[str, float] | None = None) -> None:
+        """Initialize an aggregate without values."""
+        self._method = method
+        self._weights = dict(weights or {})
+        self._values: dict[str, float] = {}
+        self._sorted: list[float] = []
+        self._sum = 0.0
+        self._weighted_sum = 0.0
+        self._weight_total = 0.0
+
+    def __len__(self) -> int:
+        """Return the number of sources with a valid value."""
+        return len(self._values)
+
+    def update(self, source: str, value: float | None) -> None:
+        """Set the value of source, None or a non-finite value evicts it."""
+        weight = self._weights.get(source, 1.0)
+        if (old := self._values.pop(source, None)) is not None:
+            del self._sorted[bisect_left(self._sorted, old)]
+            self._sum -= old
+            self._weighted_sum -= weight * old
+            self._weight_total -= weight
+        if value is not None and math.isfinite(value):
+            self._values[source] = value
+            insort(self._sorted, value)
+            self._sum += value
+            self._weighted_sum += weight * value
+            self._weight_total += weight
+        if not self._values:
+            # Start over from zero so rounding errors do not accumulate.
+            self._sum = self._weighted_sum = self._weight_total = 0.0
+
+    @property
+    def value(self) -> float | None:
+        """Return the combined value, None without any valid source."""
+        values = self._sorted
+        if not (count := len(values)):
+            return None
+        if self._method == AGGREGATION_MEDIAN:
+            middle = count // 2
+            if count % 2:
+                return values[middle]
+            return (values[middle - 1] + values[middle]) / 2.0
+        if self._method == AGGREGATION_TRIMMED_MEAN:
+            if not (trim := int(count * TRIM_FRACTION)):
+                return self._sum / count
+            trimmed = sum(values[:trim]) + sum(values[-trim:])
+            return (self._sum - trimmed) / (count - 2 * trim)
+        if self._weight_total <= 0:
+            return None
+        return self._weighted_sum / self._weight_total
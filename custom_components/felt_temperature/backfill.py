@@ -0,0 +1,249 @@
+"""Recompute felt temperature history and import it as long-term statistics."""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+import logging
+
+from homeassistant.components.recorder import get_instance, history
+from homeassistant.components.recorder.models import (
+    StatisticData,
+    StatisticMeanType,
+    StatisticMetaData,
+)
+from homeassistant.components.recorder.statistics import async_import_statistics
+from homeassistant.core import HomeAssistant, State
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.util import dt as dt_util
+
+from .coordinator import ROLE_HUMIDITY, ROLE_TEMPERATURE, ROLE_WIND_SPEED
+from .core import felt_temperature_array, from_celsius_array, round_to_one_decimal_array
+
+_LOGGER = logging.getLogger(__name__)
+
+# History is read and computed one chunk at a time to bound memory use, a
+# week of 5 minute data from four sources is about 8000 states.
+CHUNK = timedelta(days=7)
+HOUR = 3600.0
+
+Parser = Callable[[str, State], float | None]
+
+
+@dataclass(slots=True, frozen=True)
+class BackfillSources:
+    """Source entities and settings a felt temperature series is computed from."""
+
+    temperature: str
+    humidity: str
+    wind_speed: str | None
+    mean_radiant_temperature: str | None
+    model: str
+    unit: str
+
+    @property
+    def entity_ids(self) -> list[str]:
+        """Return the distinct source entity ids."""
+        return list(
+            dict.fromkeys(
+                entity_id
+                for entity_id in (
+                    self.temperature,
+                    self.humidity,
+                    self.wind_speed,
+                    self.mean_radiant_temperature,
+                )
+                if entity_id is not None
+            )
+        )
+
+
+async def async_backfill(
+    hass: HomeAssistant,
+    statistic_id: str,
+    sources: BackfillSources,
+    parse: Parser,
+    start_time: datetime,
+    end_time: datetime | None = None,
+) -> int:
+    """Import hourly statistics for statistic_id between start and end time.
+
+    Only complete hours before end_time (default now) are imported. Reading
+    the history and computing the series runs in executor threads, one chunk
+    at a time, so the event loop is never blocked. Returns the number of
+    imported hours.
+    """
+    if "recorder" not in hass.config.components:
+        raise ServiceValidationError("Backfill requires the recorder integration")
+
+    now = dt_util.utcnow()
+    # Times from the action are naive when given without a time zone, they
+    # are in the local time zone like in the UI.
+    end = _floor_hour(min(dt_util.as_utc(end_time), now) if end_time else now)
+    start = _floor_hour(dt_util.as_utc(start_time))
+    if start >= end:
+        raise ServiceValidationError(
+            "Backfill start time must be at least one full hour before the end time"
+        )
+
+    metadata = StatisticMetaData(
+        has_sum=False,
+        mean_type=StatisticMeanType.ARITHMETIC,
+        name=None,
+        source="recorder",
+        statistic_id=statistic_id,
+        unit_of_measurement=sources.unit,
+    )
+    recorder = get_instance(hass)
+    imported = 0
+    chunk_start = start
+    while chunk_start < end:
+        chunk_end = min(chunk_start + CHUNK, end)
+        states = await recorder.async_add_executor_job(
+            _read_history, hass, sources.entity_ids, chunk_start, chunk_end
+        )
+        statistics = await hass.async_add_executor_job(
+            compile_statistics,
+            sources,
+            parse,
+            states,
+            chunk_start.timestamp(),
+            chunk_end.timestamp(),
+        )
+        if statistics:
+            async_import_statistics(hass, metadata, statistics)
+        imported += len(statistics)
+        chunk_start = chunk_end
+
+    _LOGGER.debug(
+        "Backfilled %s hours of %s between %s and %s",
+        imported,
+        statistic_id,
+        start,
+        end,
+    )
+    return imported
+
+
+def _floor_hour(value: datetime) -> datetime:
+    return value.replace(minute=0, second=0, microsecond=0)
+
+
+def _read_history(
+    hass: HomeAssistant, entity_ids: list[str], start: datetime, end: datetime
+) -> dict[str, list[State]]:
+    """Return every recorded state of entity_ids, including the one at start."""
+    return history.get_significant_states(
+        hass,
+        start,
+        end,
+        entity_ids,
+        include_start_time_state=True,
+        significant_changes_only=False,
+    )
+
+
+def compile_statistics(
+    sources: BackfillSources,
+    parse: Parser,
+    states: dict[str, list[State]],
+    start: float,
+    end: float,
+) -> list[StatisticData]:
+    """Return hourly mean/min/max statistics of the felt temperature.
+
+    Source values are held from one recorded state to the next, the felt
+    temperature is computed for all of those segments in one vectorized call
+    and the segments are then weighted by their duration within each hour.
+    """
+
+    def series(entity_id: str | None, role: str) -> list[tuple[float, float | None]]:
+        if entity_id is None:
+            return []
+        return [
+            (max(state.last_updated_timestamp, start), parse(role, state))
+            for state in states.get(entity_id, ())
+        ]
+
+    times, (ta, rh, va, tmrt) = _merge(
+        [
+            series(sources.temperature, ROLE_TEMPERATURE),
+            series(sources.humidity, ROLE_HUMIDITY),
+            series(sources.wind_speed, ROLE_WIND_SPEED),
+            series(sources.mean_radiant_temperature, ROLE_TEMPERATURE),
+        ]
+    )
+    valid = [
+        index
+        for index in range(len(times))
+        if ta[index] is not None and rh[index] is not None
+    ]
+    if not valid:
+        return []
+
+    valid_ta = [ta[index] for index in valid]
+    values = felt_temperature_array(
+        valid_ta,
+        [rh[index] for index in valid],
+        [0.0 if va[index] is None else va[index] for index in valid],
+        model=sources.model,
+        tmrt=[
+            valid_ta[position] if tmrt[index] is None else tmrt[index]
+            for position, index in enumerate(valid)
+        ],
+    )
+    values = round_to_one_decimal_array(from_celsius_array(values, sources.unit))
+
+    ends = [*times[1:], end]
+    return _hourly(
+        (times[index], ends[index], float(value))
+        for index, value in zip(valid, values, strict=True)
+    )
+
+
+def _merge(
+    series: list[list[tuple[float, float | None]]],
+) -> tuple[list[float], list[list[float | None]]]:
+    """Align series on the union of their timestamps, holding the last value."""
+    times = sorted({timestamp for values in series for timestamp, _ in values})
+    columns: list[list[float | None]] = []
+    for values in series:
+        column: list[float | None] = []
+        index = 0
+        current = None
+        for timestamp in times:
+            while index < len(values) and values[index][0] <= timestamp:
+                current = values[index][1]
+                index += 1
+            column.append(current)
+        columns.append(column)
+    return times, columns
+
+
+def _hourly(segments: Iterable[tuple[float, float, float]]) -> list[StatisticData]:
+    """Return time weighted hourly statistics of constant valued segments."""
+    hours: dict[float, list[float]] = {}
+    for begin, finish, value in segments:
+        while begin < finish:
+            hour = begin - begin % HOUR
+            stop = min(finish, hour + HOUR)
+            duration = stop - begin
+            if (bucket := hours.get(hour)) is None:
+                hours[hour] = [value * duration, duration, value, value]
+            else:
+                bucket[0] += value * duration
+                bucket[1] += duration
+                bucket[2] = min(bucket[2], value)
+                bucket[3] = max(bucket[3], value)
+            begin = stop
+
+    return [
+        StatisticData(
+            start=dt_util.utc_from_timestamp(hour),
+            mean=weighted / duration,
+            min=minimum,
+            max=maximum,
+        )
+        for hour, (weighted, duration, minimum, maximum) in sorted(hours.items())
+    ]
@@ -0,0 +1,233 @@
+"""The felt_temperature.calculate action, felt temperature of many inputs."""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from collections.abc import Mapping, Sequence
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.const import ATTR_ENTITY_ID
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+
+from .const import (
+    ATTR_FELT_TEMPERATURE,
+    CLIMATE_DOMAIN,
+    DOMAIN,
+    MODEL_SIMPLE,
+    MODEL_UTCI,
+    WEATHER_DOMAIN,
+)
+from .coordinator import (
+    ROLE_HUMIDITY,
+    ROLE_TEMPERATURE,
+    ROLE_WIND_SPEED,
+    async_get_coordinator,
+)
+from .core import (
+    CELSIUS,
+    METERS_PER_SECOND,
+    SPEED_UNITS,
+    TEMPERATURE_UNITS,
+    felt_temperature_array,
+    from_celsius_array,
+    round_to_one_decimal_array,
+    to_celsius_array,
+    to_meters_per_second_array,
+)
+
+SERVICE_CALCULATE = "calculate"
+ATTR_INPUTS = "inputs"
+ATTR_MODEL = "model"
+ATTR_UNIT = "unit"
+ATTR_RESULTS = "results"
+ATTR_TEMPERATURE = "temperature"
+ATTR_HUMIDITY = "humidity"
+ATTR_WIND_SPEED = "wind_speed"
+ATTR_TEMPERATURE_UNIT = "temperature_unit"
+ATTR_WIND_SPEED_UNIT = "wind_speed_unit"
+
+# Batches larger than this are calculated in an executor thread.
+EXECUTOR_THRESHOLD = 1000
+MAX_INPUTS = 100_000
+
+_INPUT_KEYS = (
+    ATTR_TEMPERATURE,
+    ATTR_HUMIDITY,
+    ATTR_WIND_SPEED,
+    ATTR_TEMPERATURE_UNIT,
+    ATTR_WIND_SPEED_UNIT,
+)
+_INPUT_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_TEMPERATURE): vol.Coerce(float),
+        vol.Required(ATTR_HUMIDITY): vol.All(
+            vol.Coerce(float), vol.Range(min=0, max=100)
+        ),
+        vol.Optional(ATTR_WIND_SPEED, default=0.0): vol.All(
+            vol.Coerce(float), vol.Range(min=0)
+        ),
+        vol.Optional(ATTR_TEMPERATURE_UNIT): vol.In(TEMPERATURE_UNITS),
+        vol.Optional(ATTR_WIND_SPEED_UNIT, default=METERS_PER_SECOND): vol.In(
+            SPEED_UNITS
+        ),
+    }
+)
+
+
+def _input(value: Any) -> dict[str, Any]:
+    """Validate one input, a mapping or a list in the order of _INPUT_KEYS."""
+    if isinstance(value, Sequence) and not isinstance(value, str):
+        if not 2 <= len(value) <= len(_INPUT_KEYS):
+            raise vol.Invalid(
+                "expected [temperature, humidity, wind_speed, temperature_unit,"
+                " wind_speed_unit] with at least temperature and humidity"
+            )
+        value = dict(zip(_INPUT_KEYS, value, strict=False))
+    if not isinstance(value, Mapping):
+        raise vol.Invalid("expected a mapping or a list")
+    return _INPUT_SCHEMA(dict(value))
+
+
+CALCULATE_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            vol.Optional(ATTR_INPUTS): vol.All(
+                cv.ensure_list, vol.Length(max=MAX_INPUTS), [_input]
+            ),
+            vol.Optional(ATTR_ENTITY_ID): cv.entity_ids,
+            vol.Optional(ATTR_MODEL, default=MODEL_SIMPLE): vol.In(
+                [MODEL_SIMPLE, MODEL_UTCI]
+            ),
+            vol.Optional(ATTR_UNIT): vol.In(TEMPERATURE_UNITS),
+        }
+    ),
+    cv.has_at_least_one_key(ATTR_INPUTS, ATTR_ENTITY_ID),
+)
+
+
+def calculate(
+    inputs: Sequence[Mapping[str, Any]], model: str, unit: str
+) -> list[float | None]:
+    """Return the rounded felt temperature of every input in unit.
+
+    Inputs sharing their units are converted and calculated in one
+    vectorized call per group, a batch normally is a single group.
+    """
+    groups: defaultdict[tuple[str, str], list[int]] = defaultdict(list)
+    for index, item in enumerate(inputs):
+        groups[item[ATTR_TEMPERATURE_UNIT], item[ATTR_WIND_SPEED_UNIT]].append(index)
+
+    results: list[float | None] = [None] * len(inputs)
+    for (temperature_unit, wind_speed_unit), indices in groups.items():
+        ta = to_celsius_array(
+            [inputs[index][ATTR_TEMPERATURE] for index in indices], temperature_unit
+        )
+        rh = [inputs[index][ATTR_HUMIDITY] for index in indices]
+        va = to_meters_per_second_array(
+            [inputs[index][ATTR_WIND_SPEED] for index in indices], wind_speed_unit
+        )
+        felt = round_to_one_decimal_array(
+            from_celsius_array(felt_temperature_array(ta, rh, va, model), unit)
+        )
+        for index, value in zip(indices, felt, strict=True):
+            results[index] = float(value)
+    return results
+
+
+@callback
+def _async_entity_inputs(
+    hass: HomeAssistant, entity_ids: list[str]
+) -> list[dict[str, Any] | None]:
+    """Return the inputs read from weather or climate entities.
+
+    Values are parsed like sensor sources, already in °C and m/s. None for
+    entities without a valid temperature and humidity.
+    """
+    coordinator = async_get_coordinator(hass)
+    inputs: list[dict[str, Any] | None] = []
+    for entity_id in entity_ids:
+        if (domain := entity_id.partition(".")[0]) not in (
+            WEATHER_DOMAIN,
+            CLIMATE_DOMAIN,
+        ):
+            raise ServiceValidationError(
+                f"{entity_id} is not a weather or climate entity"
+            )
+        if (state := hass.states.get(entity_id)) is None:
+            raise ServiceValidationError(f"{entity_id} does not exist")
+        temperature = coordinator.parse(ROLE_TEMPERATURE, state)
+        humidity = coordinator.parse(ROLE_HUMIDITY, state)
+        if temperature is None or humidity is None:
+            inputs.append(None)
+            continue
+        wind_speed = None
+        if domain == WEATHER_DOMAIN:
+            wind_speed = coordinator.parse(ROLE_WIND_SPEED, state)
+        inputs.append(
+            {
+                ATTR_TEMPERATURE: temperature,
+                ATTR_HUMIDITY: humidity,
+                ATTR_WIND_SPEED: wind_speed or 0.0,
+                ATTR_TEMPERATURE_UNIT: CELSIUS,
+                ATTR_WIND_SPEED_UNIT: METERS_PER_SECOND,
+            }
+        )
+    return inputs
+
+
+async def _async_calculate(call: ServiceCall) -> ServiceResponse:
+    """Handle felt_temperature.calculate."""
+    hass = call.hass
+    # Temperatures without a unit are in the unit of the unit system, like
+    # sources without one, and so is the result unless a unit is given.
+    system_unit = async_get_coordinator(hass).temperature_unit
+    unit = call.data.get(ATTR_UNIT, system_unit)
+    entity_ids = call.data.get(ATTR_ENTITY_ID, [])
+    entity_inputs = _async_entity_inputs(hass, entity_ids)
+    inputs = [
+        {ATTR_TEMPERATURE_UNIT: system_unit, **item}
+        for item in call.data.get(ATTR_INPUTS, [])
+    ]
+    inputs.extend(item for item in entity_inputs if item is not None)
+
+    if len(inputs) > EXECUTOR_THRESHOLD:
+        felt = await hass.async_add_executor_job(
+            calculate, inputs, call.data[ATTR_MODEL], unit
+        )
+    else:
+        felt = calculate(inputs, call.data[ATTR_MODEL], unit)
+
+    values = iter(felt)
+    results: list[dict[str, Any]] = [
+        {ATTR_FELT_TEMPERATURE: next(values)} for _ in call.data.get(ATTR_INPUTS, [])
+    ]
+    results.extend(
+        {
+            ATTR_ENTITY_ID: entity_id,
+            ATTR_FELT_TEMPERATURE: None if item is None else next(values),
+        }
+        for entity_id, item in zip(entity_ids, entity_inputs, strict=True)
+    )
+    return {ATTR_RESULTS: results, ATTR_UNIT: unit}
+
+
+@callback
+def async_setup_calculate_service(hass: HomeAssistant) -> None:
+    """Register the felt_temperature.calculate action."""
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_CALCULATE,
+        _async_calculate,
+        schema=CALCULATE_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
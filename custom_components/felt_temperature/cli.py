@@ -0,0 +1,262 @@
+"""Compute the felt temperature of CSV or Parquet files outside Home Assistant.
+
+    python -m custom_components.felt_temperature.cli weather.csv felt.csv \\
+        --temperature-unit °F --wind-unit km/h
+
+Rows are read, calculated and written one chunk at a time, so memory stays
+bounded no matter how large the file is. Every chunk goes through the same
+array functions of core.py as the sensor, with the same unit handling: the
+temperature is converted to Celsius, the wind speed to m/s, and a missing
+wind column counts as no wind. Rows without a valid temperature or humidity
+get an empty result. The output holds the input columns and the felt
+temperature, rounded to one decimal like the sensor state.
+
+Parquet files need pyarrow. When it is installed CSV files are read and
+written with it too, which is much faster than the csv module fallback.
+"""
+
+from __future__ import annotations
+
+import argparse
+from collections.abc import Iterable, Iterator, Sequence
+from contextlib import nullcontext
+import csv
+from itertools import islice
+import math
+from pathlib import Path
+import sys
+from typing import Any, TextIO
+
+from . import core
+from .const import MODEL_SIMPLE, MODEL_UTCI
+
+DEFAULT_CHUNK_SIZE = 100_000
+DEFAULT_OUTPUT_COLUMN = "felt_temperature"
+# Bytes per row used to size the blocks of the pyarrow CSV reader.
+_CSV_ROW_BYTES = 64
+
+
+def _pyarrow() -> Any:
+    """Return the pyarrow module, None if it is not installed."""
+    try:
+        import pyarrow
+    except ImportError:
+        return None
+    return pyarrow
+
+
+def _is_parquet(path: str) -> bool:
+    return Path(path).suffix.lower() in (".parquet", ".pq")
+
+
+def _open(path: str, mode: str, standard: TextIO) -> Any:
+    """Open path as text for the csv module, - is the standard stream."""
+    if path == "-":
+        return nullcontext(standard)
+    return open(path, mode, newline="", encoding="utf-8")
+
+
+def _to_float(value: str | None) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+def _format(value: float | None) -> str:
+    return "" if value is None or math.isnan(value) else repr(float(value))
+
+
+def compute_chunk(
+    temperature: core.ArrayLike,
+    humidity: core.ArrayLike,
+    wind_speed: core.ArrayLike | None,
+    args: argparse.Namespace,
+    tmrt: core.ArrayLike | None = None,
+) -> core.ArrayLike:
+    """Return the rounded felt temperature of one chunk in the output unit.
+
+    Missing values are NaN, wind_speed None means no wind.
+    """
+    ta = core.to_celsius_array(temperature, args.temperature_unit)
+    if wind_speed is None:
+        va = [0.0] * len(ta)
+    else:
+        va = core.to_meters_per_second_array(wind_speed, args.wind_unit)
+    if tmrt is not None:
+        tmrt = core.to_celsius_array(tmrt, args.temperature_unit)
+    felt = core.felt_temperature_array(ta, humidity, va, args.model, tmrt)
+    return core.round_to_one_decimal_array(
+        core.from_celsius_array(felt, args.output_unit)
+    )
+
+
+def iter_chunks(rows: Iterable[Any], chunk_size: int) -> Iterator[list[Any]]:
+    """Yield lists of up to chunk_size rows."""
+    rows = iter(rows)
+    while chunk := list(islice(rows, chunk_size)):
+        yield chunk
+
+
+def _column(header: list[str], name: str | None) -> int | None:
+    if name is None:
+        return None
+    try:
+        return header.index(name)
+    except ValueError:
+        raise SystemExit(f"Column {name} not found in the input") from None
+
+
+def _process_csv(args: argparse.Namespace, source: TextIO, target: TextIO) -> int:
+    """Process a CSV file with the csv module, return the number of rows."""
+    reader = csv.reader(source)
+    if (header := next(reader, None)) is None:
+        return 0
+    columns = {
+        name: _column(header, getattr(args, f"{name}_column"))
+        for name in ("temperature", "humidity", "wind", "tmrt")
+    }
+    writer = csv.writer(target, lineterminator="\n")
+    writer.writerow([*header, args.output_column])
+    rows_written = 0
+    for rows in iter_chunks(reader, args.chunk_size):
+        values = {
+            name: [_to_float(row[index]) for row in rows]
+            for name, index in columns.items()
+            if index is not None
+        }
+        felt = compute_chunk(
+            values["temperature"],
+            values["humidity"],
+            values.get("wind"),
+            args,
+            values.get("tmrt"),
+        )
+        writer.writerows(
+            [*row, _format(value)] for row, value in zip(rows, felt, strict=True)
+        )
+        rows_written += len(rows)
+    return rows_written
+
+
+def _arrow_column(pa: Any, batch: Any, name: str | None) -> Any:
+    if name is None:
+        return None
+    if name not in batch.schema.names:
+        raise SystemExit(f"Column {name} not found in the input")
+    column = batch.column(name).cast(pa.float64())
+    return column.to_numpy(zero_copy_only=False)
+
+
+def _process_arrow(args: argparse.Namespace) -> int:
+    """Process a file with pyarrow, return the number of rows."""
+    pa = _pyarrow()
+    import pyarrow.csv
+    import pyarrow.parquet
+
+    if _is_parquet(args.input):
+        batches = pyarrow.parquet.ParquetFile(args.input).iter_batches(
+            batch_size=args.chunk_size
+        )
+    else:
+        batches = pyarrow.csv.open_csv(
+            args.input,
+            read_options=pyarrow.csv.ReadOptions(
+                block_size=args.chunk_size * _CSV_ROW_BYTES
+            ),
+        )
+
+    writer = None
+    rows_written = 0
+    try:
+        for batch in batches:
+            felt = compute_chunk(
+                _arrow_column(pa, batch, args.temperature_column),
+                _arrow_column(pa, batch, args.humidity_column),
+                _arrow_column(pa, batch, args.wind_column),
+                args,
+                _arrow_column(pa, batch, args.tmrt_column),
+            )
+            table = pa.Table.from_batches([batch]).append_column(
+                args.output_column, pa.array(felt, from_pandas=True)
+            )
+            if writer is None:
+                if _is_parquet(args.output):
+                    writer = pyarrow.parquet.ParquetWriter(args.output, table.schema)
+                else:
+                    writer = pyarrow.csv.CSVWriter(
+                        sys.stdout.buffer if args.output == "-" else args.output,
+                        table.schema,
+                    )
+            writer.write_table(table)
+            rows_written += batch.num_rows
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows_written
+
+
+def _parse_args(argv: Sequence[str] | None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m custom_components.felt_temperature.cli",
+        description="Compute the felt temperature of a CSV or Parquet file.",
+    )
+    parser.add_argument("input", help="CSV or Parquet file, - reads CSV from stdin")
+    parser.add_argument(
+        "output", nargs="?", default="-", help="CSV or Parquet file, default stdout"
+    )
+    parser.add_argument("--temperature-column", default="temperature")
+    parser.add_argument("--humidity-column", default="humidity")
+    parser.add_argument(
+        "--wind-column", help="wind speed column, no wind when not given"
+    )
+    parser.add_argument(
+        "--tmrt-column", help="mean radiant temperature column for the UTCI model"
+    )
+    parser.add_argument("--output-column", default=DEFAULT_OUTPUT_COLUMN)
+    parser.add_argument(
+        "--temperature-unit", choices=core.TEMPERATURE_UNITS, default=core.CELSIUS
+    )
+    parser.add_argument(
+        "--wind-unit", choices=core.SPEED_UNITS, default=core.METERS_PER_SECOND
+    )
+    parser.add_argument(
+        "--output-unit", choices=core.TEMPERATURE_UNITS, default=core.CELSIUS
+    )
+    parser.add_argument(
+        "--model", choices=(MODEL_SIMPLE, MODEL_UTCI), default=MODEL_SIMPLE
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=DEFAULT_CHUNK_SIZE,
+        help="rows read and calculated at a time",
+    )
+    args = parser.parse_args(argv)
+    if args.chunk_size < 1:
+        parser.error("--chunk-size must be positive")
+    if _is_parquet(args.output) or _is_parquet(args.input):
+        if _pyarrow() is None:
+            parser.error("Parquet files need pyarrow")
+        if args.input == "-":
+            parser.error("Parquet files cannot be used with stdin")
+    return args
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Run the command line interface, return the exit code."""
+    args = _parse_args(argv)
+    if args.input != "-" and _pyarrow() is not None:
+        rows = _process_arrow(args)
+    else:
+        with (
+            _open(args.input, "r", sys.stdin) as source,
+            _open(args.output, "w", sys.stdout) as target,
+        ):
+            rows = _process_csv(args, source, target)
+    print(f"Calculated {rows} rows", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
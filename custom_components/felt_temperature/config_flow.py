@@ -1,25 +1,78 @@
 from __future__ import annotations
 
 from homeassistant import config_entries
+from homeassistant.config_entries import ConfigEntryState
 from homeassistant.const import CONF_NAME
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.selector import selector
 import voluptuous as vol
 
 from .const import (
+    AGGREGATION_MEDIAN,
+    AGGREGATION_TRIMMED_MEAN,
+    AGGREGATION_WEIGHTED_MEAN,
+    CONF_ADDITIONAL_HUMIDITY_SOURCES,
+    CONF_ADDITIONAL_TEMPERATURE_SOURCES,
+    CONF_ADDITIONAL_WIND_SOURCES,
+    CONF_AGGREGATION,
+    CONF_FILTER_WINDOW,
+    CONF_FORECAST,
     CONF_HUMIDITY_SOURCE,
+    CONF_INDICES,
+    CONF_MAX_AGE,
+    CONF_MIN_INTERVAL,
     CONF_MODE,
+    CONF_MODEL,
+    CONF_MRT_SOURCE,
+    CONF_ROLLING_WINDOWS,
+    CONF_SOURCE_VALUE_ATTRIBUTES,
+    CONF_SOURCE_WEIGHTS,
+    CONF_TEMPERATURE_FILTER,
     CONF_TEMPERATURE_SOURCE,
+    CONF_WIND_FILTER,
     CONF_WIND_SOURCE,
+    DEFAULT_AGGREGATION,
+    DEFAULT_FILTER,
+    DEFAULT_FILTER_WINDOW,
+    DEFAULT_FORECAST,
+    DEFAULT_MAX_AGE,
+    DEFAULT_MIN_INTERVAL,
+    DEFAULT_MODEL,
     DEFAULT_NAME,
+    DEFAULT_SOURCE_VALUE_ATTRIBUTES,
     DOMAIN,
+    FILTER_EMA,
+    FILTER_MAX,
+    FILTER_MEAN,
+    FILTER_NONE,
+    FORECAST_DAILY,
+    FORECAST_HOURLY,
+    FORECAST_NONE,
+    FORECAST_TWICE_DAILY,
+    INDICES,
     MODE_SEPARATE,
     MODE_WEATHER,
+    MODEL_SIMPLE,
+    MODEL_UTCI,
+    ROLLING_WINDOWS,
 )
 
 
+def _valid_weights(weights) -> bool:
+    """Return whether weights maps source entity ids to positive numbers."""
+    if not weights:
+        return True
+    return isinstance(weights, dict) and all(
+        isinstance(entity_id, str)
+        and isinstance(weight, (int, float))
+        and not isinstance(weight, bool)
+        and weight > 0
+        for entity_id, weight in weights.items()
+    )
+
+
 class FeltTemperatureFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
-    VERSION = 2
+    VERSION = 3
 
     def __init__(self) -> None:
         self._data: dict = {}
@@ -191,17 +244,21 @@ class FeltTemperatureFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
             if not user_input.get(CONF_TEMPERATURE_SOURCE):
                 errors["base"] = "missing_weather"
             else:
-                # Update entry data and reload
+                # Update entry data
                 new_data = {
                     **(config_entry.data if config_entry else {}),
                     **self._data,
                     CONF_TEMPERATURE_SOURCE: user_input[CONF_TEMPERATURE_SOURCE],
                 }
                 if config_entry:
+                    # A loaded entry applies the change in its update listener.
                     self.hass.config_entries.async_update_entry(
                         config_entry, data=new_data
                     )
-                    await self.hass.config_entries.async_reload(config_entry.entry_id)
+                    if config_entry.state is not ConfigEntryState.LOADED:
+                        await self.hass.config_entries.async_reload(
+                            config_entry.entry_id
+                        )
                 return self.async_abort(reason="reconfigured")
 
         schema = vol.Schema(
@@ -247,10 +304,14 @@ class FeltTemperatureFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
                     CONF_WIND_SOURCE: user_input.get(CONF_WIND_SOURCE),
                 }
                 if config_entry:
+                    # A loaded entry applies the change in its update listener.
                     self.hass.config_entries.async_update_entry(
                         config_entry, data=new_data
                     )
-                    await self.hass.config_entries.async_reload(config_entry.entry_id)
+                    if config_entry.state is not ConfigEntryState.LOADED:
+                        await self.hass.config_entries.async_reload(
+                            config_entry.entry_id
+                        )
                 return self.async_abort(reason="reconfigured")
 
         schema = vol.Schema(
@@ -308,11 +369,49 @@ class FeltTemperatureOptionsFlowHandler(config_entries.OptionsFlow):
         current_mode = config_entry.options.get(
             CONF_MODE, config_entry.data.get(CONF_MODE, MODE_WEATHER)
         )
+        current_min_interval = config_entry.options.get(
+            CONF_MIN_INTERVAL, DEFAULT_MIN_INTERVAL
+        )
+        current_max_age = config_entry.options.get(CONF_MAX_AGE, DEFAULT_MAX_AGE)
+        current_model = config_entry.options.get(CONF_MODEL, DEFAULT_MODEL)
+        current_mrt = config_entry.options.get(CONF_MRT_SOURCE)
+        current_temperature_filter = config_entry.options.get(
+            CONF_TEMPERATURE_FILTER, DEFAULT_FILTER
+        )
+        current_wind_filter = config_entry.options.get(CONF_WIND_FILTER, DEFAULT_FILTER)
+        current_filter_window = config_entry.options.get(
+            CONF_FILTER_WINDOW, DEFAULT_FILTER_WINDOW
+        )
+        current_indices = config_entry.options.get(CONF_INDICES, [])
+        current_windows = config_entry.options.get(CONF_ROLLING_WINDOWS, [])
+        current_source_values = config_entry.options.get(
+            CONF_SOURCE_VALUE_ATTRIBUTES, DEFAULT_SOURCE_VALUE_ATTRIBUTES
+        )
 
         if user_input is not None:
             self._data[CONF_NAME] = user_input.get(CONF_NAME, current_name)
             mode = user_input.get(CONF_MODE, current_mode)
             self._data[CONF_MODE] = mode
+            self._data[CONF_MIN_INTERVAL] = user_input.get(
+                CONF_MIN_INTERVAL, current_min_interval
+            )
+            self._data[CONF_MAX_AGE] = user_input.get(CONF_MAX_AGE, current_max_age)
+            self._data[CONF_TEMPERATURE_FILTER] = user_input.get(
+                CONF_TEMPERATURE_FILTER, current_temperature_filter
+            )
+            self._data[CONF_WIND_FILTER] = user_input.get(
+                CONF_WIND_FILTER, current_wind_filter
+            )
+            self._data[CONF_FILTER_WINDOW] = user_input.get(
+                CONF_FILTER_WINDOW, current_filter_window
+            )
+            self._data[CONF_MODEL] = user_input.get(CONF_MODEL, current_model)
+            self._data[CONF_MRT_SOURCE] = user_input.get(CONF_MRT_SOURCE)
+            self._data[CONF_INDICES] = user_input.get(CONF_INDICES, [])
+            self._data[CONF_ROLLING_WINDOWS] = user_input.get(CONF_ROLLING_WINDOWS, [])
+            self._data[CONF_SOURCE_VALUE_ATTRIBUTES] = user_input.get(
+                CONF_SOURCE_VALUE_ATTRIBUTES, current_source_values
+            )
             if mode == MODE_WEATHER:
                 return await self.async_step_weather()
             return await self.async_step_separate()
@@ -323,6 +422,84 @@ class FeltTemperatureOptionsFlowHandler(config_entries.OptionsFlow):
                 vol.Required(CONF_MODE, default=current_mode): selector(
                     {"select": {"options": [MODE_WEATHER, MODE_SEPARATE]}}
                 ),
+                vol.Optional(CONF_MIN_INTERVAL, default=current_min_interval): selector(
+                    {
+                        "number": {
+                            "min": 0,
+                            "max": 3600,
+                            "step": 1,
+                            "mode": "box",
+                            "unit_of_measurement": "s",
+                        }
+                    }
+                ),
+                vol.Optional(CONF_MAX_AGE, default=current_max_age): selector(
+                    {
+                        "number": {
+                            "min": 0,
+                            "max": 86400,
+                            "step": 1,
+                            "mode": "box",
+                            "unit_of_measurement": "s",
+                        }
+                    }
+                ),
+                vol.Required(
+                    CONF_TEMPERATURE_FILTER, default=current_temperature_filter
+                ): selector(
+                    {"select": {"options": [FILTER_NONE, FILTER_MEAN, FILTER_EMA]}}
+                ),
+                vol.Required(CONF_WIND_FILTER, default=current_wind_filter): selector(
+                    {
+                        "select": {
+                            "options": [
+                                FILTER_NONE,
+                                FILTER_MEAN,
+                                FILTER_EMA,
+                                FILTER_MAX,
+                            ]
+                        }
+                    }
+                ),
+                vol.Optional(
+                    CONF_FILTER_WINDOW, default=current_filter_window
+                ): selector(
+                    {
+                        "number": {
+                            "min": 1,
+                            "max": 3600,
+                            "step": 1,
+                            "mode": "box",
+                            "unit_of_measurement": "s",
+                        }
+                    }
+                ),
+                vol.Required(CONF_MODEL, default=current_model): selector(
+                    {"select": {"options": [MODEL_SIMPLE, MODEL_UTCI]}}
+                ),
+                vol.Optional(
+                    CONF_MRT_SOURCE,
+                    description={"suggested_value": current_mrt},
+                ): selector(
+                    {
+                        "entity": {
+                            "multiple": False,
+                            "filter": {
+                                "domain": ["sensor"],
+                                "device_class": "temperature",
+                            },
+                        }
+                    }
+                ),
+                vol.Optional(CONF_INDICES, default=current_indices): selector(
+                    {"select": {"options": list(INDICES), "multiple": True}}
+                ),
+                vol.Optional(CONF_ROLLING_WINDOWS, default=current_windows): selector(
+                    {"select": {"options": list(ROLLING_WINDOWS), "multiple": True}}
+                ),
+                vol.Optional(
+                    CONF_SOURCE_VALUE_ATTRIBUTES, default=current_source_values
+                ): selector({"boolean": {}}),
             }
         )
 
@@ -335,6 +512,7 @@ class FeltTemperatureOptionsFlowHandler(config_entries.OptionsFlow):
             CONF_TEMPERATURE_SOURCE,
             config_entry.data.get(CONF_TEMPERATURE_SOURCE),
         )
+        current_forecast = config_entry.options.get(CONF_FORECAST, DEFAULT_FORECAST)
         if user_input is not None:
             if not user_input.get(CONF_TEMPERATURE_SOURCE):
                 errors["base"] = "missing_weather"
@@ -353,6 +531,18 @@ class FeltTemperatureOptionsFlowHandler(config_entries.OptionsFlow):
                         }
                     }
                 ),
+                vol.Required(CONF_FORECAST, default=current_forecast): selector(
+                    {
+                        "select": {
+                            "options": [
+                                FORECAST_NONE,
+                                FORECAST_HOURLY,
+                                FORECAST_DAILY,
+                                FORECAST_TWICE_DAILY,
+                            ]
+                        }
+                    }
+                ),
             }
         )
         return self.async_show_form(
@@ -374,12 +564,26 @@ class FeltTemperatureOptionsFlowHandler(config_entries.OptionsFlow):
             CONF_WIND_SOURCE,
             config_entry.data.get(CONF_WIND_SOURCE),
         )
+        current_additional = {
+            key: config_entry.options.get(key, [])
+            for key in (
+                CONF_ADDITIONAL_TEMPERATURE_SOURCES,
+                CONF_ADDITIONAL_HUMIDITY_SOURCES,
+                CONF_ADDITIONAL_WIND_SOURCES,
+            )
+        }
+        current_aggregation = config_entry.options.get(
+            CONF_AGGREGATION, DEFAULT_AGGREGATION
+        )
+        current_weights = config_entry.options.get(CONF_SOURCE_WEIGHTS, {})
 
         if user_input is not None:
             if not user_input.get(CONF_TEMPERATURE_SOURCE):
                 errors["base"] = "missing_temperature"
             elif not user_input.get(CONF_HUMIDITY_SOURCE):
                 errors["base"] = "missing_humidity"
+            elif not _valid_weights(user_input.get(CONF_SOURCE_WEIGHTS)):
+                errors["base"] = "invalid_weights"
             else:
                 return self.async_create_entry(
                     title="",
@@ -419,6 +623,47 @@ class FeltTemperatureOptionsFlowHandler(config_entries.OptionsFlow):
                         }
                     }
                 ),
+                **{
+                    vol.Optional(key, default=current): selector(
+                        {
+                            "entity": {
+                                "multiple": True,
+                                "filter": {"domain": domains},
+                            }
+                        }
+                    )
+                    for key, current, domains in (
+                        (
+                            CONF_ADDITIONAL_TEMPERATURE_SOURCES,
+                            current_additional[CONF_ADDITIONAL_TEMPERATURE_SOURCES],
+                            ["sensor", "climate", "weather"],
+                        ),
+                        (
+                            CONF_ADDITIONAL_HUMIDITY_SOURCES,
+                            current_additional[CONF_ADDITIONAL_HUMIDITY_SOURCES],
+                            ["sensor", "climate", "weather"],
+                        ),
+                        (
+                            CONF_ADDITIONAL_WIND_SOURCES,
+                            current_additional[CONF_ADDITIONAL_WIND_SOURCES],
+                            ["sensor", "weather"],
+                        ),
+                    )
+                },
+                vol.Required(CONF_AGGREGATION, default=current_aggregation): selector(
+                    {
+                        "select": {
+                            "options": [
+                                AGGREGATION_MEDIAN,
+                                AGGREGATION_TRIMMED_MEAN,
+                                AGGREGATION_WEIGHTED_MEAN,
+                            ]
+                        }
+                    }
+                ),
+                vol.Optional(CONF_SOURCE_WEIGHTS, default=current_weights): selector(
+                    {"object": {}}
+                ),
             }
         )
         return self.async_show_form(
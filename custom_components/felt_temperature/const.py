@@ -4,6 +4,23 @@ VERSION = "0.6"
 ISSUE_URL = "https://github.com/Nicxe/felt_temperature/issues"
 DEFAULT_NAME = "Felt Temperature"
 
+# Source domains and the attributes read from them, kept as plain strings so
+# loading the integration does not import the weather and climate components
+WEATHER_DOMAIN = "weather"
+CLIMATE_DOMAIN = "climate"
+ATTR_WEATHER_TEMPERATURE = "temperature"
+ATTR_WEATHER_TEMPERATURE_UNIT = "temperature_unit"
+ATTR_WEATHER_HUMIDITY = "humidity"
+ATTR_WEATHER_WIND_SPEED = "wind_speed"
+ATTR_WEATHER_WIND_SPEED_UNIT = "wind_speed_unit"
+ATTR_CURRENT_TEMPERATURE = "current_temperature"
+ATTR_CURRENT_HUMIDITY = "current_humidity"
+ATTR_FORECAST_TIME = "datetime"
+ATTR_FORECAST_TEMP = "temperature"
+ATTR_FORECAST_HUMIDITY = "humidity"
+ATTR_FORECAST_WIND_SPEED = "wind_speed"
+WEATHER_SERVICE_GET_FORECASTS = "get_forecasts"
+
 # Attributes
 ATTR_TEMPERATURE_SOURCE = "temperature_source"
 ATTR_TEMPERATURE_SOURCE_VALUE = "temperature_source_value"
@@ -12,6 +29,10 @@ ATTR_HUMIDITY_SOURCE_VALUE = "humidity_source_value"
 ATTR_WIND_SPEED_SOURCE = "wind_speed_source"
 ATTR_WIND_SPEED_SOURCE_VALUE = "wind_speed_source_value"
 
+# Whether the *_source_value attributes are written at all
+CONF_SOURCE_VALUE_ATTRIBUTES = "source_value_attributes"
+DEFAULT_SOURCE_VALUE_ATTRIBUTES = True
+
 # New configuration keys and modes
 CONF_MODE = "mode"
 MODE_WEATHER = "weather"
@@ -20,3 +41,90 @@ MODE_SEPARATE = "separate"
 CONF_TEMPERATURE_SOURCE = "temperature_source"
 CONF_HUMIDITY_SOURCE = "humidity_source"
 CONF_WIND_SOURCE = "wind_source"
+
+# More sources per input in separate mode, combined with the first one
+CONF_ADDITIONAL_TEMPERATURE_SOURCES = "additional_temperature_sources"
+CONF_ADDITIONAL_HUMIDITY_SOURCES = "additional_humidity_sources"
+CONF_ADDITIONAL_WIND_SOURCES = "additional_wind_sources"
+CONF_AGGREGATION = "aggregation"
+CONF_SOURCE_WEIGHTS = "source_weights"
+AGGREGATION_MEDIAN = "median"
+AGGREGATION_TRIMMED_MEAN = "trimmed_mean"
+AGGREGATION_WEIGHTED_MEAN = "weighted_mean"
+DEFAULT_AGGREGATION = AGGREGATION_MEDIAN
+
+# Calculation model, the simplified approximation or the full UTCI polynomial
+CONF_MODEL = "model"
+MODEL_SIMPLE = "simple"
+MODEL_UTCI = "utci"
+DEFAULT_MODEL = MODEL_SIMPLE
+CONF_MRT_SOURCE = "mean_radiant_temperature_source"
+
+# Comfort indices exposed as extra sensor entities, computed with the felt
+# temperature from the same inputs
+CONF_INDICES = "indices"
+INDEX_APPARENT_TEMPERATURE = "apparent_temperature"
+INDEX_DEW_POINT = "dew_point"
+INDEX_HEAT_INDEX = "heat_index"
+INDEX_HUMIDEX = "humidex"
+INDEX_WIND_CHILL = "wind_chill"
+INDICES = (
+    INDEX_APPARENT_TEMPERATURE,
+    INDEX_DEW_POINT,
+    INDEX_HEAT_INDEX,
+    INDEX_HUMIDEX,
+    INDEX_WIND_CHILL,
+)
+
+# Downsampling of high rate temperature and wind sources, the window is the
+# averaging window, or the time constant of the moving average
+CONF_TEMPERATURE_FILTER = "temperature_filter"
+CONF_WIND_FILTER = "wind_filter"
+CONF_FILTER_WINDOW = "filter_window"
+FILTER_NONE = "none"
+FILTER_MEAN = "mean"
+FILTER_EMA = "ema"
+FILTER_MAX = "max"
+DEFAULT_FILTER = FILTER_NONE
+DEFAULT_FILTER_WINDOW = 60
+
+# Rolling minimum, maximum and mean of the felt temperature, exposed as
+# attributes named like min_1h for every selected window
+CONF_ROLLING_WINDOWS = "rolling_windows"
+ROLLING_WINDOWS = {
+    "1h": 3600,
+    "3h": 3 * 3600,
+    "6h": 6 * 3600,
+    "12h": 12 * 3600,
+    "24h": 24 * 3600,
+}
+ATTR_MIN = "min"
+ATTR_MAX = "max"
+ATTR_MEAN = "mean"
+
+# Minimum number of seconds between two recalculations, 0 disables throttling
+CONF_MIN_INTERVAL = "min_update_interval"
+DEFAULT_MIN_INTERVAL = 0
+
+# Seconds after its last report a source is considered stale, 0 disables it
+CONF_MAX_AGE = "max_source_age"
+DEFAULT_MAX_AGE = 0
+
+# Forecast of the weather source exposed as an attribute, weather mode only
+CONF_FORECAST = "forecast"
+FORECAST_NONE = "none"
+FORECAST_HOURLY = "hourly"
+FORECAST_DAILY = "daily"
+FORECAST_TWICE_DAILY = "twice_daily"
+DEFAULT_FORECAST = FORECAST_NONE
+ATTR_FORECAST = "forecast"
+ATTR_FELT_TEMPERATURE = "felt_temperature"
+
+# hass.data[DOMAIN] keys shared by all config entries
+DATA_COORDINATOR = "coordinator"
+DATA_UTCI_GRID = "utci_grid"
+DATA_SENSORS = "sensors"
+DATA_TIMER_WHEEL = "timer_wheel"
+
+# UTCI lookup grid cache, stored in the Home Assistant storage directory
+UTCI_GRID_FILE = "felt_temperature.utci_grid_v1.bin"
@@ -0,0 +1,334 @@
+"""Shared source coordinator for Felt Temperature sensors."""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable
+import logging
+from typing import Any
+
+from homeassistant.const import (
+    ATTR_DEVICE_CLASS,
+    ATTR_UNIT_OF_MEASUREMENT,
+    EVENT_CORE_CONFIG_UPDATE,
+    STATE_UNAVAILABLE,
+    STATE_UNKNOWN,
+    UnitOfTemperature,
+)
+from homeassistant.core import (
+    CALLBACK_TYPE,
+    Event,
+    HomeAssistant,
+    State,
+    callback,
+    split_entity_id,
+)
+from homeassistant.helpers.event import async_track_state_change_event
+
+from .const import (
+    ATTR_CURRENT_HUMIDITY,
+    ATTR_CURRENT_TEMPERATURE,
+    ATTR_WEATHER_HUMIDITY,
+    ATTR_WEATHER_TEMPERATURE,
+    ATTR_WEATHER_TEMPERATURE_UNIT,
+    ATTR_WEATHER_WIND_SPEED,
+    ATTR_WEATHER_WIND_SPEED_UNIT,
+    CLIMATE_DOMAIN,
+    DATA_COORDINATOR,
+    DOMAIN,
+    WEATHER_DOMAIN,
+)
+from .core import to_celsius, to_meters_per_second
+
+_LOGGER = logging.getLogger(__name__)
+
+_ATTR_TEMPERATURE_UNIT = "temperature_unit"
+
+ROLE_TEMPERATURE = "temperature"
+ROLE_HUMIDITY = "humidity"
+ROLE_WIND_SPEED = "wind_speed"
+
+# Attributes read from weather and climate sources, changes to any other
+# attribute (forecast, pressure, hvac_action, setpoints, ...) are ignored.
+_WEATHER_ATTRIBUTES = (
+    ATTR_WEATHER_TEMPERATURE,
+    ATTR_WEATHER_TEMPERATURE_UNIT,
+    ATTR_WEATHER_HUMIDITY,
+    ATTR_WEATHER_WIND_SPEED,
+    ATTR_WEATHER_WIND_SPEED_UNIT,
+)
+_CLIMATE_ATTRIBUTES = (
+    ATTR_CURRENT_TEMPERATURE,
+    ATTR_CURRENT_HUMIDITY,
+    _ATTR_TEMPERATURE_UNIT,
+    ATTR_WEATHER_TEMPERATURE_UNIT,
+)
+_SENSOR_ATTRIBUTES = (ATTR_UNIT_OF_MEASUREMENT, ATTR_DEVICE_CLASS)
+
+
+@callback
+def async_get_coordinator(hass: HomeAssistant) -> SourceCoordinator:
+    """Return the domain wide source coordinator, creating it on first use."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if (coordinator := domain_data.get(DATA_COORDINATOR)) is None:
+        coordinator = domain_data[DATA_COORDINATOR] = SourceCoordinator(hass)
+    return coordinator
+
+
+def _has_state(state: str | None) -> bool:
+    """Return True if state has any value."""
+    return state not in [None, STATE_UNKNOWN, STATE_UNAVAILABLE, "None", ""]
+
+
+def _is_relevant_change(old_state: State | None, new_state: State | None) -> bool:
+    """Return True if a state change can alter any value read from the source."""
+    if old_state is None or new_state is None:
+        return True
+    domain = split_entity_id(new_state.entity_id)[0]
+    if domain == WEATHER_DOMAIN:
+        attributes = _WEATHER_ATTRIBUTES
+    elif domain == CLIMATE_DOMAIN:
+        attributes = _CLIMATE_ATTRIBUTES
+    elif old_state.state != new_state.state:
+        return True
+    else:
+        attributes = _SENSOR_ATTRIBUTES
+    old_attributes = old_state.attributes
+    new_attributes = new_state.attributes
+    return any(
+        old_attributes.get(attribute) != new_attributes.get(attribute)
+        for attribute in attributes
+    )
+
+
+class SourceCoordinator:
+    """Subscribe once per source entity and fan parsed values out to sensors.
+
+    Every source entity gets a single state change subscription no matter how
+    many sensors depend on it. Parsed and unit converted values are cached per
+    ``State`` object, so a new state is parsed once per role and the result is
+    reused by every sensor reading it.
+
+    The temperature unit of the unit system, used for sources without a
+    unit and as sensor output unit, is looked up once and again only after
+    the core configuration changed.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the coordinator."""
+        self.hass = hass
+        self._listeners: dict[str, list[Callable[[Event], None]]] = {}
+        self._unsubs: dict[str, CALLBACK_TYPE] = {}
+        self._cache: dict[tuple[str, str], tuple[State, float | None]] = {}
+        self._unit_listeners: list[Callable[[], None]] = []
+        self._temperature_unit: str | None = None
+        hass.bus.async_listen(EVENT_CORE_CONFIG_UPDATE, self._async_core_config_updated)
+
+    @property
+    def temperature_unit(self) -> str:
+        """Return the temperature unit of the unit system."""
+        if (unit := self._temperature_unit) is None:
+            unit = self._temperature_unit = (
+                self.hass.config.units.temperature_unit or UnitOfTemperature.CELSIUS
+            )
+        return unit
+
+    @callback
+    def async_track_units(self, action: Callable[[], None]) -> CALLBACK_TYPE:
+        """Call action when the unit system changed, return a remove callback."""
+        self._unit_listeners.append(action)
+
+        @callback
+        def remove() -> None:
+            self._unit_listeners.remove(action)
+
+        return remove
+
+    @callback
+    def _async_core_config_updated(self, _event: Event) -> None:
+        """Drop everything derived from the unit system."""
+        self._temperature_unit = None
+        # Values of sources without a unit depend on it.
+        self._cache.clear()
+        for action in list(self._unit_listeners):
+            action()
+
+    @callback
+    def async_track(
+        self, entity_ids: Iterable[str], action: Callable[[Event], None]
+    ) -> CALLBACK_TYPE:
+        """Call action on state changes of entity_ids, return a remove callback."""
+        entity_ids = {entity_id.lower() for entity_id in entity_ids}
+        for entity_id in entity_ids:
+            listeners = self._listeners.setdefault(entity_id, [])
+            listeners.append(action)
+            if entity_id not in self._unsubs:
+                self._unsubs[entity_id] = async_track_state_change_event(
+                    self.hass, entity_id, self._async_state_changed
+                )
+
+        @callback
+        def remove() -> None:
+            for entity_id in entity_ids:
+                listeners = self._listeners.get(entity_id)
+                if not listeners or action not in listeners:
+                    continue
+                listeners.remove(action)
+                if not listeners:
+                    self._async_untrack(entity_id)
+
+        return remove
+
+    @callback
+    def _async_untrack(self, entity_id: str) -> None:
+        """Drop the subscription and cached values of an unused source."""
+        del self._listeners[entity_id]
+        self._unsubs.pop(entity_id)()
+        for role in (ROLE_TEMPERATURE, ROLE_HUMIDITY, ROLE_WIND_SPEED):
+            self._cache.pop((entity_id, role), None)
+
+    @callback
+    def _async_state_changed(self, event: Event) -> None:
+        """Fan a relevant source state change out to every dependent sensor."""
+        if not _is_relevant_change(event.data["old_state"], event.data["new_state"]):
+            return
+        for action in list(self._listeners.get(event.data["entity_id"], ())):
+            action(event)
+
+    def _cached(
+        self, entity_id: str, role: str, parse: Callable[[State], float | None]
+    ) -> tuple[State | None, float | None]:
+        """Return the current state of entity_id and its parsed role value."""
+        state = self.hass.states.get(entity_id)
+        if state is None:
+            return None, None
+        key = (entity_id, role)
+        if (cached := self._cache.get(key)) is not None and cached[0] is state:
+            return state, cached[1]
+        value = parse(state)
+        if entity_id in self._listeners:
+            self._cache[key] = (state, value)
+        return state, value
+
+    def diagnostics(self) -> dict[str, Any]:
+        """Return the tracked sources and their listener counts."""
+        return {
+            "sources": {
+                entity_id: len(listeners)
+                for entity_id, listeners in self._listeners.items()
+            },
+            "cached_values": len(self._cache),
+        }
+
+    def temperature(self, entity_id: str | None) -> float | None:
+        """Return the temperature of entity_id in Celsius."""
+        if entity_id is None:
+            return None
+        return self._cached(entity_id, ROLE_TEMPERATURE, self._parse_temperature)[1]
+
+    def humidity(self, entity_id: str | None) -> float | None:
+        """Return the relative humidity of entity_id in percent."""
+        if entity_id is None:
+            return None
+        return self._cached(entity_id, ROLE_HUMIDITY, self._parse_humidity)[1]
+
+    def wind_speed(self, entity_id: str | None) -> float | None:
+        """Return the wind speed of entity_id in m/s, 0.0 if there is none."""
+        if entity_id is None:
+            return 0.0
+        state, value = self._cached(entity_id, ROLE_WIND_SPEED, self._parse_wind_speed)
+        if state is None:
+            return 0.0
+        return value
+
+    def value(self, role: str, entity_id: str) -> float | None:
+        """Return the role value of entity_id, None without a valid state."""
+        if role == ROLE_TEMPERATURE:
+            parse = self._parse_temperature
+        elif role == ROLE_HUMIDITY:
+            parse = self._parse_humidity
+        else:
+            parse = self._parse_wind_speed
+        return self._cached(entity_id, role, parse)[1]
+
+    def parse(self, role: str, state: State) -> float | None:
+        """Parse the role value of any state, bypassing the cache."""
+        if role == ROLE_TEMPERATURE:
+            return self._parse_temperature(state)
+        if role == ROLE_HUMIDITY:
+            return self._parse_humidity(state)
+        return self._parse_wind_speed(state)
+
+    def _parse_temperature(self, state: State) -> float | None:
+        domain = split_entity_id(state.entity_id)[0]
+        if domain == WEATHER_DOMAIN:
+            temperature = state.attributes.get(ATTR_WEATHER_TEMPERATURE)
+            entity_unit = state.attributes.get(ATTR_WEATHER_TEMPERATURE_UNIT)
+        elif domain == CLIMATE_DOMAIN:
+            temperature = state.attributes.get(ATTR_CURRENT_TEMPERATURE)
+            entity_unit = state.attributes.get(
+                _ATTR_TEMPERATURE_UNIT
+            ) or state.attributes.get(ATTR_WEATHER_TEMPERATURE_UNIT)
+        else:
+            temperature = state.state
+            entity_unit = state.attributes.get(ATTR_UNIT_OF_MEASUREMENT)
+
+        if not _has_state(temperature):
+            return None
+
+        if not entity_unit:
+            entity_unit = self.temperature_unit
+
+        try:
+            temperature_value = float(temperature)
+        except (ValueError, TypeError):
+            _LOGGER.warning(
+                "Invalid temperature value '%s' for %s",
+                temperature,
+                state.entity_id,
+            )
+            return None
+
+        try:
+            temperature_c = to_celsius(temperature_value, entity_unit)
+        except ValueError:
+            _LOGGER.warning(
+                "Unsupported temperature unit '%s' for %s",
+                entity_unit,
+                state.entity_id,
+            )
+            return None
+        return float(temperature_c)
+
+    @staticmethod
+    def _parse_humidity(state: State) -> float | None:
+        domain = split_entity_id(state.entity_id)[0]
+        if domain == WEATHER_DOMAIN:
+            humidity = state.attributes.get(ATTR_WEATHER_HUMIDITY)
+        elif domain == CLIMATE_DOMAIN:
+            humidity = state.attributes.get(ATTR_CURRENT_HUMIDITY)
+        else:
+            humidity = state.state
+
+        if not _has_state(humidity):
+            return None
+        return float(humidity)
+
+    @staticmethod
+    def _parse_wind_speed(state: State) -> float | None:
+        domain = split_entity_id(state.entity_id)[0]
+        if domain == WEATHER_DOMAIN:
+            wind_speed = state.attributes.get(ATTR_WEATHER_WIND_SPEED)
+            entity_unit = state.attributes.get(ATTR_WEATHER_WIND_SPEED_UNIT)
+        else:
+            wind_speed = state.state
+            entity_unit = state.attributes.get(ATTR_UNIT_OF_MEASUREMENT)
+
+        if not _has_state(wind_speed):
+            return None
+
+        try:
+            wind_speed = to_meters_per_second(float(wind_speed), entity_unit)
+        except ValueError:
+            _LOGGER.exception('Could not convert value "%s" to float', state)
+            return None
+        return float(wind_speed)
@@ -0,0 +1,453 @@
+"""Felt temperature math, independent of Home Assistant.
+
+Every calculation has a scalar entry point working on floats and an array
+entry point (``*_array``) that evaluates many inputs in one vectorized call.
+Array functions use NumPy when it is installed and return NumPy arrays, and
+otherwise fall back to pure Python and return lists.
+
+Unit strings are the ones Home Assistant uses, so values can be passed on
+from Home Assistant states unchanged.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable, Sequence
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
+from functools import cache
+import math
+from typing import Any
+
+from .const import (
+    INDEX_APPARENT_TEMPERATURE,
+    INDEX_DEW_POINT,
+    INDEX_HEAT_INDEX,
+    INDEX_HUMIDEX,
+    INDEX_WIND_CHILL,
+    MODEL_SIMPLE,
+    MODEL_UTCI,
+)
+from .utci import utci, utci_vectorized
+
+CELSIUS = "°C"
+FAHRENHEIT = "°F"
+KELVIN = "K"
+METERS_PER_SECOND = "m/s"
+BEAUFORT = "Beaufort"
+
+# Factor to multiply a speed in m/s with to get the speed in the given unit.
+_SPEED_FROM_MS: dict[str, float] = {
+    "in/d": 86400 / 0.0254,
+    "in/h": 3600 / 0.0254,
+    "mm/d": 86400 / 0.001,
+    "mm/h": 3600 / 0.001,
+    "ft/s": 1 / 0.3048,
+    "in/s": 1 / 0.0254,
+    "km/h": 3600 / 1000,
+    "kn": 3600 / 1852,
+    METERS_PER_SECOND: 1.0,
+    "mm/s": 1 / 0.001,
+    "mph": 3600 / 1609.344,
+}
+
+TEMPERATURE_UNITS = (CELSIUS, FAHRENHEIT, KELVIN)
+SPEED_UNITS = (BEAUFORT, *_SPEED_FROM_MS)
+
+_ONE_DECIMAL = Decimal("0.1")
+
+# Magnus coefficients of the saturation vapour pressure over water in hPa.
+_MAGNUS_E0 = 6.105
+_MAGNUS_B = 17.27
+_MAGNUS_C = 237.7
+
+# Indices that do not need the vapour pressure.
+_WITHOUT_VAPOUR_PRESSURE = frozenset({INDEX_HEAT_INDEX, INDEX_WIND_CHILL})
+
+ArrayLike = Sequence[float] | Any
+
+
+@cache
+def _numpy() -> Any:
+    """Return the NumPy module, None if it is not installed.
+
+    Imported on first use of an array function, so scalar users such as the
+    sensor do not pay for importing NumPy.
+    """
+    try:
+        import numpy as np
+    except ImportError:  # pragma: no cover - exercised only without NumPy
+        return None
+    return np
+
+
+def _unsupported(unit: str | None, kind: str) -> ValueError:
+    return ValueError(f"{unit} is not a recognized {kind} unit")
+
+
+# Scalar entry points
+
+
+def to_celsius(value: float, unit: str | None) -> float:
+    """Convert a temperature in unit to Celsius."""
+    if unit == CELSIUS:
+        return value
+    if unit == FAHRENHEIT:
+        return (value - 32.0) / 1.8
+    if unit == KELVIN:
+        return value - 273.15
+    raise _unsupported(unit, "temperature")
+
+
+def from_celsius(value: float, unit: str | None) -> float:
+    """Convert a temperature in Celsius to unit."""
+    if unit == CELSIUS:
+        return value
+    if unit == FAHRENHEIT:
+        return value * 1.8 + 32.0
+    if unit == KELVIN:
+        return value + 273.15
+    raise _unsupported(unit, "temperature")
+
+
+def to_meters_per_second(value: float, unit: str | None) -> float:
+    """Convert a speed in unit to m/s."""
+    if unit == BEAUFORT:
+        return 0.836 * value**1.5
+    if (factor := _SPEED_FROM_MS.get(unit)) is None:
+        raise _unsupported(unit, "speed")
+    return value / factor
+
+
+def _identity(value: float) -> float:
+    return value
+
+
+@cache
+def from_celsius_converter(unit: str | None) -> Callable[[float], float]:
+    """Return a function converting a temperature in Celsius to unit.
+
+    The unit is resolved once, for callers converting many values to the
+    same unit. Raises ValueError for unsupported units.
+    """
+    if unit == CELSIUS:
+        return _identity
+    if unit == FAHRENHEIT:
+        return lambda value: value * 1.8 + 32.0
+    if unit == KELVIN:
+        return lambda value: value + 273.15
+    raise _unsupported(unit, "temperature")
+
+
+def saturation_vapour_pressure(ta: float) -> float:
+    """Return the Magnus saturation vapour pressure in hPa at ta °C."""
+    return _MAGNUS_E0 * math.exp((_MAGNUS_B * ta) / (_MAGNUS_C + ta))
+
+
+def vapour_pressure(ta: float, rh: float) -> float:
+    """Return the water vapour pressure in hPa at ta °C and rh percent."""
+    return saturation_vapour_pressure(ta) * (rh / 100.0)
+
+
+def _apparent_temperature(ta: float, va: float, e: float) -> float:
+    return ta + 0.33 * e - 0.70 * va - 4.00
+
+
+def _dew_point(e: float) -> float:
+    # Inverse of the Magnus formula.
+    gamma = math.log(e / _MAGNUS_E0)
+    return _MAGNUS_C * gamma / (_MAGNUS_B - gamma)
+
+
+def _humidex(ta: float, e: float) -> float:
+    return ta + 0.5555 * (e - 10.0)
+
+
+def simple_felt_temperature(ta: float, rh: float, va: float) -> float:
+    """Return the simplified UTCI-like felt temperature in °C.
+
+    ta is the air temperature in °C, rh the relative humidity in percent and
+    va the wind speed in m/s. This is the Steadman apparent temperature
+    without radiation.
+    """
+    return _apparent_temperature(ta, va, vapour_pressure(ta, rh))
+
+
+def apparent_temperature(ta: float, rh: float, va: float) -> float:
+    """Return the Steadman apparent temperature in °C."""
+    return simple_felt_temperature(ta, rh, va)
+
+
+def dew_point(ta: float, rh: float) -> float:
+    """Return the dew point in °C.
+
+    Humidity below 1 % is treated as 1 %, dry air has no dew point.
+    """
+    return _dew_point(vapour_pressure(ta, max(rh, 1.0)))
+
+
+def humidex(ta: float, rh: float) -> float:
+    """Return the Canadian humidex in °C."""
+    return _humidex(ta, vapour_pressure(ta, rh))
+
+
+def heat_index(ta: float, rh: float) -> float:
+    """Return the NWS heat index in °C.
+
+    Uses the Rothfusz regression with its low and high humidity adjustments
+    where the simple formula gives 80 °F or more.
+    """
+    t = ta * 1.8 + 32.0
+    hi = 0.5 * (t + 61.0 + (t - 68.0) * 1.2 + rh * 0.094)
+    if (hi + t) / 2.0 >= 80.0:
+        hi = (
+            -42.379
+            + 2.04901523 * t
+            + 10.14333127 * rh
+            - 0.22475541 * t * rh
+            - 0.00683783 * t * t
+            - 0.05481717 * rh * rh
+            + 0.00122874 * t * t * rh
+            + 0.00085282 * t * rh * rh
+            - 0.00000199 * t * t * rh * rh
+        )
+        if rh < 13.0 and 80.0 <= t <= 112.0:
+            hi -= (13.0 - rh) / 4.0 * math.sqrt((17.0 - abs(t - 95.0)) / 17.0)
+        elif rh > 85.0 and 80.0 <= t <= 87.0:
+            hi += (rh - 85.0) / 10.0 * (87.0 - t) / 5.0
+    return (hi - 32.0) / 1.8
+
+
+def wind_chill(ta: float, va: float) -> float:
+    """Return the wind chill temperature in °C.
+
+    Outside the range of the formula, above 10 °C or with wind of at most
+    4.8 km/h, the air temperature is returned.
+    """
+    v = va * 3.6
+    if ta > 10.0 or v <= 4.8:
+        return ta
+    v016 = v**0.16
+    return 13.12 + 0.6215 * ta - 11.37 * v016 + 0.3965 * ta * v016
+
+
+def comfort_indices(
+    ta: float, rh: float, va: float, indices: Iterable[str]
+) -> dict[str, float]:
+    """Return the given indices in °C for one set of inputs.
+
+    The vapour pressure is computed once and shared by every index that
+    needs it.
+    """
+    indices = tuple(indices)
+    e = (
+        vapour_pressure(ta, rh)
+        if not _WITHOUT_VAPOUR_PRESSURE.issuperset(indices)
+        else 0.0
+    )
+    values = {}
+    for index in indices:
+        if index == INDEX_APPARENT_TEMPERATURE:
+            values[index] = _apparent_temperature(ta, va, e)
+        elif index == INDEX_DEW_POINT:
+            values[index] = _dew_point(vapour_pressure(ta, 1.0) if rh < 1.0 else e)
+        elif index == INDEX_HEAT_INDEX:
+            values[index] = heat_index(ta, rh)
+        elif index == INDEX_HUMIDEX:
+            values[index] = _humidex(ta, e)
+        elif index == INDEX_WIND_CHILL:
+            values[index] = wind_chill(ta, va)
+        else:
+            raise ValueError(f"{index} is not a known index")
+    return values
+
+
+def felt_temperature(
+    ta: float,
+    rh: float,
+    va: float,
+    model: str = MODEL_SIMPLE,
+    tmrt: float | None = None,
+) -> float:
+    """Return the felt temperature in °C with the given model.
+
+    tmrt is the mean radiant temperature in °C used by the UTCI model, it
+    defaults to the air temperature.
+    """
+    if model == MODEL_UTCI:
+        return utci(ta, ta if tmrt is None else tmrt, va, rh)
+    return simple_felt_temperature(ta, rh, va)
+
+
+def round_to_one_decimal(value: float | int | str | None) -> float | None:
+    """Round half up to exactly one decimal, avoiding float artifacts."""
+    if value is None:
+        return None
+    try:
+        d = Decimal(str(value)).quantize(_ONE_DECIMAL, rounding=ROUND_HALF_UP)
+    except (InvalidOperation, ValueError, TypeError):
+        return None
+    return float(d)
+
+
+# Array entry points
+
+
+def _map(function, *columns: ArrayLike) -> list[Any]:
+    return [function(*values) for values in zip(*columns, strict=True)]
+
+
+def to_celsius_array(values: ArrayLike, unit: str | None) -> ArrayLike:
+    """Convert temperatures in unit to Celsius."""
+    if (np := _numpy()) is None:
+        return [to_celsius(value, unit) for value in values]
+    values = np.asarray(values, dtype=float)
+    if unit == CELSIUS:
+        return values
+    if unit == FAHRENHEIT:
+        return (values - 32.0) / 1.8
+    if unit == KELVIN:
+        return values - 273.15
+    raise _unsupported(unit, "temperature")
+
+
+def from_celsius_array(values: ArrayLike, unit: str | None) -> ArrayLike:
+    """Convert temperatures in Celsius to unit."""
+    if (np := _numpy()) is None:
+        return [from_celsius(value, unit) for value in values]
+    values = np.asarray(values, dtype=float)
+    if unit == CELSIUS:
+        return values
+    if unit == FAHRENHEIT:
+        return values * 1.8 + 32.0
+    if unit == KELVIN:
+        return values + 273.15
+    raise _unsupported(unit, "temperature")
+
+
+def to_meters_per_second_array(values: ArrayLike, unit: str | None) -> ArrayLike:
+    """Convert speeds in unit to m/s."""
+    if (np := _numpy()) is None:
+        return [to_meters_per_second(value, unit) for value in values]
+    values = np.asarray(values, dtype=float)
+    if unit == BEAUFORT:
+        return 0.836 * values**1.5
+    if (factor := _SPEED_FROM_MS.get(unit)) is None:
+        raise _unsupported(unit, "speed")
+    return values / factor
+
+
+def _vapour_pressure_array(np: Any, ta: Any, rh: Any) -> Any:
+    return _MAGNUS_E0 * np.exp((_MAGNUS_B * ta) / (_MAGNUS_C + ta)) * (rh / 100.0)
+
+
+def simple_felt_temperature_array(
+    ta: ArrayLike, rh: ArrayLike, va: ArrayLike
+) -> ArrayLike:
+    """Return simple_felt_temperature() for every (ta, rh, va) triple."""
+    if (np := _numpy()) is None:
+        return _map(simple_felt_temperature, ta, rh, va)
+    ta = np.asarray(ta, dtype=float)
+    e = _vapour_pressure_array(np, ta, np.asarray(rh, dtype=float))
+    return _apparent_temperature(ta, np.asarray(va, dtype=float), e)
+
+
+def _heat_index_array(np: Any, ta: Any, rh: Any) -> Any:
+    t = ta * 1.8 + 32.0
+    simple = 0.5 * (t + 61.0 + (t - 68.0) * 1.2 + rh * 0.094)
+    hi = (
+        -42.379
+        + 2.04901523 * t
+        + 10.14333127 * rh
+        - 0.22475541 * t * rh
+        - 0.00683783 * t * t
+        - 0.05481717 * rh * rh
+        + 0.00122874 * t * t * rh
+        + 0.00085282 * t * rh * rh
+        - 0.00000199 * t * t * rh * rh
+    )
+    dry = (rh < 13.0) & (t >= 80.0) & (t <= 112.0)
+    humid = (rh > 85.0) & (t >= 80.0) & (t <= 87.0)
+    hi = np.where(
+        dry,
+        hi
+        - (13.0 - rh)
+        / 4.0
+        * np.sqrt(np.clip((17.0 - np.abs(t - 95.0)) / 17.0, 0.0, None)),
+        np.where(humid, hi + (rh - 85.0) / 10.0 * (87.0 - t) / 5.0, hi),
+    )
+    return (np.where((simple + t) / 2.0 >= 80.0, hi, simple) - 32.0) / 1.8
+
+
+def _wind_chill_array(np: Any, ta: Any, va: Any) -> Any:
+    v = va * 3.6
+    v016 = v**0.16
+    chill = 13.12 + 0.6215 * ta - 11.37 * v016 + 0.3965 * ta * v016
+    return np.where((ta > 10.0) | (v <= 4.8), ta, chill)
+
+
+def comfort_indices_array(
+    ta: ArrayLike, rh: ArrayLike, va: ArrayLike, indices: Iterable[str]
+) -> dict[str, ArrayLike]:
+    """Return comfort_indices() for every input, one array per index."""
+    indices = tuple(indices)
+    if (np := _numpy()) is None:
+        rows = _map(lambda *values: comfort_indices(*values, indices), ta, rh, va)
+        return {index: [row[index] for row in rows] for index in indices}
+    ta = np.asarray(ta, dtype=float)
+    rh = np.asarray(rh, dtype=float)
+    va = np.asarray(va, dtype=float)
+    e = (
+        _vapour_pressure_array(np, ta, rh)
+        if not _WITHOUT_VAPOUR_PRESSURE.issuperset(indices)
+        else None
+    )
+    values = {}
+    for index in indices:
+        if index == INDEX_APPARENT_TEMPERATURE:
+            values[index] = _apparent_temperature(ta, va, e)
+        elif index == INDEX_DEW_POINT:
+            gamma = np.log(
+                np.where(rh < 1.0, _vapour_pressure_array(np, ta, 1.0), e) / _MAGNUS_E0
+            )
+            values[index] = _MAGNUS_C * gamma / (_MAGNUS_B - gamma)
+        elif index == INDEX_HEAT_INDEX:
+            values[index] = _heat_index_array(np, ta, rh)
+        elif index == INDEX_HUMIDEX:
+            values[index] = _humidex(ta, e)
+        elif index == INDEX_WIND_CHILL:
+            values[index] = _wind_chill_array(np, ta, va)
+        else:
+            raise ValueError(f"{index} is not a known index")
+    return values
+
+
+def utci_array(
+    ta: ArrayLike, tmrt: ArrayLike, va: ArrayLike, rh: ArrayLike
+) -> ArrayLike:
+    """Return utci() for every (ta, tmrt, va, rh) quadruple."""
+    if (np := _numpy()) is None:
+        return _map(utci, ta, tmrt, va, rh)
+    return utci_vectorized(np, ta, tmrt, va, rh)
+
+
+def felt_temperature_array(
+    ta: ArrayLike,
+    rh: ArrayLike,
+    va: ArrayLike,
+    model: str = MODEL_SIMPLE,
+    tmrt: ArrayLike | None = None,
+) -> ArrayLike:
+    """Return felt_temperature() for every input, in one vectorized call."""
+    if model == MODEL_UTCI:
+        return utci_array(ta, ta if tmrt is None else tmrt, va, rh)
+    return simple_felt_temperature_array(ta, rh, va)
+
+
+def round_to_one_decimal_array(values: ArrayLike) -> ArrayLike:
+    """Return round_to_one_decimal() for every value."""
+    if (np := _numpy()) is None:
+        return [round_to_one_decimal(value) for value in values]
+    values = np.asarray(values, dtype=float)
+    # Rounding the scaled value to 9 decimals first removes float artifacts
+    # such as 2.4999999999 so that halves round up like the Decimal version.
+    scaled = np.round(np.abs(values) * 10.0, 9)
+    return np.sign(values) * np.floor(scaled + 0.5) / 10.0
@@ -0,0 +1,30 @@
+"""Diagnostics support for Felt Temperature."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DATA_COORDINATOR, DATA_SENSORS, DATA_TIMER_WHEEL, DOMAIN
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    domain_data = hass.data.get(DOMAIN, {})
+    sensor = domain_data.get(DATA_SENSORS, {}).get(entry.entry_id)
+    coordinator = domain_data.get(DATA_COORDINATOR)
+    wheel = domain_data.get(DATA_TIMER_WHEEL)
+    return {
+        "entry": {
+            "version": entry.version,
+            "data": dict(entry.data),
+            "options": dict(entry.options),
+        },
+        "sensor": sensor.diagnostics() if sensor is not None else None,
+        "coordinator": coordinator.diagnostics() if coordinator is not None else None,
+        "scheduled_age_checks": len(wheel) if wheel is not None else 0,
+    }
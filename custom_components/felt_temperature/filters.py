@@ -0,0 +1,117 @@
+"""Downsampling filters for high rate source values."""
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+import math
+
+from .const import FILTER_EMA, FILTER_MAX, FILTER_MEAN
+from .rolling import RollingWindow
+
+# Averaging time of a gust, the WMO definition of a wind gust.
+GUST_SECONDS = 3.0
+
+
+class InputFilter(ABC):
+    """Reduce the samples of one input to a single effective value.
+
+    add() is called for every valid sample of a source, value holds the
+    effective value used by the calculation, None before the first sample.
+    Timestamps are seconds from a monotonic clock.
+    """
+
+    __slots__ = ()
+
+    @abstractmethod
+    def add(self, timestamp: float, value: float) -> None:
+        """Add a sample."""
+
+    @property
+    @abstractmethod
+    def value(self) -> float | None:
+        """Return the effective value."""
+
+
+class WindowMeanFilter(InputFilter):
+    """Mean of the samples of the last window seconds."""
+
+    __slots__ = ("_window",)
+
+    def __init__(self, window: float) -> None:
+        """Initialize the filter."""
+        self._window = RollingWindow(window)
+
+    def add(self, timestamp: float, value: float) -> None:
+        """Add a sample."""
+        self._window.add(timestamp, value)
+
+    @property
+    def value(self) -> float | None:
+        """Return the mean of the window."""
+        return self._window.mean
+
+
+class EmaFilter(InputFilter):
+    """Exponential moving average for irregularly spaced samples.
+
+    The weight of a sample decays with the time since it arrived, with the
+    time constant tau, so bursts of samples do not outweigh steady ones.
+    """
+
+    __slots__ = ("_last", "_tau", "_value")
+
+    def __init__(self, tau: float) -> None:
+        """Initialize the filter."""
+        self._tau = tau
+        self._value: float | None = None
+        self._last = 0.0
+
+    def add(self, timestamp: float, value: float) -> None:
+        """Add a sample."""
+        if self._value is None:
+            self._value = value
+        else:
+            alpha = 1.0 - math.exp(-max(timestamp - self._last, 0.0) / self._tau)
+            self._value += alpha * (value - self._value)
+        self._last = timestamp
+
+    @property
+    def value(self) -> float | None:
+        """Return the moving average."""
+        return self._value
+
+
+class GustFilter(InputFilter):
+    """Highest 3 second mean of the last window seconds.
+
+    Taking the maximum of short means rather than of single samples keeps
+    one noisy sample of a fast anemometer from being reported as a gust.
+    """
+
+    __slots__ = ("_gusts", "_window")
+
+    def __init__(self, window: float) -> None:
+        """Initialize the filter."""
+        self._gusts = RollingWindow(GUST_SECONDS, max_buckets=30)
+        self._window = RollingWindow(window)
+
+    def add(self, timestamp: float, value: float) -> None:
+        """Add a sample."""
+        self._gusts.add(timestamp, value)
+        self._window.add(timestamp, self._gusts.mean)
+
+    @property
+    def value(self) -> float | None:
+        """Return the highest gust of the window."""
+        return self._window.maximum
+
+
+def create_filter(kind: str, window: float) -> InputFilter | None:
+    """Return a filter of kind over window seconds, None for no filter."""
+    if kind == FILTER_MEAN:
+        return WindowMeanFilter(window)
+    if kind == FILTER_EMA:
+        return EmaFilter(window)
+    if kind == FILTER_MAX:
+        return GustFilter(window)
+    return None
@@ -0,0 +1,155 @@
+"""Felt temperature of weather forecasts."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping
+import logging
+from typing import Any
+
+from homeassistant.const import ATTR_ENTITY_ID
+from homeassistant.core import HomeAssistant
+
+from .const import (
+    ATTR_FELT_TEMPERATURE,
+    ATTR_FORECAST_HUMIDITY,
+    ATTR_FORECAST_TEMP,
+    ATTR_FORECAST_TIME,
+    ATTR_FORECAST_WIND_SPEED,
+    ATTR_WEATHER_TEMPERATURE_UNIT,
+    ATTR_WEATHER_WIND_SPEED_UNIT,
+    WEATHER_DOMAIN,
+    WEATHER_SERVICE_GET_FORECASTS,
+)
+from .core import (
+    felt_temperature_array,
+    from_celsius_array,
+    round_to_one_decimal_array,
+    to_celsius_array,
+    to_meters_per_second_array,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# Inputs a cached slot was computed from, a slot is recomputed when any differ
+_Inputs = tuple[Any, ...]
+
+
+async def async_get_forecast(
+    hass: HomeAssistant, entity_id: str, forecast_type: str
+) -> tuple[list[Mapping[str, Any]], str | None, str | None]:
+    """Return the forecast slots of a weather entity and their units.
+
+    The weather.get_forecasts action returns values in the units of the
+    entity's state attributes, so those are returned alongside.
+    """
+    response = await hass.services.async_call(
+        WEATHER_DOMAIN,
+        WEATHER_SERVICE_GET_FORECASTS,
+        {ATTR_ENTITY_ID: entity_id, "type": forecast_type},
+        blocking=True,
+        return_response=True,
+    )
+    slots = response.get(entity_id, {}).get("forecast") or []
+    if (state := hass.states.get(entity_id)) is None:
+        return slots, None, None
+    return (
+        slots,
+        state.attributes.get(ATTR_WEATHER_TEMPERATURE_UNIT),
+        state.attributes.get(ATTR_WEATHER_WIND_SPEED_UNIT),
+    )
+
+
+class ForecastCalculator:
+    """Compute the felt temperature of forecast slots in one batch.
+
+    Results are cached by forecast type and slot time together with the
+    inputs they were computed from. When a provider refreshes its forecast
+    only new or changed slots are computed again, slots that are no longer
+    part of the forecast are dropped from the cache.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty cache."""
+        self._cache: dict[tuple[str, str], tuple[_Inputs, float | None]] = {}
+
+    def calculate(
+        self,
+        forecast_type: str,
+        slots: Iterable[Mapping[str, Any]],
+        temperature_unit: str | None,
+        wind_speed_unit: str | None,
+        model: str,
+        output_unit: str,
+    ) -> list[dict[str, Any]]:
+        """Return the slot time and felt temperature of every slot."""
+        slots = [slot for slot in slots if slot.get(ATTR_FORECAST_TIME) is not None]
+        keys = [(forecast_type, slot[ATTR_FORECAST_TIME]) for slot in slots]
+        inputs = [
+            (
+                slot.get(ATTR_FORECAST_TEMP),
+                slot.get(ATTR_FORECAST_HUMIDITY),
+                slot.get(ATTR_FORECAST_WIND_SPEED),
+                temperature_unit,
+                wind_speed_unit,
+                model,
+                output_unit,
+            )
+            for slot in slots
+        ]
+
+        cache = {
+            key: cached
+            for key, cached in self._cache.items()
+            if key[0] != forecast_type
+        }
+        missing = []
+        for key, slot_inputs in zip(keys, inputs, strict=True):
+            cached = self._cache.get(key)
+            if cached is not None and cached[0] == slot_inputs:
+                cache[key] = cached
+            elif slot_inputs[0] is None or slot_inputs[1] is None:
+                cache[key] = (slot_inputs, None)
+            else:
+                missing.append((key, slot_inputs))
+
+        if missing:
+            for (key, slot_inputs), value in zip(
+                missing,
+                self._calculate_batch(
+                    [slot_inputs for _, slot_inputs in missing],
+                    temperature_unit,
+                    wind_speed_unit,
+                    model,
+                    output_unit,
+                ),
+                strict=True,
+            ):
+                cache[key] = (slot_inputs, value)
+        self._cache = cache
+
+        return [
+            {ATTR_FORECAST_TIME: key[1], ATTR_FELT_TEMPERATURE: cache[key][1]}
+            for key in keys
+        ]
+
+    @staticmethod
+    def _calculate_batch(
+        inputs: list[_Inputs],
+        temperature_unit: str | None,
+        wind_speed_unit: str | None,
+        model: str,
+        output_unit: str,
+    ) -> list[float | None]:
+        """Return the felt temperature of slots with temperature and humidity."""
+        try:
+            ta = to_celsius_array([float(slot[0]) for slot in inputs], temperature_unit)
+            rh = [float(slot[1]) for slot in inputs]
+            winds = [0.0 if slot[2] is None else float(slot[2]) for slot in inputs]
+            va = to_meters_per_second_array(winds, wind_speed_unit or "m/s")
+            values = from_celsius_array(
+                felt_temperature_array(ta, rh, va, model=model), output_unit
+            )
+        except (TypeError, ValueError) as err:
+            _LOGGER.warning("Could not calculate forecast felt temperature: %s", err)
+            return [None] * len(inputs)
+        return [float(value) for value in round_to_one_decimal_array(values)]
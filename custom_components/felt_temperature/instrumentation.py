@@ -0,0 +1,80 @@
+"""Hot path counters and latency histograms of Felt Temperature sensors."""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from typing import Any
+
+# Upper bucket bounds in microseconds, the last bucket is unbounded.
+LATENCY_BUCKETS_US = (10, 25, 50, 100, 250, 500, 1000, 2500, 10000)
+
+
+class LatencyHistogram:
+    """Fixed bucket histogram of stage durations.
+
+    Recording is a bisect and two additions, cheap enough to run on every
+    recalculation. Memory use is constant no matter how many samples.
+    """
+
+    __slots__ = ("buckets", "count", "maximum", "total")
+
+    def __init__(self) -> None:
+        """Initialize an empty histogram."""
+        self.buckets = [0] * (len(LATENCY_BUCKETS_US) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.maximum = 0.0
+
+    def record(self, seconds: float) -> None:
+        """Add one duration in seconds."""
+        microseconds = seconds * 1e6
+        self.buckets[bisect_left(LATENCY_BUCKETS_US, microseconds)] += 1
+        self.count += 1
+        self.total += microseconds
+        self.maximum = max(self.maximum, microseconds)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the histogram in a JSON serializable form."""
+        labels = [f"<={bound}us" for bound in LATENCY_BUCKETS_US]
+        labels.append(f">{LATENCY_BUCKETS_US[-1]}us")
+        return {
+            "count": self.count,
+            "mean_us": round(self.total / self.count, 1) if self.count else None,
+            "max_us": round(self.maximum, 1),
+            "buckets": dict(zip(labels, self.buckets, strict=True)),
+        }
+
+
+@dataclass(slots=True)
+class UpdateStats:
+    """Counters describing how often a sensor recalculated and wrote state.
+
+    Stage latencies cover reading the parsed source values (read), output
+    unit conversion and rounding (convert), the felt temperature model
+    (compute) and writing the state (write).
+    """
+
+    events: int = 0
+    recalculations: int = 0
+    writes: int = 0
+    writes_skipped: int = 0
+    read: LatencyHistogram = field(default_factory=LatencyHistogram)
+    convert: LatencyHistogram = field(default_factory=LatencyHistogram)
+    compute: LatencyHistogram = field(default_factory=LatencyHistogram)
+    write: LatencyHistogram = field(default_factory=LatencyHistogram)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the counters and histograms in a JSON serializable form."""
+        return {
+            "events": self.events,
+            "recalculations": self.recalculations,
+            "writes": self.writes,
+            "writes_skipped": self.writes_skipped,
+            "latency": {
+                "read": self.read.as_dict(),
+                "convert": self.convert.as_dict(),
+                "compute": self.compute.as_dict(),
+                "write": self.write.as_dict(),
+            },
+        }
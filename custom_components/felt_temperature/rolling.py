@@ -0,0 +1,117 @@
+"""Incremental rolling minimum, maximum and mean over a time window."""
+
+from __future__ import annotations
+
+from collections import deque
+
+# Buckets kept per window, a 24 hour window has a resolution of 4 minutes.
+DEFAULT_BUCKETS = 360
+
+
+class RollingWindow:
+    """Minimum, maximum and mean of the values added during the last window.
+
+    Values are grouped in buckets of window / max_buckets seconds: a ring
+    buffer holds the sum and count of every bucket and two monotonic deques
+    hold the bucket minima and maxima that can still become the extreme of
+    the window. Adding a value is O(1) amortized and reading the aggregates
+    is O(1), no matter how long the window is or how often values arrive.
+
+    Memory is bounded by max_buckets + 1 entries in each of the three
+    deques. The window is exact to one bucket: a value is dropped when its
+    bucket started more than window seconds ago. Buckets expire when a value
+    is added; call expire() before reading the aggregates of a window that
+    may not have had values for a while.
+
+    The mean is the mean of the values, every value weighs the same no
+    matter how long it held. It is not time-weighted: a burst of values
+    counts more than one value that held for the rest of the window.
+    """
+
+    __slots__ = (
+        "_buckets",
+        "_count",
+        "_maxima",
+        "_minima",
+        "_resolution",
+        "_sum",
+        "window",
+    )
+
+    def __init__(self, window: float, max_buckets: int = DEFAULT_BUCKETS) -> None:
+        """Initialize an empty window of window seconds."""
+        if window <= 0 or max_buckets < 1:
+            raise ValueError("window and max_buckets must be positive")
+        self.window = window
+        self._resolution = window / max_buckets
+        # [bucket start, sum, count]
+        self._buckets: deque[list[float]] = deque()
+        # (bucket start, value), values increase from head to tail in
+        # _minima and decrease in _maxima.
+        self._minima: deque[tuple[float, float]] = deque()
+        self._maxima: deque[tuple[float, float]] = deque()
+        self._sum = 0.0
+        self._count = 0
+
+    def __len__(self) -> int:
+        """Return the number of values in the window."""
+        return self._count
+
+    @property
+    def minimum(self) -> float | None:
+        """Return the smallest value in the window."""
+        return self._minima[0][1] if self._minima else None
+
+    @property
+    def maximum(self) -> float | None:
+        """Return the largest value in the window."""
+        return self._maxima[0][1] if self._maxima else None
+
+    @property
+    def mean(self) -> float | None:
+        """Return the mean of the values in the window, by count."""
+        return self._sum / self._count if self._count else None
+
+    def add(self, timestamp: float, value: float) -> None:
+        """Add a value observed at timestamp seconds.
+
+        Timestamps must not decrease, a monotonic clock is a good source.
+        """
+        self.expire(timestamp)
+        buckets = self._buckets
+        if buckets and timestamp < buckets[-1][0] + self._resolution:
+            bucket = buckets[-1]
+            bucket[1] += value
+            bucket[2] += 1
+            start = bucket[0]
+        else:
+            start = timestamp
+            buckets.append([start, value, 1])
+        self._sum += value
+        self._count += 1
+
+        minima = self._minima
+        if not (minima and minima[-1][0] == start and minima[-1][1] <= value):
+            while minima and minima[-1][1] >= value:
+                minima.pop()
+            minima.append((start, value))
+        maxima = self._maxima
+        if not (maxima and maxima[-1][0] == start and maxima[-1][1] >= value):
+            while maxima and maxima[-1][1] <= value:
+                maxima.pop()
+            maxima.append((start, value))
+
+    def expire(self, timestamp: float) -> None:
+        """Drop the buckets that started more than window seconds before."""
+        cutoff = timestamp - self.window
+        buckets = self._buckets
+        while buckets and buckets[0][0] <= cutoff:
+            _, total, count = buckets.popleft()
+            self._sum -= total
+            self._count -= count
+        if not buckets:
+            # Start over from zero so rounding errors do not accumulate.
+            self._sum = 0.0
+        for extremes in (self._minima, self._maxima):
+            while extremes and extremes[0][0] <= cutoff:
+                extremes.popleft()
@@ -0,0 +1,195 @@
+"""Micro-batching update scheduler for Felt Temperature sensors."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable, Hashable
+import math
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.util import dt as dt_util
+
+from .const import DATA_TIMER_WHEEL, DOMAIN
+
+# Resolution and size of the shared timer wheel, one turn takes an hour.
+WHEEL_RESOLUTION = 5.0
+WHEEL_SLOTS = 720
+
+
+class UpdateBatcher:
+    """Coalesce bursts of update requests into a single call of action.
+
+    All requests made before the event loop gets to run the pending flush
+    are merged into one call. With a minimum interval set, requests arriving
+    too soon after the previous call are held back and delivered once on the
+    trailing edge of the interval, so the latest inputs are never dropped.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        action: Callable[[], None],
+        min_interval: float = 0,
+    ) -> None:
+        """Initialize the batcher."""
+        self.hass = hass
+        self.min_interval = min_interval
+        self._action = action
+        self._pending = False
+        self._last_run: float | None = None
+        self._unsub_timer: CALLBACK_TYPE | None = None
+        self._handle: asyncio.Handle | None = None
+
+    @callback
+    def async_schedule(self) -> None:
+        """Request a call of action, merged with any pending request."""
+        if self._pending:
+            return
+        self._pending = True
+        if self.min_interval and self._last_run is not None:
+            delay = self._last_run + self.min_interval - self.hass.loop.time()
+            if delay > 0:
+                self._unsub_timer = async_call_later(
+                    self.hass, delay, self._async_trailing_edge
+                )
+                return
+        # A plain loop callback, not a task, and run on the next iteration so
+        # events dispatched in the same iteration are merged before it.
+        self._handle = self.hass.loop.call_soon(self._async_flush)
+
+    @callback
+    def _async_trailing_edge(self, _now: Any) -> None:
+        """Deliver requests held back by the minimum interval."""
+        self._unsub_timer = None
+        self._async_flush()
+
+    @callback
+    def _async_flush(self) -> None:
+        """Run action once for every request merged since the last flush."""
+        self._handle = None
+        if not self._pending:
+            return
+        self._pending = False
+        self._last_run = self.hass.loop.time()
+        self._action()
+
+    @callback
+    def async_cancel(self) -> None:
+        """Drop any pending request."""
+        self._pending = False
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        if self._unsub_timer is not None:
+            self._unsub_timer()
+            self._unsub_timer = None
+
+
+class TimerWheel:
+    """Run actions at deadlines, all of them driven by one timer.
+
+    Deadlines are UTC timestamps, rounded up to the wheel resolution. Every
+    key sits in the slot of the tick it is due at, so a tick only looks at
+    the keys of one slot, and the wheel only ticks while it holds keys.
+
+    Moving a deadline later, as a source that keeps reporting does all the
+    time, only updates the stored deadline: the key stays in its slot and
+    is moved on when that slot comes up, so rescheduling is O(1) and every
+    key is in exactly one slot.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        resolution: float = WHEEL_RESOLUTION,
+        slots: int = WHEEL_SLOTS,
+    ) -> None:
+        """Initialize an empty wheel."""
+        self.hass = hass
+        self.resolution = resolution
+        self._slots: list[set[Hashable]] = [set() for _ in range(slots)]
+        # key -> [deadline, action, tick of the slot holding the key]
+        self._entries: dict[Hashable, list[Any]] = {}
+        self._cursor = math.floor(self._now() / resolution)
+        self._unsub_timer: CALLBACK_TYPE | None = None
+        self._ticking = False
+
+    def __len__(self) -> int:
+        """Return the number of scheduled keys."""
+        return len(self._entries)
+
+    def _now(self) -> float:
+        return dt_util.utcnow().timestamp()
+
+    @callback
+    def async_schedule(
+        self, key: Hashable, deadline: float, action: Callable[[], None]
+    ) -> None:
+        """Call action at deadline, replacing any earlier schedule of key."""
+        tick = max(math.ceil(deadline / self.resolution), self._cursor + 1)
+        if (entry := self._entries.get(key)) is not None:
+            entry[0] = deadline
+            entry[1] = action
+            if entry[2] <= tick:
+                return
+            self._slots[entry[2] % len(self._slots)].discard(key)
+            entry[2] = tick
+        else:
+            self._entries[key] = [deadline, action, tick]
+        self._slots[tick % len(self._slots)].add(key)
+        if self._unsub_timer is None and not self._ticking:
+            self._async_start_timer()
+
+    @callback
+    def async_cancel(self, key: Hashable) -> None:
+        """Drop the schedule of key, if any."""
+        if (entry := self._entries.pop(key, None)) is not None:
+            self._slots[entry[2] % len(self._slots)].discard(key)
+        if not self._entries and self._unsub_timer is not None:
+            self._unsub_timer()
+            self._unsub_timer = None
+
+    @callback
+    def _async_start_timer(self) -> None:
+        delay = (self._cursor + 1) * self.resolution - self._now()
+        self._unsub_timer = async_call_later(self.hass, max(delay, 0), self._async_tick)
+
+    @callback
+    def _async_tick(self, _now: Any) -> None:
+        """Run the due actions of every tick since the previous one."""
+        self._unsub_timer = None
+        now = self._now()
+        current = math.floor(now / self.resolution)
+        slots = self._slots
+        self._ticking = True
+        # After a long stall every slot is looked at once.
+        for tick in range(max(self._cursor + 1, current - len(slots) + 1), current + 1):
+            self._cursor = tick
+            slot = slots[tick % len(slots)]
+            for key in list(slot):
+                entry = self._entries[key]
+                if entry[2] > current:
+                    # Due in a later turn of the wheel.
+                    continue
+                slot.discard(key)
+                if entry[0] > now:
+                    entry[2] = math.ceil(entry[0] / self.resolution)
+                    slots[entry[2] % len(slots)].add(key)
+                    continue
+                del self._entries[key]
+                entry[1]()
+        self._cursor = current
+        self._ticking = False
+        if self._entries and self._unsub_timer is None:
+            self._async_start_timer()
+
+
+@callback
+def async_get_timer_wheel(hass: HomeAssistant) -> TimerWheel:
+    """Return the domain wide timer wheel, creating it on first use."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if (wheel := domain_data.get(DATA_TIMER_WHEEL)) is None:
+        wheel = domain_data[DATA_TIMER_WHEEL] = TimerWheel(hass)
+    return wheel
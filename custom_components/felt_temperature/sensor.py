@@ -1,118 +1,280 @@
-from collections.abc import Mapping
-from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+from datetime import datetime, timedelta
 import logging
-import math
+from time import monotonic, perf_counter
 from typing import Any
 
-from homeassistant.components.climate import (
-    ATTR_CURRENT_HUMIDITY,
-    ATTR_CURRENT_TEMPERATURE,
-    DOMAIN as CLIMATE_DOMAIN,
-)
+import voluptuous as vol
+
 from homeassistant.components.sensor import (
+    RestoreSensor,
     SensorDeviceClass,
     SensorEntity,
+    SensorExtraStoredData,
     SensorStateClass,
 )
-from homeassistant.components.weather import (
-    ATTR_WEATHER_HUMIDITY,
-    ATTR_WEATHER_TEMPERATURE,
-    ATTR_WEATHER_TEMPERATURE_UNIT,
-    ATTR_WEATHER_WIND_SPEED,
-    ATTR_WEATHER_WIND_SPEED_UNIT,
-    DOMAIN as WEATHER_DOMAIN,
-)
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import (
-    ATTR_DEVICE_CLASS,
-    ATTR_UNIT_OF_MEASUREMENT,
     CONF_NAME,
-    CONF_SOURCE,
-    EVENT_HOMEASSISTANT_STARTED,
-    PERCENTAGE,
-    STATE_UNAVAILABLE,
-    STATE_UNKNOWN,
-    UnitOfSpeed,
     UnitOfTemperature,
 )
 from homeassistant.core import (
     CALLBACK_TYPE,
     Event,
+    EventStateReportedData,
     HomeAssistant,
-    State,
+    ServiceResponse,
+    SupportsResponse,
     callback,
     split_entity_id,
 )
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+from homeassistant.helpers import config_validation as cv, entity_platform
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.event import (
-    async_call_later,
-    async_track_state_change_event,
+    async_track_state_report_event,
+    async_track_time_interval,
 )
-from homeassistant.util.unit_conversion import SpeedConverter, TemperatureConverter
+from homeassistant.helpers.storage import STORAGE_DIR
+from homeassistant.util import dt as dt_util
 
+from .aggregate import SourceAggregate
 from .const import (
+    ATTR_FORECAST,
     ATTR_HUMIDITY_SOURCE,
     ATTR_HUMIDITY_SOURCE_VALUE,
+    ATTR_MAX,
+    ATTR_MEAN,
+    ATTR_MIN,
     ATTR_TEMPERATURE_SOURCE,
     ATTR_TEMPERATURE_SOURCE_VALUE,
     ATTR_WIND_SPEED_SOURCE,
     ATTR_WIND_SPEED_SOURCE_VALUE,
-    CONF_HUMIDITY_SOURCE,
-    CONF_MODE,
-    CONF_TEMPERATURE_SOURCE,
-    CONF_WIND_SOURCE,
+    CONF_AGGREGATION,
+    CONF_FILTER_WINDOW,
+    CONF_FORECAST,
+    CONF_INDICES,
+    CONF_MAX_AGE,
+    CONF_MIN_INTERVAL,
+    CONF_MODEL,
+    CONF_MRT_SOURCE,
+    CONF_ROLLING_WINDOWS,
+    CONF_SOURCE_VALUE_ATTRIBUTES,
+    CONF_SOURCE_WEIGHTS,
+    CONF_TEMPERATURE_FILTER,
+    CONF_WIND_FILTER,
+    DATA_SENSORS,
+    DATA_UTCI_GRID,
+    DEFAULT_AGGREGATION,
+    DEFAULT_FILTER,
+    DEFAULT_FILTER_WINDOW,
+    DEFAULT_FORECAST,
+    DEFAULT_MAX_AGE,
+    DEFAULT_MIN_INTERVAL,
+    DEFAULT_MODEL,
     DEFAULT_NAME,
+    DEFAULT_SOURCE_VALUE_ATTRIBUTES,
     DOMAIN,
-    MODE_SEPARATE,
-    MODE_WEATHER,
+    FORECAST_DAILY,
+    FORECAST_HOURLY,
+    FORECAST_NONE,
+    FORECAST_TWICE_DAILY,
+    INDEX_APPARENT_TEMPERATURE,
+    MODEL_UTCI,
+    ROLLING_WINDOWS,
+    UTCI_GRID_FILE,
+    WEATHER_DOMAIN,
 )
+from .core import (
+    comfort_indices,
+    from_celsius,
+    from_celsius_converter,
+    round_to_one_decimal,
+    to_celsius,
+)
+from .coordinator import (
+    ROLE_HUMIDITY,
+    ROLE_TEMPERATURE,
+    ROLE_WIND_SPEED,
+    SourceCoordinator,
+    async_get_coordinator,
+)
+from .filters import InputFilter, create_filter
+from .forecast import ForecastCalculator, async_get_forecast
+from .instrumentation import UpdateStats
+from .rolling import RollingWindow
+from .scheduler import TimerWheel, UpdateBatcher, async_get_timer_wheel
+from .sources import SourceRoles, async_get_source_roles
+from .utci import UtciGrid, utci
 
 _LOGGER = logging.getLogger(__name__)
 
-RETRY_DELAY = 10  # Sekunder mellan försök om källorna inte är redo
-INITIAL_DELAY = 15  # Sekunder att vänta efter HA start innan första uppdatering
+SERVICE_BACKFILL = "backfill"
+ATTR_START_TIME = "start_time"
+ATTR_END_TIME = "end_time"
+SERVICE_GET_FORECASTS = "get_forecasts"
+ATTR_FORECAST_TYPE = "type"
 
-_ONE_DECIMAL = Decimal("0.1")
-_ATTR_TEMPERATURE_UNIT = "temperature_unit"
+FORECAST_INTERVAL = timedelta(minutes=15)
 
 
 async def async_setup_entry(
     hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback
 ) -> None:
     """Set up Felt Temperature sensor entities from a config entry."""
-    # Build sources list from new explicit options if available; fallback to legacy CONF_SOURCE list
-    mode = entry.options.get(CONF_MODE, entry.data.get(CONF_MODE))
-    sources: list[str] = []
-    if mode == MODE_WEATHER:
-        weather_entity = entry.options.get(
-            CONF_TEMPERATURE_SOURCE, entry.data.get(CONF_TEMPERATURE_SOURCE)
-        )
-        if weather_entity:
-            sources = [weather_entity]
-    elif mode == MODE_SEPARATE:
-        temp_entity = entry.options.get(
-            CONF_TEMPERATURE_SOURCE, entry.data.get(CONF_TEMPERATURE_SOURCE)
-        )
-        hum_entity = entry.options.get(
-            CONF_HUMIDITY_SOURCE, entry.data.get(CONF_HUMIDITY_SOURCE)
-        )
-        wind_entity = entry.options.get(
-            CONF_WIND_SOURCE, entry.data.get(CONF_WIND_SOURCE)
-        )
-        for eid in [temp_entity, hum_entity, wind_entity]:
-            if eid:
-                sources.append(eid)
-    else:
-        sources = entry.options.get(CONF_SOURCE, entry.data.get(CONF_SOURCE, []))
-    name = entry.options.get(CONF_NAME, entry.data.get(CONF_NAME, DEFAULT_NAME))
+    settings = _sensor_settings(entry)
     unique_id = f"{entry.entry_id}"
 
-    async_add_entities([FeltTemperatureSensor(name, sources, unique_id)], True)
+    platform = entity_platform.async_get_current_platform()
+    platform.async_register_entity_service(
+        SERVICE_BACKFILL,
+        {
+            vol.Required(ATTR_START_TIME): cv.datetime,
+            vol.Optional(ATTR_END_TIME): cv.datetime,
+        },
+        "async_backfill",
+    )
+    platform.async_register_entity_service(
+        SERVICE_GET_FORECASTS,
+        {
+            vol.Required(ATTR_FORECAST_TYPE): vol.In(
+                [FORECAST_HOURLY, FORECAST_DAILY, FORECAST_TWICE_DAILY]
+            )
+        },
+        "async_get_forecasts",
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    coordinator = async_get_coordinator(hass)
+    if settings["model"] == MODEL_UTCI:
+        _async_load_utci_grid(hass)
+
+    sensor = FeltTemperatureSensor(
+        sources=async_get_source_roles(entry),
+        unique_id=unique_id,
+        coordinator=coordinator,
+        mrt_source=entry.options.get(CONF_MRT_SOURCE),
+        **settings,
+    )
+    async_add_entities([sensor, *sensor.index_sensors], True)
+
+
+def _sensor_settings(entry: ConfigEntry) -> dict[str, Any]:
+    """Return the sensor arguments stored in entry, other than the sources.
+
+    The sensor keeps them as its settings attribute.
+    """
+    options = entry.options
+    return {
+        "name": options.get(CONF_NAME, entry.data.get(CONF_NAME, DEFAULT_NAME)),
+        "min_interval": options.get(CONF_MIN_INTERVAL, DEFAULT_MIN_INTERVAL),
+        "model": options.get(CONF_MODEL, DEFAULT_MODEL),
+        "forecast_type": options.get(CONF_FORECAST, DEFAULT_FORECAST),
+        "indices": options.get(CONF_INDICES, []),
+        "rolling_windows": options.get(CONF_ROLLING_WINDOWS, []),
+        "temperature_filter": options.get(CONF_TEMPERATURE_FILTER, DEFAULT_FILTER),
+        "wind_filter": options.get(CONF_WIND_FILTER, DEFAULT_FILTER),
+        "filter_window": options.get(CONF_FILTER_WINDOW, DEFAULT_FILTER_WINDOW),
+        "aggregation": options.get(CONF_AGGREGATION, DEFAULT_AGGREGATION),
+        "source_weights": options.get(CONF_SOURCE_WEIGHTS),
+        "max_age": options.get(CONF_MAX_AGE, DEFAULT_MAX_AGE),
+        "source_value_attributes": options.get(
+            CONF_SOURCE_VALUE_ATTRIBUTES, DEFAULT_SOURCE_VALUE_ATTRIBUTES
+        ),
+    }
+
+
+@callback
+def async_reconfigure_in_place(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    """Apply changed sources of entry to its running sensor.
+
+    Return False if the entry has no running sensor or other settings
+    changed too, the entry has to be reloaded then.
+    """
+    sensor: FeltTemperatureSensor | None = (
+        hass.data.get(DOMAIN, {}).get(DATA_SENSORS, {}).get(entry.entry_id)
+    )
+    if sensor is None or sensor.settings != _sensor_settings(entry):
+        return False
+    return sensor.async_set_sources(
+        async_get_source_roles(entry), entry.options.get(CONF_MRT_SOURCE)
+    )
+
+
+@callback
+def _async_load_utci_grid(hass: HomeAssistant) -> None:
+    """Load or build the shared UTCI lookup grid in the background, once."""
+    domain_data = hass.data[DOMAIN]
+    if DATA_UTCI_GRID in domain_data:
+        return
+    # Until the grid is ready sensors evaluate the polynomial directly.
+    domain_data[DATA_UTCI_GRID] = None
+    path = hass.config.path(STORAGE_DIR, UTCI_GRID_FILE)
+
+    def load_or_build() -> UtciGrid:
+        if (grid := UtciGrid.load(path)) is not None:
+            return grid
+        _LOGGER.debug("Building UTCI lookup grid, caching it in %s", path)
+        grid = UtciGrid.build()
+        try:
+            grid.save(path)
+        except OSError as err:
+            _LOGGER.warning("Could not cache UTCI lookup grid in %s: %s", path, err)
+        return grid
+
+    async def async_load() -> None:
+        domain_data[DATA_UTCI_GRID] = await hass.async_add_executor_job(load_or_build)
 
+    hass.async_create_background_task(async_load(), "felt_temperature UTCI grid")
 
-class FeltTemperatureSensor(SensorEntity):
-    """Felt Temperature Sensor class using a simplified UTCI-like calculation."""
+
+@dataclass
+class FeltTemperatureExtraStoredData(SensorExtraStoredData):
+    """Last sensor value and the inputs it was calculated from.
+
+    Inputs are stored as parsed, in Celsius, percent and m/s.
+    """
+
+    temperature: float | None = None
+    humidity: float | None = None
+    wind_speed: float | None = None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a dict representation of the stored data."""
+        return {
+            **super().as_dict(),
+            "inputs": {
+                "temperature": self.temperature,
+                "humidity": self.humidity,
+                "wind_speed": self.wind_speed,
+            },
+        }
+
+    @classmethod
+    def from_dict(
+        cls, restored: dict[str, Any]
+    ) -> "FeltTemperatureExtraStoredData | None":
+        """Initialize the stored data from a dict."""
+        if (sensor_data := SensorExtraStoredData.from_dict(restored)) is None:
+            return None
+        inputs = restored.get("inputs") or {}
+        try:
+            return cls(
+                sensor_data.native_value,
+                sensor_data.native_unit_of_measurement,
+                *(
+                    None if inputs.get(key) is None else float(inputs[key])
+                    for key in ("temperature", "humidity", "wind_speed")
+                ),
+            )
+        except (TypeError, ValueError):
+            return None
+
+
+class FeltTemperatureSensor(RestoreSensor):
+    """Felt Temperature Sensor class using a simplified UTCI-like or full UTCI model."""
 
     _attr_has_entity_name = True
     _attr_icon = "mdi:thermometer-lines"
@@ -120,34 +282,199 @@ class FeltTemperatureSensor(SensorEntity):
     _attr_state_class = SensorStateClass.MEASUREMENT
     _attr_should_poll = False
     _attr_suggested_display_precision = 1
+    # The sources only change with the configuration, the recorder does not
+    # need them with every state.
+    _unrecorded_attributes = frozenset(
+        {
+            ATTR_TEMPERATURE_SOURCE,
+            ATTR_HUMIDITY_SOURCE,
+            ATTR_WIND_SPEED_SOURCE,
+            ATTR_FORECAST,
+            *(
+                f"{statistic}_{window}"
+                for statistic in (ATTR_MIN, ATTR_MAX, ATTR_MEAN)
+                for window in ROLLING_WINDOWS
+            ),
+        }
+    )
 
-    def __init__(self, name: str | None, sources: list[str], unique_id: str) -> None:
+    def __init__(
+        self,
+        name: str | None,
+        sources: SourceRoles,
+        unique_id: str,
+        coordinator: SourceCoordinator,
+        min_interval: float = DEFAULT_MIN_INTERVAL,
+        model: str = DEFAULT_MODEL,
+        mrt_source: str | None = None,
+        forecast_type: str = DEFAULT_FORECAST,
+        indices: list[str] | None = None,
+        rolling_windows: list[str] | None = None,
+        temperature_filter: str = DEFAULT_FILTER,
+        wind_filter: str = DEFAULT_FILTER,
+        filter_window: float = DEFAULT_FILTER_WINDOW,
+        aggregation: str = DEFAULT_AGGREGATION,
+        source_weights: Mapping[str, float] | None = None,
+        max_age: float = DEFAULT_MAX_AGE,
+        source_value_attributes: bool = DEFAULT_SOURCE_VALUE_ATTRIBUTES,
+    ) -> None:
         """Class initialization."""
         self._attr_name = name
-        self._sources = sources
+        self._coordinator = coordinator
+        # Settings the entity was created with, see async_reconfigure_in_place().
+        self.settings: dict[str, Any] = {
+            "name": name,
+            "min_interval": min_interval,
+            "model": model,
+            "forecast_type": forecast_type,
+            "indices": indices,
+            "rolling_windows": rolling_windows,
+            "temperature_filter": temperature_filter,
+            "wind_filter": wind_filter,
+            "filter_window": filter_window,
+            "aggregation": aggregation,
+            "source_weights": source_weights,
+            "max_age": max_age,
+            "source_value_attributes": source_value_attributes,
+        }
+        self._min_interval = min_interval
+        self._filter_kinds = (temperature_filter, wind_filter)
+        self._filter_window = filter_window
+        self._temp_filter = create_filter(temperature_filter, filter_window)
+        self._wind_filter = create_filter(wind_filter, filter_window)
+        if self._temp_filter is not None or self._wind_filter is not None:
+            # Filtered inputs are recalculated at most once per window.
+            self._min_interval = max(min_interval, filter_window)
+        self._model = model
+        self._mrt = mrt_source
+        self._forecast_type = forecast_type
+        self._forecasts = ForecastCalculator()
+        self._forecast: list[dict[str, Any]] | None = None
+        self._unsub_forecast: CALLBACK_TYPE | None = None
+        self._batcher: UpdateBatcher | None = None
         self._attr_unique_id = unique_id
+        self._rolling = {
+            window: RollingWindow(ROLLING_WINDOWS[window])
+            for window in rolling_windows or ()
+        }
+        self.index_sensors = [
+            ComfortIndexSensor(self, index) for index in indices or ()
+        ]
+        # The simple model is the apparent temperature, computed in the same
+        # pass as the indices so they share the vapour pressure.
+        self._pipeline = tuple(
+            dict.fromkeys(
+                [
+                    *(sensor.index for sensor in self.index_sensors),
+                    *(() if model == MODEL_UTCI else (INDEX_APPARENT_TEMPERATURE,)),
+                ]
+            )
+        )
 
-        self._temp = None
-        self._humd = None
-        self._wind = None
+        self._temp = sources.temperature
+        self._humd = sources.humidity
+        self._wind = sources.wind_speed
+        self._sources = sources.entity_ids
+        self._role_sources = {
+            role: sources.for_role(role)
+            for role in (ROLE_TEMPERATURE, ROLE_HUMIDITY, ROLE_WIND_SPEED)
+        }
+        # Inputs with several sources are combined incrementally.
+        self._aggregation = aggregation
+        self._source_weights = source_weights
+        self._aggregates = {
+            role: SourceAggregate(aggregation, source_weights)
+            for role, entity_ids in self._role_sources.items()
+            if len(entity_ids) > 1
+        }
+        # Sources that have not reported for max_age seconds read as missing.
+        self._max_age = max_age
+        self._stale: set[str] = set()
+        self._unsub_reports: dict[str, CALLBACK_TYPE] = {}
+        self._wheel: TimerWheel | None = None
         self._temp_val = None
         self._humd_val = None
         self._wind_val = None
-        self._retry_timer: CALLBACK_TYPE | None = None
-        self._unsub_state_listener: CALLBACK_TYPE | None = None
-        self._initial_update_done = False
+        self._unsub_sources: dict[str, CALLBACK_TYPE] = {}
+        self._unsub_units: CALLBACK_TYPE | None = None
+        # Output unit and conversion from Celsius to it, until the unit changes.
+        self._output_unit: str | None = None
+        self._output_converter: Callable[[float], float] | None = None
+        self._waiting_for: tuple[str, ...] = ()
+        self._inputs: tuple[float | None, float | None, float | None] = (
+            None,
+            None,
+            None,
+        )
+        self._restored = False
+        self._last_written: tuple[Any, ...] | None = None
+        self._source_value_attributes = source_value_attributes
+        # The last attributes and the values they were built from, returned
+        # again while nothing changed.
+        self._attributes: dict[str, Any] = {}
+        self._attributes_key: tuple[Any, ...] | None = None
+        self.stats = UpdateStats()
 
     @property
     def extra_state_attributes(self) -> Mapping[str, Any] | None:
-        """Return entity specific state attributes."""
-        return {
-            ATTR_TEMPERATURE_SOURCE: self._temp,
-            ATTR_TEMPERATURE_SOURCE_VALUE: self._temp_val,
-            ATTR_HUMIDITY_SOURCE: self._humd,
-            ATTR_HUMIDITY_SOURCE_VALUE: self._humd_val,
-            ATTR_WIND_SPEED_SOURCE: self._wind,
-            ATTR_WIND_SPEED_SOURCE_VALUE: self._wind_val,
+        """Return entity specific state attributes.
+
+        The mapping of the previous call is returned while its values are
+        unchanged, so writes and the recorder can tell it did not change
+        without comparing it key by key.
+        """
+        if self._rolling:
+            # Values are only added on recalculation, drop the ones that
+            # left the window since then.
+            now = monotonic()
+            for rolling in self._rolling.values():
+                rolling.expire(now)
+        rolling_values = [
+            self._rolling_value(value)
+            for rolling in self._rolling.values()
+            for value in (rolling.minimum, rolling.maximum, rolling.mean)
+        ]
+        key = (
+            *(
+                (self._temp_val, self._humd_val, self._wind_val)
+                if self._source_value_attributes
+                else ()
+            ),
+            self._forecast,
+            *rolling_values,
+        )
+        if key == self._attributes_key:
+            return self._attributes
+
+        attributes = {
+            ATTR_TEMPERATURE_SOURCE: self._source_attribute(ROLE_TEMPERATURE),
+            ATTR_HUMIDITY_SOURCE: self._source_attribute(ROLE_HUMIDITY),
+            ATTR_WIND_SPEED_SOURCE: self._source_attribute(ROLE_WIND_SPEED),
         }
+        if self._source_value_attributes:
+            attributes[ATTR_TEMPERATURE_SOURCE_VALUE] = self._temp_val
+            attributes[ATTR_HUMIDITY_SOURCE_VALUE] = self._humd_val
+            attributes[ATTR_WIND_SPEED_SOURCE_VALUE] = self._wind_val
+        values = iter(rolling_values)
+        for window in self._rolling:
+            for statistic in (ATTR_MIN, ATTR_MAX, ATTR_MEAN):
+                attributes[f"{statistic}_{window}"] = next(values)
+        if self._forecast_type != FORECAST_NONE:
+            attributes[ATTR_FORECAST] = self._forecast
+        self._attributes = attributes
+        self._attributes_key = key
+        return attributes
+
+    def _source_attribute(self, role: str) -> str | list[str] | None:
+        """Return the source of role, all of them if it has several."""
+        entity_ids = self._role_sources[role]
+        if len(entity_ids) > 1:
+            return list(entity_ids)
+        return entity_ids[0] if entity_ids else None
+
+    def _rolling_value(self, value_c: float | None) -> float | None:
+        """Return a rolling statistic in the output unit."""
+        return round_to_one_decimal(self._to_output_unit(value_c))
 
     @property
     def device_info(self) -> DeviceInfo:
@@ -160,293 +487,620 @@ class FeltTemperatureSensor(SensorEntity):
     @property
     def native_unit_of_measurement(self) -> str:
         """Return the unit of measurement based on HA global settings."""
-        if self.hass is None:
-            return UnitOfTemperature.CELSIUS
-        return self.hass.config.units.temperature_unit or UnitOfTemperature.CELSIUS
+        if (unit := self._output_unit) is None:
+            unit = self._output_unit = self._coordinator.temperature_unit
+        return unit
 
-    def _setup_sources(self) -> list[str]:
-        """Set sources for entity and return list of sources to track."""
-        _LOGGER.debug(
-            "Running _setup_sources() to identify temperature, humidity and wind sources."
+    @property
+    def extra_restore_state_data(self) -> FeltTemperatureExtraStoredData:
+        """Return the value and inputs to restore after a restart."""
+        return FeltTemperatureExtraStoredData(
+            self.native_value, self.native_unit_of_measurement, *self._inputs
         )
-        entities = set(self._sources)
-
-        # Nollställ inte redan hittade källor - men om vi upptäcker nya fuktighets-/vindkällor
-        # kan vi sätta dem även om temp redan är funnen.
-
-        for entity_id in self._sources:
-            state: State = self.hass.states.get(entity_id)
-            if not state:
-                continue
-
-            domain = split_entity_id(entity_id)[0]
-            device_class = state.attributes.get(ATTR_DEVICE_CLASS)
-            unit_of_measurement = state.attributes.get(ATTR_UNIT_OF_MEASUREMENT)
-
-            # Temperatur
-            if self._temp is None and (
-                domain == WEATHER_DOMAIN
-                or domain == CLIMATE_DOMAIN
-                or device_class == SensorDeviceClass.TEMPERATURE
-                or (
-                    unit_of_measurement in UnitOfTemperature
-                    if unit_of_measurement
-                    else False
-                )
-                or ("temperature" in entity_id.lower())
-            ):
-                self._temp = entity_id
-                _LOGGER.debug("Found temperature source: %s", entity_id)
-
-            # Fuktighet
-            if self._humd is None and (
-                domain == WEATHER_DOMAIN
-                or domain == CLIMATE_DOMAIN
-                or device_class == SensorDeviceClass.HUMIDITY
-                or (unit_of_measurement == PERCENTAGE)
-                or ("humidity" in entity_id.lower())
-            ):
-                self._humd = entity_id
-                _LOGGER.debug("Found humidity source: %s", entity_id)
-
-            # Vind
-            if self._wind is None and (
-                domain == WEATHER_DOMAIN
-                or (device_class == SensorDeviceClass.WIND_SPEED)
-                or (
-                    unit_of_measurement in UnitOfSpeed if unit_of_measurement else False
-                )
-                or ("wind" in entity_id.lower())
-            ):
-                self._wind = entity_id
-                _LOGGER.debug("Found wind source: %s", entity_id)
-
-        return list(entities)
 
     async def async_added_to_hass(self) -> None:
-        """Register callbacks."""
+        """Register callbacks.
 
-        @callback
-        def sensor_state_listener(event) -> None:
-            """Handle device state changes."""
-            self.async_schedule_update_ha_state(True)
+        The first value is calculated before the entity is added. If a source
+        is not ready then, the value and inputs from before the restart are
+        shown until the state change that makes it valid triggers the
+        calculation, no timer polls the sources.
+        """
+        await super().async_added_to_hass()
+        if self._waiting_for and (
+            last_extra_data := await self.async_get_last_extra_data()
+        ):
+            self._async_restore(
+                FeltTemperatureExtraStoredData.from_dict(last_extra_data.as_dict())
+            )
 
-        sources_to_watch = self._setup_sources()
-        self._unsub_state_listener = async_track_state_change_event(
-            self.hass, sources_to_watch, sensor_state_listener
-        )
+        # Registered by config entry id for diagnostics.
+        self.hass.data[DOMAIN].setdefault(DATA_SENSORS, {})[self._attr_unique_id] = self
 
-        # Vänta tills Home Assistant startat fullt innan första uppdateringen + en liten fördröjning
-        @callback
-        def delayed_initial_update(_):
-            self.async_schedule_update_ha_state(True)
+        self._batcher = UpdateBatcher(
+            self.hass, self._async_refresh, self._min_interval
+        )
 
-        @callback
-        def handle_ha_started(event: Event) -> None:
-            async_call_later(self.hass, INITIAL_DELAY, delayed_initial_update)
+        self._unsub_units = self._coordinator.async_track_units(
+            self._async_units_changed
+        )
+        if self._max_age:
+            self._wheel = async_get_timer_wheel(self.hass)
+        for entity_id in self._watched_sources():
+            self._async_track_source(entity_id)
+        self._async_feed_filters()
 
-        self.hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STARTED, handle_ha_started)
+        if self._forecast_type != FORECAST_NONE and self._is_weather_source():
+            self._unsub_forecast = async_track_time_interval(
+                self.hass, self._async_update_forecast, FORECAST_INTERVAL
+            )
+            self.hass.async_create_background_task(
+                self._async_update_forecast(), f"{self.entity_id} forecast"
+            )
 
     async def async_will_remove_from_hass(self) -> None:
         """Clean up when entity is removed from Home Assistant."""
-        if self._unsub_state_listener is not None:
-            self._unsub_state_listener()
-            self._unsub_state_listener = None
-        if self._retry_timer is not None:
-            self._retry_timer()
-            self._retry_timer = None
+        self.hass.data[DOMAIN].get(DATA_SENSORS, {}).pop(self._attr_unique_id, None)
+        for entity_id in list(self._unsub_sources):
+            self._async_untrack_source(entity_id)
+        self._wheel = None
+        if self._unsub_units is not None:
+            self._unsub_units()
+            self._unsub_units = None
+        if self._unsub_forecast is not None:
+            self._unsub_forecast()
+            self._unsub_forecast = None
+        if self._batcher is not None:
+            self._batcher.async_cancel()
 
-    @staticmethod
-    def _has_state(state: str | None) -> bool:
-        """Return True if state has any value."""
-        return state not in [None, STATE_UNKNOWN, STATE_UNAVAILABLE, "None", ""]
+    def _watched_sources(self) -> list[str]:
+        """Return every source entity the sensor reads."""
+        if self._mrt is None:
+            return list(self._sources)
+        return list(dict.fromkeys([*self._sources, self._mrt]))
 
-    @staticmethod
-    def _round_to_one_decimal(value: float | int | str | None) -> float | None:
-        """Round to exactly one decimal to avoid float artifacts in state."""
-        if value is None:
-            return None
-        try:
-            d = Decimal(str(value)).quantize(_ONE_DECIMAL, rounding=ROUND_HALF_UP)
-        except (InvalidOperation, ValueError, TypeError):
-            return None
-        return float(d)
+    @callback
+    def _async_track_source(self, entity_id: str) -> None:
+        """Subscribe to the state changes of a source."""
+        self._unsub_sources[entity_id] = self._coordinator.async_track(
+            [entity_id], self._async_source_changed
+        )
+        if self._wheel is not None:
+            self._async_watch_age(entity_id)
 
-    def _get_temperature(self, entity_id: str | None) -> float | None:
-        if entity_id is None:
-            return None
-        state: State = self.hass.states.get(entity_id)
-        if state is None:
-            return None
-        domain = split_entity_id(state.entity_id)[0]
-        if domain == WEATHER_DOMAIN:
-            temperature = state.attributes.get(ATTR_WEATHER_TEMPERATURE)
-            entity_unit = state.attributes.get(ATTR_WEATHER_TEMPERATURE_UNIT)
-        elif domain == CLIMATE_DOMAIN:
-            temperature = state.attributes.get(ATTR_CURRENT_TEMPERATURE)
-            entity_unit = state.attributes.get(
-                _ATTR_TEMPERATURE_UNIT
-            ) or state.attributes.get(ATTR_WEATHER_TEMPERATURE_UNIT)
-        else:
-            temperature = state.state
-            entity_unit = state.attributes.get(ATTR_UNIT_OF_MEASUREMENT)
+    @callback
+    def _async_untrack_source(self, entity_id: str) -> None:
+        """Drop the subscriptions and age check of a source."""
+        self._unsub_sources.pop(entity_id)()
+        if (unsub := self._unsub_reports.pop(entity_id, None)) is not None:
+            unsub()
+        self._stale.discard(entity_id)
+        if self._wheel is not None:
+            self._wheel.async_cancel((self._attr_unique_id, entity_id))
 
-        if not self._has_state(temperature):
-            return None
+    @callback
+    def _async_source_changed(self, event: Event) -> None:
+        """Handle device state changes, merging bursts into one update."""
+        self.stats.events += 1
+        if self._wheel is not None:
+            self._async_source_reported(event.data["entity_id"])
+        self._async_update_aggregates(event.data["entity_id"])
+        self._async_feed_filters(event.data["entity_id"])
+        self._batcher.async_schedule()
+
+    @callback
+    def async_set_sources(self, sources: SourceRoles, mrt_source: str | None) -> bool:
+        """Switch to other sources without removing the entity.
 
-        if not entity_unit:
-            entity_unit = (
-                self.hass.config.units.temperature_unit or UnitOfTemperature.CELSIUS
+        Only the sources that were added or removed are subscribed or
+        dropped, then the value is recalculated and written at once, so the
+        state history has no gap. Filters of an input whose sources changed
+        start over. Return False if the change needs a reload, which is when
+        it starts or stops the forecast of a weather source.
+        """
+        is_weather = (
+            sources.temperature is not None
+            and split_entity_id(sources.temperature)[0] == WEATHER_DOMAIN
+        )
+        if (
+            self._forecast_type != FORECAST_NONE
+            and is_weather != self._is_weather_source()
+        ):
+            return False
+
+        old_sources = set(self._watched_sources())
+        self._temp = sources.temperature
+        self._humd = sources.humidity
+        self._wind = sources.wind_speed
+        self._mrt = mrt_source
+        self._sources = sources.entity_ids
+        role_sources = {role: sources.for_role(role) for role in self._role_sources}
+        if role_sources[ROLE_TEMPERATURE] != self._role_sources[ROLE_TEMPERATURE]:
+            self._temp_filter = create_filter(
+                self._filter_kinds[0], self._filter_window
+            )
+        if role_sources[ROLE_WIND_SPEED] != self._role_sources[ROLE_WIND_SPEED]:
+            self._wind_filter = create_filter(
+                self._filter_kinds[1], self._filter_window
             )
+        self._role_sources = role_sources
+        self._attributes_key = None
+        self._aggregates = {
+            role: SourceAggregate(self._aggregation, self._source_weights)
+            for role, entity_ids in role_sources.items()
+            if len(entity_ids) > 1
+        }
 
-        try:
-            temperature_value = float(temperature)
-        except (ValueError, TypeError):
-            _LOGGER.warning(
-                "Invalid temperature value '%s' for %s",
-                temperature,
-                state.entity_id,
+        new_sources = self._watched_sources()
+        for entity_id in old_sources.difference(new_sources):
+            self._async_untrack_source(entity_id)
+        added = [entity_id for entity_id in new_sources if entity_id not in old_sources]
+        for entity_id in added:
+            self._async_track_source(entity_id)
+        self._async_update_aggregates()
+        for entity_id in added:
+            self._async_feed_filters(entity_id)
+        _LOGGER.debug("%s now reads %s", self.entity_id, ", ".join(new_sources))
+
+        self._async_refresh()
+        if self._forecast_type != FORECAST_NONE and is_weather:
+            self.hass.async_create_background_task(
+                self._async_update_forecast(), f"{self.entity_id} forecast"
             )
-            return None
+        return True
 
+    @callback
+    def _async_restore(self, data: FeltTemperatureExtraStoredData | None) -> None:
+        """Show a value and inputs stored before the restart."""
+        if data is None or data.native_value is None:
+            return
+        output_unit = self.native_unit_of_measurement
+        value = data.native_value
         try:
-            temperature_c = TemperatureConverter.convert(
-                temperature_value, entity_unit, UnitOfTemperature.CELSIUS
-            )
-        except ValueError:
-            _LOGGER.warning(
-                "Unsupported temperature unit '%s' for %s",
-                entity_unit,
-                state.entity_id,
-            )
-            return None
-        return float(temperature_c)
+            if data.native_unit_of_measurement not in (None, output_unit):
+                value = from_celsius(
+                    to_celsius(float(value), data.native_unit_of_measurement),
+                    output_unit,
+                )
+            value = round_to_one_decimal(float(value))
+        except (TypeError, ValueError):
+            return
+        self._attr_native_value = value
+        self._inputs = (data.temperature, data.humidity, data.wind_speed)
+        self._temp_val = round_to_one_decimal(self._to_output_unit(data.temperature))
+        self._humd_val = data.humidity
+        self._wind_val = data.wind_speed
+        self._restored = True
+        if None not in self._inputs:
+            self._async_set_indices(comfort_indices(*self._inputs, self._pipeline))
+        _LOGGER.debug("Restored %s %s for %s", value, output_unit, self.entity_id)
 
-    def _get_humidity(self, entity_id: str | None) -> float | None:
-        if entity_id is None:
-            return None
-        state: State = self.hass.states.get(entity_id)
-        if state is None:
-            return None
-        domain = split_entity_id(state.entity_id)[0]
-        if domain == WEATHER_DOMAIN:
-            humidity = state.attributes.get(ATTR_WEATHER_HUMIDITY)
-        elif domain == CLIMATE_DOMAIN:
-            humidity = state.attributes.get(ATTR_CURRENT_HUMIDITY)
-        else:
-            humidity = state.state
+    @callback
+    def _async_watch_age(self, entity_id: str) -> None:
+        """Mark entity_id stale max_age seconds after its last report."""
+        key = (self._attr_unique_id, entity_id)
+        if (state := self.hass.states.get(entity_id)) is None:
+            self._wheel.async_cancel(key)
+            return
+        self._wheel.async_schedule(
+            key,
+            state.last_reported_timestamp + self._max_age,
+            lambda: self._async_source_expired(entity_id),
+        )
 
-        if not self._has_state(humidity):
-            return None
-        return float(humidity)
+    @callback
+    def _async_source_reported(self, entity_id: str) -> None:
+        """Restart the age of a source that reported, reviving it if stale."""
+        if (unsub := self._unsub_reports.pop(entity_id, None)) is not None:
+            unsub()
+            self._stale.discard(entity_id)
+        self._async_watch_age(entity_id)
 
-    def _get_wind_speed(self, entity_id: str | None) -> float | None:
-        if entity_id is None:
-            return 0.0
-        state: State = self.hass.states.get(entity_id)
-        if state is None:
-            return 0.0
-        domain = split_entity_id(state.entity_id)[0]
-        if domain == WEATHER_DOMAIN:
-            wind_speed = state.attributes.get(ATTR_WEATHER_WIND_SPEED)
-            entity_unit = state.attributes.get(ATTR_WEATHER_WIND_SPEED_UNIT)
-        else:
-            wind_speed = state.state
-            entity_unit = state.attributes.get(ATTR_UNIT_OF_MEASUREMENT)
+    @callback
+    def _async_stale_source_reported(
+        self, event: Event[EventStateReportedData]
+    ) -> None:
+        """Revive a stale source that reported its unchanged state again."""
+        entity_id = event.data["entity_id"]
+        self._async_source_reported(entity_id)
+        self._async_update_aggregates(entity_id)
+        self._async_feed_filters(entity_id)
+        self._batcher.async_schedule()
 
-        if not self._has_state(wind_speed):
-            return None
+    @callback
+    def _async_source_expired(self, entity_id: str) -> None:
+        """Handle a source that may not have reported for max_age seconds.
 
-        try:
-            wind_speed = SpeedConverter.convert(
-                float(wind_speed), entity_unit, UnitOfSpeed.METERS_PER_SECOND
-            )
-        except ValueError:
-            _LOGGER.exception('Could not convert value "%s" to float', state)
-            return None
-        return float(wind_speed)
+        Reports that left the state unchanged fire no state change event,
+        so the last report is checked here before the source is dropped.
+        """
+        state = self.hass.states.get(entity_id)
+        if (
+            state is not None
+            and state.last_reported_timestamp + self._max_age
+            > dt_util.utcnow().timestamp()
+        ):
+            self._async_watch_age(entity_id)
+            return
+        _LOGGER.info(
+            "%s has not reported for %s seconds, %s ignores it until it does",
+            entity_id,
+            self._max_age,
+            self.entity_id,
+        )
+        self._stale.add(entity_id)
+        # Unchanged reports fire no state change, they are watched separately.
+        self._unsub_reports[entity_id] = async_track_state_report_event(
+            self.hass, entity_id, self._async_stale_source_reported
+        )
+        self._async_update_aggregates(entity_id)
+        self._batcher.async_schedule()
 
-    def _calculate_utci(self, ta: float, rh: float, va: float) -> float:
-        """Calculate a simplified UTCI-like value."""
-        e = 6.105 * math.exp((17.27 * ta) / (237.7 + ta)) * (rh / 100.0)
-        utci_approx = ta + 0.33 * e - 0.70 * va - 4.00
-        return utci_approx
+    @callback
+    def _async_update_aggregates(self, entity_id: str | None = None) -> None:
+        """Update the combined inputs with the value of entity_id, or all."""
+        for role, aggregate in self._aggregates.items():
+            for source in self._role_sources[role]:
+                if entity_id in (None, source):
+                    aggregate.update(
+                        source,
+                        None
+                        if source in self._stale
+                        else self._coordinator.value(role, source),
+                    )
+
+    def _read(self, role: str) -> float | None:
+        """Return the current value of an input, combined if it has several.
+
+        A stale source reads as no source: temperature and humidity become
+        unavailable, the wind speed falls back to calm.
+        """
+        if (aggregate := self._aggregates.get(role)) is not None:
+            return aggregate.value
+        if role == ROLE_TEMPERATURE:
+            return self._get_temperature(self._fresh(self._temp))
+        if role == ROLE_HUMIDITY:
+            return self._get_humidity(self._fresh(self._humd))
+        return self._get_wind_speed(self._fresh(self._wind))
+
+    def _fresh(self, entity_id: str | None) -> str | None:
+        """Return entity_id, None if it is stale."""
+        return None if entity_id in self._stale else entity_id
+
+    @callback
+    def _async_feed_filters(self, entity_id: str | None = None) -> None:
+        """Add the current values of entity_id, or all sources, to the filters."""
+        now = monotonic()
+        for input_filter, role in (
+            (self._temp_filter, ROLE_TEMPERATURE),
+            (self._wind_filter, ROLE_WIND_SPEED),
+        ):
+            sources = self._role_sources[role]
+            if (
+                input_filter is not None
+                and sources
+                and (entity_id is None or entity_id in sources)
+                and (value := self._read(role)) is not None
+            ):
+                input_filter.add(now, value)
+
+    @staticmethod
+    def _filtered(
+        input_filter: InputFilter | None, value: float | None
+    ) -> float | None:
+        """Return the filtered value of an input, the value itself if unfiltered.
+
+        An input without a valid current value stays unavailable.
+        """
+        if input_filter is None or value is None or input_filter.value is None:
+            return value
+        return input_filter.value
+
+    @callback
+    def _async_refresh(self) -> None:
+        """Recalculate and write the state only if the output changed."""
+        self._async_calculate()
+        self._async_write_if_changed()
+        for sensor in self.index_sensors:
+            sensor.async_write_if_changed()
+
+    @callback
+    def _async_set_indices(self, values: Mapping[str, float] | None) -> None:
+        """Set the value of every index sensor, None clears them."""
+        for sensor in self.index_sensors:
+            sensor.native_value_c = None if values is None else values[sensor.index]
+
+    @callback
+    def _async_write_if_changed(self) -> None:
+        """Write state unless value, unit and attributes equal the last write."""
+        attributes = self.extra_state_attributes or {}
+        written = (
+            self._attr_native_value,
+            self.native_unit_of_measurement,
+            attributes,
+        )
+        if written == self._last_written:
+            self.stats.writes_skipped += 1
+            return
+        self._last_written = written
+        self.stats.writes += 1
+        start = perf_counter()
+        self.async_write_ha_state()
+        self.stats.write.record(perf_counter() - start)
+
+    def _get_temperature(self, entity_id: str | None) -> float | None:
+        return self._coordinator.temperature(entity_id)
+
+    def _get_humidity(self, entity_id: str | None) -> float | None:
+        return self._coordinator.humidity(entity_id)
+
+    def _get_wind_speed(self, entity_id: str | None) -> float | None:
+        return self._coordinator.wind_speed(entity_id)
+
+    def _calculate_felt(self, ta: float, rh: float, va: float) -> float:
+        """Calculate the UTCI in Celsius."""
+        tmrt = self._get_temperature(self._fresh(self._mrt))
+        if tmrt is None:
+            tmrt = ta
+        if (grid := self.hass.data[DOMAIN].get(DATA_UTCI_GRID)) is None:
+            return utci(ta, tmrt, va, rh)
+        return grid(ta, rh, va, tmrt - ta)
 
     def _to_output_unit(self, temperature_c: float | None) -> float | None:
         """Convert Celsius to the sensor output unit."""
         if temperature_c is None:
             return None
-        output_unit = self.native_unit_of_measurement
-        if output_unit == UnitOfTemperature.CELSIUS:
-            return temperature_c
+        if (convert := self._output_converter) is None:
+            output_unit = self.native_unit_of_measurement
+            try:
+                convert = from_celsius_converter(output_unit)
+            except ValueError:
+                _LOGGER.warning("Unsupported output temperature unit '%s'", output_unit)
+                convert = from_celsius_converter(UnitOfTemperature.CELSIUS)
+            self._output_converter = convert
+        return convert(temperature_c)
+
+    def clear_unit_cache(self) -> None:
+        """Forget the output unit and converter, they are looked up again."""
+        self._output_unit = None
+        self._output_converter = None
+
+    @callback
+    def _async_units_changed(self) -> None:
+        """Recalculate in the output unit of a changed unit system."""
+        self.clear_unit_cache()
+        self._batcher.async_schedule()
+
+    async def async_backfill(
+        self, start_time: datetime, end_time: datetime | None = None
+    ) -> None:
+        """Recompute the felt temperature statistics from the sources' history."""
+        from .backfill import BackfillSources, async_backfill
+
+        if self._temp is None or self._humd is None:
+            raise ServiceValidationError(
+                f"{self.entity_id} has no temperature and humidity sources yet"
+            )
+        await async_backfill(
+            self.hass,
+            self.entity_id,
+            BackfillSources(
+                temperature=self._temp,
+                humidity=self._humd,
+                wind_speed=self._wind,
+                mean_radiant_temperature=self._mrt
+                if self._model == MODEL_UTCI
+                else None,
+                model=self._model,
+                unit=self.unit_of_measurement,
+            ),
+            self._coordinator.parse,
+            start_time,
+            end_time,
+        )
+
+    def diagnostics(self) -> dict[str, Any]:
+        """Return resolved sources, settings and hot path statistics."""
+        return {
+            "entity_id": self.entity_id,
+            "sources": {
+                "temperature": self._temp,
+                "humidity": self._humd,
+                "wind_speed": self._wind,
+                "mean_radiant_temperature": self._mrt,
+            },
+            "model": self._model,
+            "min_update_interval": self._min_interval,
+            "max_source_age": self._max_age,
+            "stale": sorted(self._stale),
+            "aggregates": {
+                role: {
+                    "sources": list(self._role_sources[role]),
+                    "method": self._aggregation,
+                    "valid": len(aggregate),
+                    "value": aggregate.value,
+                }
+                for role, aggregate in self._aggregates.items()
+            },
+            "filters": {
+                "temperature": self._filter_kinds[0],
+                "wind": self._filter_kinds[1],
+                "window": self._filter_window,
+            },
+            "forecast": self._forecast_type,
+            "indices": [sensor.index for sensor in self.index_sensors],
+            "rolling_windows": {
+                window: len(rolling) for window, rolling in self._rolling.items()
+            },
+            "waiting_for": list(self._waiting_for),
+            "stats": self.stats.as_dict(),
+        }
+
+    def _is_weather_source(self) -> bool:
+        """Return True if the temperature source is a weather entity."""
+        return (
+            self._temp is not None and split_entity_id(self._temp)[0] == WEATHER_DOMAIN
+        )
+
+    async def _async_calculate_forecast(
+        self, forecast_type: str
+    ) -> list[dict[str, Any]]:
+        """Fetch a forecast of the weather source and return its felt temperature."""
+        slots, temperature_unit, wind_speed_unit = await async_get_forecast(
+            self.hass, self._temp, forecast_type
+        )
+        return self._forecasts.calculate(
+            forecast_type,
+            slots,
+            temperature_unit,
+            wind_speed_unit,
+            self._model,
+            self.native_unit_of_measurement,
+        )
+
+    async def _async_update_forecast(self, _now: datetime | None = None) -> None:
+        """Refresh the forecast attribute."""
         try:
-            return TemperatureConverter.convert(
-                temperature_c, UnitOfTemperature.CELSIUS, output_unit
+            self._forecast = await self._async_calculate_forecast(self._forecast_type)
+        except HomeAssistantError as err:
+            _LOGGER.debug("Could not update forecast of %s: %s", self._temp, err)
+            return
+        self._async_write_if_changed()
+
+    async def async_get_forecasts(self, type: str) -> ServiceResponse:  # noqa: A002
+        """Return the felt temperature forecast of the weather source."""
+        if not self._is_weather_source():
+            raise ServiceValidationError(
+                f"{self.entity_id} does not use a weather entity as source"
             )
-        except ValueError:
-            _LOGGER.warning("Unsupported output temperature unit '%s'", output_unit)
-            return temperature_c
+        return {ATTR_FORECAST: await self._async_calculate_forecast(type)}
 
     async def async_update(self) -> None:
         """Update sensor state."""
-        temp = self._get_temperature(self._temp)
-        humd = self._get_humidity(self._humd)
-        wind = self._get_wind_speed(self._wind)
-
-        # If humidity or wind is missing after startup, try _setup_sources() again
-        if humd is None or (self._wind is not None and wind is None):
-            _LOGGER.debug("Humidity or wind missing, running _setup_sources again.")
-            self._setup_sources()
-            # Försök igen efter att ha kört _setup_sources
-            temp = self._get_temperature(self._temp)
-            humd = self._get_humidity(self._humd)
-            wind = self._get_wind_speed(self._wind)
+        self._async_update_aggregates()
+        self._async_calculate()
 
-        self._temp_val = self._to_output_unit(temp)
-        self._humd_val = humd
-        self._wind_val = wind
+    @callback
+    def _async_calculate(self) -> None:
+        """Read the sources and calculate the felt temperature."""
+        stats = self.stats
+        stats.recalculations += 1
+        start = perf_counter()
+        temp = self._read(ROLE_TEMPERATURE)
+        humd = self._read(ROLE_HUMIDITY)
+        wind = self._read(ROLE_WIND_SPEED)
+        temp = self._filtered(self._temp_filter, temp)
+        wind = self._filtered(self._wind_filter, wind)
+        read_done = perf_counter()
+        stats.read.record(read_done - start)
 
         if temp is None or humd is None:
-            _LOGGER.debug(
-                "Sources not ready yet (temp: %s, humd: %s). Trying again in %s sec.",
-                temp,
-                humd,
-                RETRY_DELAY,
+            waiting_for = tuple(
+                entity_id
+                for role, value in ((ROLE_TEMPERATURE, temp), (ROLE_HUMIDITY, humd))
+                if value is None
+                for entity_id in self._role_sources[role] or (role,)
             )
-            self._attr_native_value = None
-
-            if self._retry_timer is None:
-
-                def retry_update(_):
-                    self._retry_timer = None
-                    self.hass.add_job(self.async_schedule_update_ha_state, True)
-
-                self._retry_timer = async_call_later(
-                    self.hass, RETRY_DELAY, retry_update
+            if waiting_for != self._waiting_for:
+                _LOGGER.debug(
+                    "%s is waiting for a valid state of %s",
+                    self.entity_id,
+                    ", ".join(waiting_for),
                 )
+            self._waiting_for = waiting_for
+            # A restored value is kept until fresh inputs replace it.
+            if not self._restored:
+                self._attr_native_value = None
+                self._async_set_indices(None)
+                self._temp_val = self._to_output_unit(temp)
+                self._humd_val = humd
+                self._wind_val = wind
+            stats.convert.record(perf_counter() - read_done)
             return
+        self._waiting_for = ()
+        self._restored = False
+        self._temp_val = self._to_output_unit(temp)
+        self._humd_val = humd
+        self._wind_val = wind
 
         if wind is None:
             _LOGGER.warning(
                 "Unable to get wind speed. Wind will be ignored in the calculation."
             )
             wind = 0.0
-
-        if self._retry_timer is not None:
-            self._retry_timer()  # Avbryter schemalagd retry
-            self._retry_timer = None
+        self._inputs = (temp, humd, wind)
 
         output_unit = self.native_unit_of_measurement
-        utci_c = self._calculate_utci(temp, humd, wind)
-        self._attr_native_value = self._round_to_one_decimal(
-            self._to_output_unit(utci_c)
-        )
-        self._temp_val = self._round_to_one_decimal(self._temp_val)
+        compute_start = perf_counter()
+        values = comfort_indices(temp, humd, wind, self._pipeline)
+        if self._model == MODEL_UTCI:
+            utci_c = self._calculate_felt(temp, humd, wind)
+        else:
+            utci_c = values[INDEX_APPARENT_TEMPERATURE]
+        self._async_set_indices(values)
+        now = monotonic()
+        for rolling in self._rolling.values():
+            rolling.add(now, utci_c)
+        compute_done = perf_counter()
+        stats.compute.record(compute_done - compute_start)
+        self._attr_native_value = round_to_one_decimal(self._to_output_unit(utci_c))
+        self._temp_val = round_to_one_decimal(self._temp_val)
+        stats.convert.record(perf_counter() - compute_done + compute_start - read_done)
         _LOGGER.debug(
-            "New (approx) UTCI value is %s %s (temp: %s, humd: %s, wind: %s)",
+            "New %s felt temperature is %s %s (temp: %s, humd: %s, wind: %s)",
+            self._model,
             self._attr_native_value,
             output_unit,
             self._temp_val,
             humd,
             wind,
         )
+
+
+class ComfortIndexSensor(SensorEntity):
+    """A comfort index of the same inputs as a felt temperature sensor.
+
+    The index has no source subscriptions of its own. The felt temperature
+    sensor computes every index in its calculation pass and writes the
+    index sensors after its own state.
+    """
+
+    _attr_has_entity_name = True
+    _attr_device_class = SensorDeviceClass.TEMPERATURE
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_should_poll = False
+    _attr_suggested_display_precision = 1
+
+    def __init__(self, parent: FeltTemperatureSensor, index: str) -> None:
+        """Initialize the index sensor."""
+        self._parent = parent
+        self.index = index
+        self.native_value_c: float | None = None
+        self._attr_translation_key = index
+        self._attr_unique_id = f"{parent.unique_id}_{index}"
+        self._last_written: tuple[Any, ...] | None = None
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        """Return the device of the felt temperature sensor."""
+        return self._parent.device_info
+
+    @property
+    def native_unit_of_measurement(self) -> str:
+        """Return the unit of the felt temperature sensor."""
+        return self._parent.native_unit_of_measurement
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the index in the output unit."""
+        return round_to_one_decimal(self._parent._to_output_unit(self.native_value_c))
+
+    @callback
+    def async_write_if_changed(self) -> None:
+        """Write state unless value and unit equal the last write."""
+        if self.hass is None:
+            return
+        written = (self.native_value, self.native_unit_of_measurement)
+        if written != self._last_written:
+            self._last_written = written
+            self.async_write_ha_state()
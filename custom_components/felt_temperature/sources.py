@@ -0,0 +1,290 @@
+"""Resolve which source entity provides temperature, humidity and wind."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, replace
+import logging
+from typing import Any
+
+from homeassistant.components.sensor import SensorDeviceClass
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import (
+    ATTR_DEVICE_CLASS,
+    ATTR_UNIT_OF_MEASUREMENT,
+    CONF_SOURCE,
+    PERCENTAGE,
+    UnitOfSpeed,
+    UnitOfTemperature,
+)
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.event import async_track_entity_registry_updated_event
+
+from .const import (
+    CLIMATE_DOMAIN,
+    CONF_ADDITIONAL_HUMIDITY_SOURCES,
+    CONF_ADDITIONAL_TEMPERATURE_SOURCES,
+    CONF_ADDITIONAL_WIND_SOURCES,
+    CONF_HUMIDITY_SOURCE,
+    CONF_MODE,
+    CONF_MRT_SOURCE,
+    CONF_TEMPERATURE_SOURCE,
+    CONF_WIND_SOURCE,
+    MODE_SEPARATE,
+    MODE_WEATHER,
+    WEATHER_DOMAIN,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+_ROLE_KEYS = (CONF_TEMPERATURE_SOURCE, CONF_HUMIDITY_SOURCE, CONF_WIND_SOURCE)
+_ENTITY_KEYS = (*_ROLE_KEYS, CONF_MRT_SOURCE)
+_ADDITIONAL_KEYS = (
+    CONF_ADDITIONAL_TEMPERATURE_SOURCES,
+    CONF_ADDITIONAL_HUMIDITY_SOURCES,
+    CONF_ADDITIONAL_WIND_SOURCES,
+)
+
+
+@dataclass(slots=True, frozen=True)
+class SourceRoles:
+    """Source entity of every input, None if there is none.
+
+    An input can have additional sources, they are combined with the first
+    one by the sensor.
+    """
+
+    temperature: str | None = None
+    humidity: str | None = None
+    wind_speed: str | None = None
+    additional_temperature: tuple[str, ...] = ()
+    additional_humidity: tuple[str, ...] = ()
+    additional_wind_speed: tuple[str, ...] = ()
+
+    def for_role(self, role: str) -> tuple[str, ...]:
+        """Return every distinct source of role, the first one first."""
+        first = getattr(self, role)
+        additional = getattr(self, f"additional_{role}")
+        return tuple(
+            dict.fromkeys(
+                entity_id for entity_id in (first, *additional) if entity_id is not None
+            )
+        )
+
+    @property
+    def entity_ids(self) -> list[str]:
+        """Return the distinct source entity ids."""
+        return list(
+            dict.fromkeys(
+                entity_id
+                for entity_id in (
+                    self.temperature,
+                    self.humidity,
+                    self.wind_speed,
+                    *self.additional_temperature,
+                    *self.additional_humidity,
+                    *self.additional_wind_speed,
+                )
+                if entity_id is not None
+            )
+        )
+
+
+def _get(entry: ConfigEntry, key: str) -> Any:
+    return entry.options.get(key, entry.data.get(key))
+
+
+@callback
+def async_get_source_roles(entry: ConfigEntry) -> SourceRoles:
+    """Return the source roles stored in a config entry."""
+    if _get(entry, CONF_MODE) == MODE_WEATHER:
+        weather = _get(entry, CONF_TEMPERATURE_SOURCE)
+        return SourceRoles(weather, weather, weather)
+    temperature = _get(entry, CONF_TEMPERATURE_SOURCE)
+    wind_speed = _get(entry, CONF_WIND_SOURCE)
+    # A weather entity used as temperature source also provides the wind.
+    if (
+        wind_speed is None
+        and temperature is not None
+        and temperature.partition(".")[0] == WEATHER_DOMAIN
+    ):
+        wind_speed = temperature
+    return SourceRoles(
+        temperature,
+        _get(entry, CONF_HUMIDITY_SOURCE),
+        wind_speed,
+        *(tuple(_get(entry, key) or ()) for key in _ADDITIONAL_KEYS),
+    )
+
+
+@callback
+def async_resolve_source_roles(
+    hass: HomeAssistant, entity_ids: list[str]
+) -> SourceRoles:
+    """Guess the roles of a legacy list of source entities.
+
+    Device class and unit are taken from the current state, or from the
+    entity registry when the source has no state yet, so this also works
+    during startup. The first matching entity wins for every role.
+    """
+    registry = er.async_get(hass)
+    temperature = humidity = wind_speed = None
+    for entity_id in entity_ids:
+        domain = entity_id.partition(".")[0]
+        if (state := hass.states.get(entity_id)) is not None:
+            device_class = state.attributes.get(ATTR_DEVICE_CLASS)
+            unit = state.attributes.get(ATTR_UNIT_OF_MEASUREMENT)
+        elif (registry_entry := registry.async_get(entity_id)) is not None:
+            device_class = (
+                registry_entry.device_class or registry_entry.original_device_class
+            )
+            unit = registry_entry.unit_of_measurement
+        else:
+            device_class = unit = None
+        name = entity_id.lower()
+
+        if temperature is None and (
+            domain in (WEATHER_DOMAIN, CLIMATE_DOMAIN)
+            or device_class == SensorDeviceClass.TEMPERATURE
+            or (unit in UnitOfTemperature if unit else False)
+            or "temperature" in name
+        ):
+            temperature = entity_id
+        if humidity is None and (
+            domain in (WEATHER_DOMAIN, CLIMATE_DOMAIN)
+            or device_class == SensorDeviceClass.HUMIDITY
+            or unit == PERCENTAGE
+            or "humidity" in name
+        ):
+            humidity = entity_id
+        if wind_speed is None and (
+            domain == WEATHER_DOMAIN
+            or device_class == SensorDeviceClass.WIND_SPEED
+            or (unit in UnitOfSpeed if unit else False)
+            or "wind" in name
+        ):
+            wind_speed = entity_id
+
+    _LOGGER.debug(
+        "Resolved sources %s to temperature %s, humidity %s, wind %s",
+        entity_ids,
+        temperature,
+        humidity,
+        wind_speed,
+    )
+    return SourceRoles(temperature, humidity, wind_speed)
+
+
+def roles_as_data(roles: SourceRoles) -> dict[str, str | None]:
+    """Return roles as config entry data."""
+    return {
+        CONF_TEMPERATURE_SOURCE: roles.temperature,
+        CONF_HUMIDITY_SOURCE: roles.humidity,
+        CONF_WIND_SOURCE: roles.wind_speed,
+    }
+
+
+@callback
+def async_migrate_legacy_sources(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return entry data with the roles of a legacy source list resolved.
+
+    The list is kept so roles that cannot be resolved yet are resolved later
+    by async_track_source_registry_updates().
+    """
+    data = dict(entry.data)
+    if _get(entry, CONF_MODE) is None:
+        legacy_sources = _get(entry, CONF_SOURCE) or []
+        data.update(roles_as_data(async_resolve_source_roles(hass, legacy_sources)))
+        data[CONF_MODE] = MODE_SEPARATE
+        data[CONF_SOURCE] = legacy_sources
+    return data
+
+
+@callback
+def async_track_source_registry_updates(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> CALLBACK_TYPE:
+    """Keep the stored roles of entry in sync with the entity registry.
+
+    Renamed sources are replaced in the entry. For entries migrated from a
+    legacy source list, roles that could not be resolved yet are resolved
+    again when one of the listed entities is registered or changed. The
+    update listener of the entry applies the change. The watched entities
+    follow the entry when its sources change.
+    """
+    legacy_sources: list[str] = []
+    unsub_registry: CALLBACK_TYPE | None = None
+
+    @callback
+    def _async_subscribe() -> None:
+        nonlocal legacy_sources, unsub_registry
+        legacy_sources = _get(entry, CONF_SOURCE) or []
+        watched = {
+            entity_id for key in _ENTITY_KEYS if (entity_id := _get(entry, key))
+        } | set(legacy_sources)
+        for key in _ADDITIONAL_KEYS:
+            watched.update(_get(entry, key) or ())
+        if unsub_registry is not None:
+            unsub_registry()
+        unsub_registry = async_track_entity_registry_updated_event(
+            hass, watched, _async_registry_updated
+        )
+
+    async def _async_entry_updated(hass: HomeAssistant, entry: ConfigEntry) -> None:
+        _async_subscribe()
+
+    @callback
+    def _async_registry_updated(
+        event: Event[er.EventEntityRegistryUpdatedData],
+    ) -> None:
+        data = event.data
+        if (old_entity_id := data.get("old_entity_id")) is not None:
+            new_entity_id = data["entity_id"]
+
+            def rename_value(value: Any) -> Any:
+                # Source lists and the weights keyed by source are renamed too.
+                if isinstance(value, list):
+                    return [rename_value(item) for item in value]
+                if isinstance(value, dict):
+                    return {rename_value(key): item for key, item in value.items()}
+                return new_entity_id if value == old_entity_id else value
+
+            def rename(values: dict[str, Any]) -> dict[str, Any]:
+                return {key: rename_value(value) for key, value in values.items()}
+
+            _LOGGER.debug("Source %s renamed to %s", old_entity_id, new_entity_id)
+            hass.config_entries.async_update_entry(
+                entry,
+                data=rename(dict(entry.data)),
+                options=rename(dict(entry.options)),
+            )
+            return
+
+        if data["action"] == "remove" or not legacy_sources:
+            return
+        stored = async_get_source_roles(entry)
+        resolved = async_resolve_source_roles(hass, legacy_sources)
+        roles = replace(
+            stored,
+            temperature=stored.temperature or resolved.temperature,
+            humidity=stored.humidity or resolved.humidity,
+            wind_speed=stored.wind_speed or resolved.wind_speed,
+        )
+        if roles == stored:
+            return
+        hass.config_entries.async_update_entry(
+            entry, data={**entry.data, **roles_as_data(roles)}
+        )
+
+    _async_subscribe()
+    unsub_update = entry.add_update_listener(_async_entry_updated)
+
+    @callback
+    def _async_unsubscribe() -> None:
+        unsub_update()
+        if unsub_registry is not None:
+            unsub_registry()
+
+    return _async_unsubscribe
@@ -0,0 +1,19 @@
+"""Helpers shared by the Felt Temperature tests."""
+
+from __future__ import annotations
+
+import asyncio
+
+from homeassistant.core import HomeAssistant
+
+
+async def async_wait_for_updates(hass: HomeAssistant) -> None:
+    """Wait until pending work and the batched sensor updates it caused ran.
+
+    State change listeners are dispatched from a loop callback and the
+    sensor flushes from another one queued by them, so the flush runs one
+    loop iteration after async_block_till_done() returns.
+    """
+    await hass.async_block_till_done()
+    await asyncio.sleep(0)
+    await hass.async_block_till_done()
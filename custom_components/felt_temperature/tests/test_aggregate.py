@@ -0,0 +1,115 @@
+"""Tests for combining several sources of one input."""
+
+from __future__ import annotations
+
+import math
+import random
+import statistics
+
+import pytest
+
+from custom_components.felt_temperature.aggregate import SourceAggregate
+from custom_components.felt_temperature.const import (
+    AGGREGATION_MEDIAN,
+    AGGREGATION_TRIMMED_MEAN,
+    AGGREGATION_WEIGHTED_MEAN,
+)
+
+
+def test_median_follows_updates_and_evictions() -> None:
+    """Only the changed source moves, a source without value is dropped."""
+    aggregate = SourceAggregate(AGGREGATION_MEDIAN)
+    assert aggregate.value is None
+    for source, value in (("a", 20.0), ("b", 26.0), ("c", 21.0)):
+        aggregate.update(source, value)
+    assert aggregate.value == 21.0
+
+    aggregate.update("c", None)
+    assert len(aggregate) == 2
+    assert aggregate.value == 23.0
+
+    aggregate.update("b", 18.0)
+    assert aggregate.value == 19.0
+
+    aggregate.update("a", None)
+    aggregate.update("b", None)
+    assert aggregate.value is None
+
+
+def test_trimmed_mean_drops_outliers() -> None:
+    """A fifth of the values is dropped at each end."""
+    aggregate = SourceAggregate(AGGREGATION_TRIMMED_MEAN)
+    for source, value in enumerate((20.0, 21.0, 22.0, 23.0, 60.0)):
+        aggregate.update(str(source), value)
+    assert aggregate.value == pytest.approx(22.0)
+
+    # Too few values to trim, the plain mean is used.
+    aggregate = SourceAggregate(AGGREGATION_TRIMMED_MEAN)
+    aggregate.update("a", 20.0)
+    aggregate.update("b", 22.0)
+    assert aggregate.value == pytest.approx(21.0)
+
+
+def test_weighted_mean() -> None:
+    """Sources without a weight count once."""
+    aggregate = SourceAggregate(AGGREGATION_WEIGHTED_MEAN, {"a": 3.0})
+    aggregate.update("a", 20.0)
+    aggregate.update("b", 24.0)
+    assert aggregate.value == pytest.approx(21.0)
+
+    aggregate.update("a", None)
+    assert aggregate.value == pytest.approx(24.0)
+
+
+@pytest.mark.parametrize(
+    "method", [AGGREGATION_MEDIAN, AGGREGATION_TRIMMED_MEAN, AGGREGATION_WEIGHTED_MEAN]
+)
+def test_matches_full_recomputation(method: str) -> None:
+    """Incremental updates agree with recomputing from all current values."""
+    rng = random.Random(18)
+    weights = {f"s{index}": rng.uniform(0.5, 2.0) for index in range(9)}
+    aggregate = SourceAggregate(method, weights)
+    current: dict[str, float] = {}
+    for _ in range(2000):
+        source = rng.choice(list(weights))
+        if rng.random() < 0.1:
+            current.pop(source, None)
+            aggregate.update(source, None)
+        else:
+            current[source] = value = rng.uniform(-30.0, 40.0)
+            aggregate.update(source, value)
+
+        if not current:
+            assert aggregate.value is None
+            continue
+        values = sorted(current.values())
+        if method == AGGREGATION_MEDIAN:
+            expected = statistics.median(values)
+        elif method == AGGREGATION_TRIMMED_MEAN:
+            trim = int(len(values) * 0.2)
+            expected = statistics.fmean(values[trim : len(values) - trim])
+        else:
+            expected = sum(weights[s] * v for s, v in current.items()) / sum(
+                weights[s] for s in current
+            )
+        assert aggregate.value == pytest.approx(expected)
+
+
+@pytest.mark.parametrize("invalid", [math.nan, math.inf, -math.inf])
+def test_non_finite_values_are_evicted(invalid) -> None:
+    """A NaN or infinite value evicts the source without corrupting the rest."""
+    median = SourceAggregate(AGGREGATION_MEDIAN)
+    mean = SourceAggregate(AGGREGATION_WEIGHTED_MEAN)
+    for aggregate in (median, mean):
+        for source, value in (("a", 1.0), ("b", invalid), ("c", 3.0)):
+            aggregate.update(source, value)
+        assert len(aggregate) == 2
+        assert aggregate.value == 2.0
+
+        aggregate.update("b", 2.0)
+        assert len(aggregate) == 3
+        assert aggregate.value == 2.0
+
+        aggregate.update("a", 4.0)
+    assert median.value == 3.0
+    assert mean.value == 3.0
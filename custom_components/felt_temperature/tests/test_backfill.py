@@ -0,0 +1,157 @@
+"""Tests for the history backfill service."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.components.recorder import Recorder, get_instance
+from homeassistant.components.recorder.statistics import statistics_during_period
+from homeassistant.components.sensor import SensorDeviceClass
+from homeassistant.const import (
+    ATTR_DEVICE_CLASS,
+    ATTR_UNIT_OF_MEASUREMENT,
+    CONF_NAME,
+    PERCENTAGE,
+    UnitOfTemperature,
+)
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import entity_registry as er
+from homeassistant.util import dt as dt_util
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+from pytest_homeassistant_custom_component.components.recorder.common import (
+    async_wait_recording_done,
+)
+
+from custom_components.felt_temperature.const import (
+    CONF_HUMIDITY_SOURCE,
+    CONF_MODE,
+    CONF_TEMPERATURE_SOURCE,
+    DOMAIN,
+    MODE_SEPARATE,
+)
+from custom_components.felt_temperature.core import (
+    round_to_one_decimal,
+    simple_felt_temperature,
+)
+
+TEMPERATURE_SOURCE = "sensor.outdoor_temperature"
+HUMIDITY_SOURCE = "sensor.outdoor_humidity"
+
+
+@pytest.fixture
+def mock_recorder_before_hass(async_test_recorder) -> None:
+    """Set up the recorder before hass, as required by the autouse fixtures."""
+
+
+def _set_temperature(hass: HomeAssistant, value: float) -> None:
+    hass.states.async_set(
+        TEMPERATURE_SOURCE,
+        str(value),
+        {
+            ATTR_DEVICE_CLASS: SensorDeviceClass.TEMPERATURE,
+            ATTR_UNIT_OF_MEASUREMENT: UnitOfTemperature.CELSIUS,
+        },
+    )
+
+
+async def test_backfill_imports_hourly_statistics(
+    recorder_mock: Recorder, hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """Recorded source history must be imported as hourly statistics."""
+    start = dt_util.utcnow().replace(minute=0, second=0, microsecond=0) - timedelta(
+        hours=5
+    )
+    freezer.move_to(start - timedelta(minutes=1))
+    _set_temperature(hass, 20)
+    hass.states.async_set(
+        HUMIDITY_SOURCE,
+        "50",
+        {
+            ATTR_DEVICE_CLASS: SensorDeviceClass.HUMIDITY,
+            ATTR_UNIT_OF_MEASUREMENT: PERCENTAGE,
+        },
+    )
+    await async_wait_recording_done(hass)
+    freezer.move_to(start + timedelta(minutes=90))
+    _set_temperature(hass, 30)
+    await async_wait_recording_done(hass)
+    freezer.move_to(start + timedelta(hours=3, minutes=20))
+
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="Outdoor",
+        data={
+            CONF_NAME: "Outdoor",
+            CONF_MODE: MODE_SEPARATE,
+            CONF_TEMPERATURE_SOURCE: TEMPERATURE_SOURCE,
+            CONF_HUMIDITY_SOURCE: HUMIDITY_SOURCE,
+        },
+        version=2,
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    entity_id = er.async_get(hass).async_get_entity_id("sensor", DOMAIN, entry.entry_id)
+
+    async def statistics() -> list[dict]:
+        await async_wait_recording_done(hass)
+        result = await get_instance(hass).async_add_executor_job(
+            statistics_during_period,
+            hass,
+            start,
+            None,
+            {entity_id},
+            "hour",
+            None,
+            {"mean", "min", "max"},
+        )
+        return result[entity_id]
+
+    cold = round_to_one_decimal(simple_felt_temperature(20, 50, 0))
+    warm = round_to_one_decimal(simple_felt_temperature(30, 50, 0))
+
+    # Times entered without a time zone, like the example in services.yaml,
+    # are local times.
+    local_format = "%Y-%m-%d %H:%M:%S"
+    await hass.services.async_call(
+        DOMAIN,
+        "backfill",
+        {
+            "entity_id": entity_id,
+            "start_time": dt_util.as_local(start).strftime(local_format),
+            "end_time": dt_util.as_local(start + timedelta(hours=2)).strftime(
+                local_format
+            ),
+        },
+        blocking=True,
+    )
+    assert [(row["min"], row["max"]) for row in await statistics()] == [
+        (cold, cold),
+        (cold, warm),
+    ]
+
+    await hass.services.async_call(
+        DOMAIN,
+        "backfill",
+        {"entity_id": entity_id, "start_time": start},
+        blocking=True,
+    )
+    rows = await statistics()
+    # The current, incomplete hour is left to the recorder.
+    assert [(row["min"], row["max"]) for row in rows] == [
+        (cold, cold),
+        (cold, warm),
+        (warm, warm),
+    ]
+    assert rows[1]["mean"] == pytest.approx((cold + warm) / 2)
+
+    with pytest.raises(ServiceValidationError):
+        await hass.services.async_call(
+            DOMAIN,
+            "backfill",
+            {"entity_id": entity_id, "start_time": dt_util.utcnow()},
+            blocking=True,
+        )
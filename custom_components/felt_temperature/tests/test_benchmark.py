@@ -0,0 +1,136 @@
+"""Micro-benchmarks for the sensor hot path."""
+
+from __future__ import annotations
+
+from time import perf_counter
+from unittest.mock import patch
+
+from homeassistant.components.sensor import SensorDeviceClass
+from homeassistant.const import (
+    ATTR_DEVICE_CLASS,
+    ATTR_UNIT_OF_MEASUREMENT,
+    CONF_NAME,
+    PERCENTAGE,
+    UnitOfTemperature,
+)
+from homeassistant.helpers import entity_registry as er
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.felt_temperature import core
+from custom_components.felt_temperature.const import (
+    CONF_HUMIDITY_SOURCE,
+    CONF_MODE,
+    CONF_TEMPERATURE_SOURCE,
+    DOMAIN,
+    MODE_SEPARATE,
+)
+from custom_components.felt_temperature.tests.common import async_wait_for_updates
+
+EVENTS = 2000
+UPDATES = 100_000
+TEMPERATURE_SOURCE = "sensor.bench_temperature"
+HUMIDITY_SOURCE = "sensor.bench_humidity"
+
+
+async def _setup_entity(hass):
+    """Set up one separate-source sensor and return its entity object."""
+    hass.states.async_set(
+        TEMPERATURE_SOURCE,
+        "20",
+        {
+            ATTR_DEVICE_CLASS: SensorDeviceClass.TEMPERATURE,
+            ATTR_UNIT_OF_MEASUREMENT: UnitOfTemperature.CELSIUS,
+        },
+    )
+    hass.states.async_set(
+        HUMIDITY_SOURCE,
+        "50",
+        {
+            ATTR_DEVICE_CLASS: SensorDeviceClass.HUMIDITY,
+            ATTR_UNIT_OF_MEASUREMENT: PERCENTAGE,
+        },
+    )
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="Bench",
+        data={
+            CONF_NAME: "Bench",
+            CONF_MODE: MODE_SEPARATE,
+            CONF_TEMPERATURE_SOURCE: TEMPERATURE_SOURCE,
+            CONF_HUMIDITY_SOURCE: HUMIDITY_SOURCE,
+        },
+        version=2,
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await async_wait_for_updates(hass)
+    entity_id = er.async_get(hass).async_get_entity_id("sensor", DOMAIN, entry.entry_id)
+    return hass.data["sensor"].get_entity(entity_id)
+
+
+async def test_source_events_write_without_tasks(hass) -> None:
+    """Source events must reach the state without a task per update.
+
+    Every event goes through the shipped path, the state change listener,
+    the batcher and the state write, and is compared with the task per
+    update the sensor used before, async_schedule_update_ha_state(True).
+    """
+    entity = await _setup_entity(hass)
+    attributes = hass.states.get(TEMPERATURE_SOURCE).attributes
+
+    start = perf_counter()
+    for _ in range(EVENTS):
+        entity.async_schedule_update_ha_state(True)
+        await async_wait_for_updates(hass)
+    task_rate = EVENTS / (perf_counter() - start)
+
+    writes = entity.stats.writes
+    with patch.object(
+        hass, "async_create_task", wraps=hass.async_create_task
+    ) as create_task:
+        start = perf_counter()
+        for index in range(EVENTS):
+            hass.states.async_set(TEMPERATURE_SOURCE, str(21 + index % 2), attributes)
+            await async_wait_for_updates(hass)
+        event_rate = EVENTS / (perf_counter() - start)
+
+    create_task.assert_not_called()
+    assert entity.stats.writes - writes == EVENTS
+    assert event_rate > task_rate
+
+
+async def test_cached_output_unit_beats_lookup(hass) -> None:
+    """The cached output unit and converter must handle updates faster.
+
+    Every synthetic update reads the output unit three times and converts
+    two values to it, as a calculation and its state write do. Without the
+    caches, reset before every read here, the sensor looks up the unit
+    system and resolves the converter each time.
+    """
+    await hass.config.async_update(unit_system="us_customary")
+    entity = await _setup_entity(hass)
+    values = [10.0 + (index % 400) / 20 for index in range(UPDATES)]
+
+    start = perf_counter()
+    for value in values:
+        for _ in range(3):
+            entity.clear_unit_cache()
+            unit = entity.native_unit_of_measurement
+        for _ in range(2):
+            entity.clear_unit_cache()
+            entity._to_output_unit(value)
+    uncached_rate = UPDATES / (perf_counter() - start)
+
+    start = perf_counter()
+    for value in values:
+        for _ in range(3):
+            unit = entity.native_unit_of_measurement
+        for _ in range(2):
+            entity._to_output_unit(value)
+    cached_rate = UPDATES / (perf_counter() - start)
+
+    assert unit == UnitOfTemperature.FAHRENHEIT
+    assert entity._to_output_unit(20.0) == core.from_celsius(
+        20.0, UnitOfTemperature.FAHRENHEIT
+    )
+    assert cached_rate > uncached_rate
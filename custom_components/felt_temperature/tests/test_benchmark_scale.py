@@ -0,0 +1,245 @@
+"""Benchmarks of the sensor pipeline with 1, 100 and 1000 config entries.
+
+Needs pytest-benchmark, the tests are skipped without it. Every entry reads
+its own synthetic temperature and humidity source. Per entry count this
+measures:
+
+- events per second: source updates fanned out, calculated and written,
+  timed by pytest-benchmark
+- event to state latency: from a source update to the written felt
+  temperature, median of a sample of entries
+- event loop lag: the longest the loop is blocked while every source
+  reports once, each in its own loop iteration
+- memory per entity: Python memory allocated while setting up the entries
+
+The measurements are compared with benchmark_baseline.json next to this
+file. Timings depend on the machine, so only a slowdown beyond
+TIME_TOLERANCE fails; memory is compared more tightly. To record new
+baselines run::
+
+    FELT_TEMPERATURE_UPDATE_BASELINE=1 pytest \\
+        custom_components/felt_temperature/tests/test_benchmark_scale.py -s
+"""
+
+from __future__ import annotations
+
+import asyncio
+from functools import partial
+import json
+import os
+from pathlib import Path
+from statistics import median
+from time import perf_counter
+import tracemalloc
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from homeassistant.components.sensor import SensorDeviceClass  # noqa: E402
+from homeassistant.const import (  # noqa: E402
+    ATTR_DEVICE_CLASS,
+    ATTR_UNIT_OF_MEASUREMENT,
+    CONF_NAME,
+    EVENT_STATE_CHANGED,
+    PERCENTAGE,
+    UnitOfTemperature,
+)
+from homeassistant.core import callback  # noqa: E402
+from homeassistant.helpers import entity_registry as er  # noqa: E402
+from pytest_homeassistant_custom_component.common import (  # noqa: E402
+    MockConfigEntry,
+)
+
+from custom_components.felt_temperature.const import (  # noqa: E402
+    CONF_HUMIDITY_SOURCE,
+    CONF_MODE,
+    CONF_TEMPERATURE_SOURCE,
+    DOMAIN,
+    MODE_SEPARATE,
+)
+from custom_components.felt_temperature.tests.common import (  # noqa: E402
+    async_wait_for_updates,
+)
+
+BASELINE_FILE = Path(__file__).with_name("benchmark_baseline.json")
+UPDATE_BASELINE = bool(os.environ.get("FELT_TEMPERATURE_UPDATE_BASELINE"))
+# Factor a timing may be worse than its baseline, and the smallest timing
+# that is compared at all, before it counts as a regression.
+TIME_TOLERANCE = 10
+TIME_FLOOR = 0.005
+MEMORY_TOLERANCE = 1.5
+LATENCY_SAMPLES = 20
+TEMPERATURE_ATTRIBUTES = {
+    ATTR_DEVICE_CLASS: SensorDeviceClass.TEMPERATURE,
+    ATTR_UNIT_OF_MEASUREMENT: UnitOfTemperature.CELSIUS,
+}
+HUMIDITY_ATTRIBUTES = {
+    ATTR_DEVICE_CLASS: SensorDeviceClass.HUMIDITY,
+    ATTR_UNIT_OF_MEASUREMENT: PERCENTAGE,
+}
+
+
+def _temperature_source(index: int) -> str:
+    return f"sensor.bench_temperature_{index}"
+
+
+def _entry(index: int) -> MockConfigEntry:
+    return MockConfigEntry(
+        domain=DOMAIN,
+        title=f"Bench {index}",
+        data={
+            CONF_NAME: f"Bench {index}",
+            CONF_MODE: MODE_SEPARATE,
+            CONF_TEMPERATURE_SOURCE: _temperature_source(index),
+            CONF_HUMIDITY_SOURCE: f"sensor.bench_humidity_{index}",
+        },
+        version=3,
+    )
+
+
+async def _setup_entries(hass, count: int) -> tuple[list, float]:
+    """Set up count entries and return their sensors and bytes per sensor.
+
+    A throwaway entry is set up and removed first, so the memory of
+    importing the integration and its platforms is not counted.
+    """
+    warm_up = _entry(-1)
+    warm_up.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(warm_up.entry_id)
+    await hass.config_entries.async_remove(warm_up.entry_id)
+    await async_wait_for_updates(hass)
+
+    for index in range(count):
+        hass.states.async_set(_temperature_source(index), "20", TEMPERATURE_ATTRIBUTES)
+        hass.states.async_set(
+            f"sensor.bench_humidity_{index}", "50", HUMIDITY_ATTRIBUTES
+        )
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    entries = []
+    for index in range(count):
+        entry = _entry(index)
+        entry.add_to_hass(hass)
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        entries.append(entry)
+    await async_wait_for_updates(hass)
+    memory = (tracemalloc.get_traced_memory()[0] - before) / count
+    tracemalloc.stop()
+
+    registry = er.async_get(hass)
+    sensors = [
+        hass.data["sensor"].get_entity(
+            registry.async_get_entity_id("sensor", DOMAIN, entry.entry_id)
+        )
+        for entry in entries
+    ]
+    return sensors, memory
+
+
+async def _event_to_state_latency(hass, sensors: list) -> float:
+    """Return the median seconds from a source update to the sensor write."""
+    written: dict[str, float] = {}
+
+    @callback
+    def _collect(event) -> None:
+        written[event.data["entity_id"]] = perf_counter()
+
+    unsub = hass.bus.async_listen(EVENT_STATE_CHANGED, _collect)
+    step = max(len(sensors) // LATENCY_SAMPLES, 1)
+    latencies = []
+    for index in range(0, len(sensors), step):
+        start = perf_counter()
+        hass.states.async_set(
+            _temperature_source(index), str(21 + index % 5), TEMPERATURE_ATTRIBUTES
+        )
+        await async_wait_for_updates(hass)
+        latencies.append(written[sensors[index].entity_id] - start)
+    unsub()
+    return median(latencies)
+
+
+async def _event_loop_lag(hass, count: int) -> float:
+    """Return the longest loop block while every source reports once."""
+    lag = 0.0
+    running = True
+
+    async def _probe() -> None:
+        nonlocal lag
+        while running:
+            start = perf_counter()
+            await asyncio.sleep(0)
+            lag = max(lag, perf_counter() - start)
+
+    # Not a task of hass, block_till_done would wait for it forever.
+    probe = asyncio.create_task(_probe())
+    for index in range(count):
+        hass.states.async_set(
+            _temperature_source(index), str(26 + index % 5), TEMPERATURE_ATTRIBUTES
+        )
+        await asyncio.sleep(0)
+    await async_wait_for_updates(hass)
+    running = False
+    await probe
+    return lag
+
+
+def _check_baseline(count: int, results: dict[str, float]) -> None:
+    """Compare results with the stored baseline, or store them."""
+    baselines = json.loads(BASELINE_FILE.read_text()) if BASELINE_FILE.exists() else {}
+    if UPDATE_BASELINE:
+        baselines[str(count)] = {
+            name: round(value, 6) for name, value in results.items()
+        }
+        BASELINE_FILE.write_text(json.dumps(baselines, indent=2) + "\n")
+        return
+    if (baseline := baselines.get(str(count))) is None:
+        pytest.skip(f"no baseline for {count} entries")
+    assert (
+        results["events_per_second"] * TIME_TOLERANCE >= (baseline["events_per_second"])
+    )
+    for name in ("latency", "loop_lag"):
+        assert results[name] <= max(baseline[name] * TIME_TOLERANCE, TIME_FLOOR)
+    assert results["memory_per_entity"] <= (
+        baseline["memory_per_entity"] * MEMORY_TOLERANCE
+    )
+
+
+@pytest.mark.parametrize("count", [1, 100, 1000])
+async def test_pipeline_at_scale(hass, benchmark, count: int) -> None:
+    """Measure throughput, latency, loop lag and memory for count entries."""
+    sensors, memory = await _setup_entries(hass, count)
+    latency = await _event_to_state_latency(hass, sensors)
+    loop_lag = await _event_loop_lag(hass, count)
+
+    values = iter(range(1_000_000))
+
+    async def _update_all_sources() -> None:
+        value = str(10 + next(values) % 20)
+        for index in range(count):
+            hass.states.async_set(
+                _temperature_source(index), value, TEMPERATURE_ATTRIBUTES
+            )
+        await async_wait_for_updates(hass)
+
+    def _round() -> None:
+        # pytest-benchmark times synchronous calls, so every round runs on
+        # the event loop from a worker thread while the test awaits it.
+        asyncio.run_coroutine_threadsafe(_update_all_sources(), hass.loop).result()
+
+    writes = sum(sensor.stats.writes for sensor in sensors)
+    rounds = max(500 // count, 5)
+    await hass.async_add_executor_job(
+        partial(benchmark.pedantic, _round, rounds=rounds, iterations=1)
+    )
+    assert sum(sensor.stats.writes for sensor in sensors) - writes == rounds * count
+
+    results = {
+        "events_per_second": count / benchmark.stats.stats.mean,
+        "latency": latency,
+        "loop_lag": loop_lag,
+        "memory_per_entity": memory,
+    }
+    benchmark.extra_info.update(results)
+    _check_baseline(count, results)
@@ -0,0 +1,164 @@
+"""Tests for the felt_temperature.calculate action."""
+
+from __future__ import annotations
+
+from unittest.mock import patch
+
+import pytest
+import voluptuous as vol
+
+from homeassistant.const import UnitOfSpeed, UnitOfTemperature
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.setup import async_setup_component
+
+from custom_components.felt_temperature import calculate as calculate_module
+from custom_components.felt_temperature.const import DOMAIN
+from custom_components.felt_temperature.core import (
+    from_celsius,
+    round_to_one_decimal,
+    simple_felt_temperature,
+)
+
+WEATHER_SOURCE = "weather.home"
+CLIMATE_SOURCE = "climate.living_room"
+
+
+def _felt(ta: float, rh: float, va: float = 0.0, unit: str = "°C") -> float:
+    return round_to_one_decimal(from_celsius(simple_felt_temperature(ta, rh, va), unit))
+
+
+async def _call(hass: HomeAssistant, **data) -> dict:
+    return await hass.services.async_call(
+        DOMAIN, "calculate", data, blocking=True, return_response=True
+    )
+
+
+@pytest.fixture
+async def setup_integration(hass: HomeAssistant) -> None:
+    """Set up the integration so its actions are registered."""
+    assert await async_setup_component(hass, DOMAIN, {})
+
+
+@pytest.mark.usefixtures("setup_integration")
+async def test_calculate_inputs(hass: HomeAssistant) -> None:
+    """Mappings and lists of values are calculated with their units."""
+    response = await _call(
+        hass,
+        inputs=[
+            {"temperature": 25, "humidity": 50},
+            {
+                "temperature": 77,
+                "humidity": 50,
+                "wind_speed": 3.6,
+                "temperature_unit": "°F",
+                "wind_speed_unit": "km/h",
+            },
+            [10, 80, 2],
+        ],
+    )
+
+    assert response == {
+        "results": [
+            {"felt_temperature": _felt(25, 50)},
+            {"felt_temperature": _felt(25, 50, 1.0)},
+            {"felt_temperature": _felt(10, 80, 2.0)},
+        ],
+        "unit": UnitOfTemperature.CELSIUS,
+    }
+
+
+@pytest.mark.usefixtures("setup_integration")
+async def test_calculate_entities(hass: HomeAssistant) -> None:
+    """Weather and climate entities are read like sensor sources."""
+    hass.states.async_set(
+        WEATHER_SOURCE,
+        "sunny",
+        {
+            "temperature": 68,
+            "temperature_unit": UnitOfTemperature.FAHRENHEIT,
+            "humidity": 60,
+            "wind_speed": 18.0,
+            "wind_speed_unit": UnitOfSpeed.KILOMETERS_PER_HOUR,
+        },
+    )
+    hass.states.async_set(
+        CLIMATE_SOURCE, "heat", {"current_temperature": 21, "current_humidity": 40}
+    )
+    hass.states.async_set("weather.offline", "unavailable")
+
+    response = await _call(
+        hass,
+        inputs=[[25, 50]],
+        entity_id=[WEATHER_SOURCE, "weather.offline", CLIMATE_SOURCE],
+        unit="°F",
+    )
+
+    assert response == {
+        "results": [
+            {"felt_temperature": _felt(25, 50, 0.0, "°F")},
+            {
+                "entity_id": WEATHER_SOURCE,
+                "felt_temperature": _felt(20, 60, 5.0, "°F"),
+            },
+            {"entity_id": "weather.offline", "felt_temperature": None},
+            {"entity_id": CLIMATE_SOURCE, "felt_temperature": _felt(21, 40, 0.0, "°F")},
+        ],
+        "unit": "°F",
+    }
+
+
+@pytest.mark.usefixtures("setup_integration")
+async def test_large_batches_run_in_executor(hass: HomeAssistant) -> None:
+    """Batches above the threshold are calculated off the event loop."""
+    inputs = [[20 + index % 10, 50] for index in range(2000)]
+
+    with patch.object(
+        hass, "async_add_executor_job", wraps=hass.async_add_executor_job
+    ) as executor:
+        response = await _call(hass, inputs=inputs)
+
+    assert executor.call_args.args[0] is calculate_module.calculate
+    results = response["results"]
+    assert len(results) == len(inputs)
+    assert results[3] == {"felt_temperature": _felt(23, 50)}
+
+
+@pytest.mark.usefixtures("setup_integration")
+@pytest.mark.parametrize(
+    "data",
+    [
+        {},
+        {"inputs": [[25]]},
+        {"inputs": [{"temperature": 25}]},
+        {"inputs": [{"temperature": "warm", "humidity": 50}]},
+        {"inputs": [[25, 150]]},
+        {"inputs": [[25, 50, -1]]},
+        {"inputs": [[25, 50, 0, "°R"]]},
+        {"inputs": [[25, 50, 0, "°C", "furlong/fortnight"]]},
+        {"inputs": ["25, 50"]},
+        {"inputs": [[25, 50]], "model": "unknown"},
+    ],
+)
+async def test_invalid_inputs_are_rejected(hass: HomeAssistant, data) -> None:
+    """Incomplete, out of range or unknown values fail validation."""
+    with pytest.raises(vol.Invalid):
+        await _call(hass, **data)
+
+
+@pytest.mark.usefixtures("setup_integration")
+@pytest.mark.parametrize(
+    ("entity_id", "match"),
+    [
+        ("sensor.outdoor_temperature", "not a weather or climate entity"),
+        ("weather.missing", "does not exist"),
+    ],
+)
+async def test_invalid_entities_are_rejected(
+    hass: HomeAssistant, entity_id, match
+) -> None:
+    """Only existing weather and climate entities can be used."""
+    hass.states.async_set("sensor.outdoor_temperature", "20")
+
+    with pytest.raises(ServiceValidationError, match=match):
+        await _call(hass, entity_id=entity_id)
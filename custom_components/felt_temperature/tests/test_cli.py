@@ -0,0 +1,123 @@
+"""Tests for the command line interface for CSV and Parquet files."""
+
+from __future__ import annotations
+
+import csv
+from unittest.mock import patch
+
+import pytest
+
+from custom_components.felt_temperature import cli, core
+
+ROWS = [
+    ("1", "77", "50", "3.6"),
+    ("2", "", "50", "0"),
+    ("3", "32", "80", "36"),
+    ("4", "50", "90", "18"),
+    ("5", "104", "20", "7.2"),
+]
+
+
+def _write_input(path) -> None:
+    with path.open("w", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(("time", "temperature", "humidity", "wind"))
+        writer.writerows(ROWS)
+
+
+def _felt(path) -> list[str]:
+    with path.open(newline="") as file:
+        return [row["felt_temperature"] for row in csv.DictReader(file)]
+
+
+def test_iter_chunks_bounds_chunk_size() -> None:
+    """Rows are yielded in lists of at most chunk_size rows."""
+    assert list(cli.iter_chunks(range(5), 2)) == [[0, 1], [2, 3], [4]]
+    assert list(cli.iter_chunks([], 2)) == []
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 100])
+def test_chunk_size_does_not_change_results(tmp_path, chunk_size) -> None:
+    """Every chunk is calculated on its own with the same results."""
+    _write_input(source := tmp_path / "in.csv")
+    target = tmp_path / "out.csv"
+
+    with (
+        patch.object(cli, "_pyarrow", return_value=None),
+        patch.object(cli, "compute_chunk", wraps=cli.compute_chunk) as compute,
+    ):
+        cli.main(
+            [
+                str(source),
+                str(target),
+                "--temperature-unit",
+                "°F",
+                "--chunk-size",
+                str(chunk_size),
+            ]
+        )
+
+    assert compute.call_count == -(-len(ROWS) // chunk_size)
+    assert _felt(target) == ["26.2", "", "-2.4", "9.6", "40.8"]
+
+
+def test_units_follow_the_sensor(tmp_path) -> None:
+    """Temperature and wind are converted like source states."""
+    _write_input(source := tmp_path / "in.csv")
+    target = tmp_path / "out.csv"
+
+    cli.main(
+        [
+            str(source),
+            str(target),
+            "--temperature-unit",
+            "°F",
+            "--wind-column",
+            "wind",
+            "--wind-unit",
+            "km/h",
+            "--output-unit",
+            "°F",
+        ]
+    )
+
+    expected = core.round_to_one_decimal(
+        core.from_celsius(core.simple_felt_temperature(25.0, 50.0, 1.0), "°F")
+    )
+    felt = _felt(target)
+    assert float(felt[0]) == expected
+    assert felt[1] == ""
+
+
+def test_missing_column_exits(tmp_path) -> None:
+    """A column that is not in the input stops the run."""
+    _write_input(source := tmp_path / "in.csv")
+
+    with pytest.raises(SystemExit, match="pressure"):
+        cli.main([str(source), str(tmp_path / "out.csv"), "--wind-column", "pressure"])
+
+
+def test_unsupported_unit_is_rejected(tmp_path) -> None:
+    """Only units the sensor understands are accepted."""
+    with pytest.raises(SystemExit):
+        cli.main([str(tmp_path / "in.csv"), "--wind-unit", "furlong/fortnight"])
+
+
+def test_parquet_round_trip(tmp_path) -> None:
+    """Parquet files are read and written in batches with pyarrow."""
+    pa = pytest.importorskip("pyarrow")
+    pq = pytest.importorskip("pyarrow.parquet")
+    source = tmp_path / "in.parquet"
+    target = tmp_path / "out.parquet"
+    pq.write_table(
+        pa.table({"temperature": [25.0, None, 0.0], "humidity": [50.0, 50.0, 80.0]}),
+        source,
+    )
+
+    cli.main([str(source), str(target), "--chunk-size", "2"])
+
+    assert pq.read_table(target).column("felt_temperature").to_pylist() == [
+        core.round_to_one_decimal(core.simple_felt_temperature(25.0, 50.0, 0.0)),
+        None,
+        core.round_to_one_decimal(core.simple_felt_temperature(0.0, 80.0, 0.0)),
+    ]
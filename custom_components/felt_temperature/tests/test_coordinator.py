@@ -0,0 +1,142 @@
+"""Tests for the shared source coordinator."""
+
+from __future__ import annotations
+
+from unittest.mock import patch
+
+from homeassistant.const import CONF_NAME, UnitOfSpeed, UnitOfTemperature
+from homeassistant.helpers import entity_registry as er
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.felt_temperature.const import (
+    CONF_MODE,
+    CONF_TEMPERATURE_SOURCE,
+    DATA_COORDINATOR,
+    DOMAIN,
+    MODE_WEATHER,
+)
+from custom_components.felt_temperature.coordinator import SourceCoordinator
+from custom_components.felt_temperature.tests.common import async_wait_for_updates
+
+WEATHER_SOURCE = "weather.home"
+WEATHER_ATTRIBUTES = {
+    "temperature": 20,
+    "temperature_unit": UnitOfTemperature.CELSIUS,
+    "humidity": 50,
+    "wind_speed": 0,
+    "wind_speed_unit": UnitOfSpeed.METERS_PER_SECOND,
+}
+
+
+async def test_entries_share_one_subscription_and_parse(hass) -> None:
+    """Many entries on one weather entity must share listener and parse."""
+    entries = []
+    for index in range(5):
+        entry = MockConfigEntry(
+            domain=DOMAIN,
+            title=f"Felt {index}",
+            data={
+                CONF_NAME: f"Felt {index}",
+                CONF_MODE: MODE_WEATHER,
+                CONF_TEMPERATURE_SOURCE: WEATHER_SOURCE,
+            },
+            version=2,
+        )
+        entry.add_to_hass(hass)
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        entries.append(entry)
+    await async_wait_for_updates(hass)
+
+    coordinator: SourceCoordinator = hass.data[DOMAIN][DATA_COORDINATOR]
+    assert list(coordinator._unsubs) == [WEATHER_SOURCE]
+
+    with patch.object(
+        SourceCoordinator,
+        "_parse_humidity",
+        side_effect=SourceCoordinator._parse_humidity,
+    ) as parse_humidity:
+        hass.states.async_set(WEATHER_SOURCE, "sunny", WEATHER_ATTRIBUTES)
+        await async_wait_for_updates(hass)
+
+    assert parse_humidity.call_count == 1
+    registry = er.async_get(hass)
+    for entry in entries:
+        entity_id = registry.async_get_entity_id("sensor", DOMAIN, entry.entry_id)
+        assert hass.states.get(entity_id).state == "19.8"
+
+    for entry in entries:
+        assert await hass.config_entries.async_unload(entry.entry_id)
+    await async_wait_for_updates(hass)
+    assert not coordinator._unsubs
+
+
+async def test_irrelevant_attribute_churn_does_not_recalculate(hass) -> None:
+    """Forecast, pressure and similar attribute churn must not recalculate."""
+    hass.states.async_set(WEATHER_SOURCE, "sunny", WEATHER_ATTRIBUTES)
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="Weather",
+        data={
+            CONF_NAME: "Weather",
+            CONF_MODE: MODE_WEATHER,
+            CONF_TEMPERATURE_SOURCE: WEATHER_SOURCE,
+        },
+        version=2,
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await async_wait_for_updates(hass)
+
+    entity_id = er.async_get(hass).async_get_entity_id("sensor", DOMAIN, entry.entry_id)
+    entity = hass.data["sensor"].get_entity(entity_id)
+    recalculations = entity.stats.recalculations
+
+    for step in range(50):
+        hass.states.async_set(
+            WEATHER_SOURCE,
+            "cloudy" if step % 2 else "sunny",
+            {
+                **WEATHER_ATTRIBUTES,
+                "pressure": 1000 + step,
+                "forecast": [{"temperature": step}],
+            },
+        )
+        await async_wait_for_updates(hass)
+
+    assert entity.stats.recalculations == recalculations
+
+    hass.states.async_set(
+        WEATHER_SOURCE, "sunny", {**WEATHER_ATTRIBUTES, "humidity": 60}
+    )
+    await async_wait_for_updates(hass)
+
+    assert entity.stats.recalculations == recalculations + 1
+    assert hass.states.get(entity_id).state == "20.6"
+
+
+async def test_unit_system_change_recalculates(hass) -> None:
+    """The output unit is cached until the unit system changes."""
+    hass.states.async_set(WEATHER_SOURCE, "sunny", WEATHER_ATTRIBUTES)
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="Weather",
+        data={
+            CONF_NAME: "Weather",
+            CONF_MODE: MODE_WEATHER,
+            CONF_TEMPERATURE_SOURCE: WEATHER_SOURCE,
+        },
+        version=2,
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await async_wait_for_updates(hass)
+
+    entity_id = er.async_get(hass).async_get_entity_id("sensor", DOMAIN, entry.entry_id)
+    assert hass.states.get(entity_id).state == "19.8"
+
+    await hass.config.async_update(unit_system="us_customary")
+    await async_wait_for_updates(hass)
+
+    state = hass.states.get(entity_id)
+    assert state.attributes["unit_of_measurement"] == UnitOfTemperature.FAHRENHEIT
+    assert state.state == "67.7"
@@ -0,0 +1,143 @@
+"""Tests for the Home Assistant independent calculation core."""
+
+from __future__ import annotations
+
+import random
+from unittest.mock import patch
+
+import pytest
+
+from custom_components.felt_temperature import core
+from custom_components.felt_temperature.const import (
+    INDEX_HEAT_INDEX,
+    INDEX_WIND_CHILL,
+    INDICES,
+    MODEL_SIMPLE,
+    MODEL_UTCI,
+)
+
+
+@pytest.mark.parametrize(
+    ("value", "unit", "expected"),
+    [
+        (77.0, "°F", 25.0),
+        (298.15, "K", 25.0),
+        (25.0, "°C", 25.0),
+    ],
+)
+def test_temperature_conversion_round_trip(value, unit, expected) -> None:
+    """Temperatures convert to Celsius and back."""
+    assert core.to_celsius(value, unit) == pytest.approx(expected)
+    assert core.from_celsius(expected, unit) == pytest.approx(value)
+
+
+@pytest.mark.parametrize("unit", ["°C", "°F", "K"])
+def test_from_celsius_converter_matches_conversion(unit) -> None:
+    """The cached converter gives the same values as from_celsius()."""
+    convert = core.from_celsius_converter(unit)
+    assert core.from_celsius_converter(unit) is convert
+    for value in (-40.0, 0.0, 21.5, 300.0):
+        assert convert(value) == core.from_celsius(value, unit)
+
+
+def test_speed_conversion() -> None:
+    """Speeds convert to m/s and unknown units raise ValueError."""
+    assert core.to_meters_per_second(36.0, "km/h") == pytest.approx(10.0)
+    assert core.to_meters_per_second(1.0, "kn") == pytest.approx(0.514444, 1e-5)
+    assert core.to_meters_per_second(4.0, "Beaufort") == pytest.approx(6.688)
+    with pytest.raises(ValueError):
+        core.to_meters_per_second(1.0, "furlong/fortnight")
+    with pytest.raises(ValueError):
+        core.to_celsius(1.0, None)
+    with pytest.raises(ValueError):
+        core.from_celsius_converter("furlong")
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [(2.25, 2.3), (-2.25, -2.3), (0.05, 0.1), (1.04999, 1.0), (19.85, 19.9)],
+)
+def test_round_to_one_decimal(value, expected) -> None:
+    """Scalar and array rounding both round halves away from zero."""
+    assert core.round_to_one_decimal(value) == expected
+    assert list(core.round_to_one_decimal_array([value])) == [expected]
+
+
+@pytest.mark.parametrize("model", [MODEL_SIMPLE, MODEL_UTCI])
+def test_array_matches_scalar(model) -> None:
+    """The vectorized path must agree with the scalar path."""
+    rng = random.Random(7)
+    ta = [rng.uniform(-30, 40) for _ in range(500)]
+    rh = [rng.uniform(5, 100) for _ in range(500)]
+    va = [rng.uniform(0, 15) for _ in range(500)]
+    tmrt = [t + rng.uniform(-10, 30) for t in ta]
+
+    expected = [
+        core.felt_temperature(*values, model=model, tmrt=radiant)
+        for *values, radiant in zip(ta, rh, va, tmrt, strict=True)
+    ]
+    result = core.felt_temperature_array(ta, rh, va, model=model, tmrt=tmrt)
+    assert list(result) == pytest.approx(expected, abs=1e-9)
+
+    with patch.object(core, "_numpy", lambda: None):
+        fallback = core.felt_temperature_array(ta, rh, va, model=model, tmrt=tmrt)
+    assert isinstance(fallback, list)
+    assert fallback == pytest.approx(expected, abs=1e-9)
+
+
+@pytest.mark.parametrize(
+    ("function", "args", "expected"),
+    [
+        # Magnus dew point of 20 °C air at 50 %.
+        (core.dew_point, (20.0, 50.0), 9.3),
+        # NWS heat index table: 90 °F at 70 % gives 106 °F.
+        (core.heat_index, (32.2, 70.0), 41.0),
+        # Below 80 °F the simple formula applies.
+        (core.heat_index, (20.0, 50.0), 19.4),
+        # Humidex table: 30 °C with a 15 °C dew point (40.2 %) gives 34.
+        (core.humidex, (30.0, 40.2), 33.9),
+        # Environment Canada: -10 °C with 20 km/h wind gives -17.9.
+        (core.wind_chill, (-10.0, 20 / 3.6), -17.9),
+        (core.wind_chill, (15.0, 10.0), 15.0),
+    ],
+)
+def test_index_reference_values(function, args, expected) -> None:
+    """Indices match published reference values."""
+    assert function(*args) == pytest.approx(expected, abs=0.1)
+
+
+def test_comfort_indices_share_one_vapour_pressure() -> None:
+    """The pipeline computes the vapour pressure once for all indices."""
+    with patch.object(
+        core, "vapour_pressure", wraps=core.vapour_pressure
+    ) as vapour_pressure:
+        values = core.comfort_indices(25.0, 60.0, 3.0, INDICES)
+    assert vapour_pressure.call_count == 1
+    assert values[INDEX_HEAT_INDEX] == core.heat_index(25.0, 60.0)
+    assert values["apparent_temperature"] == core.simple_felt_temperature(
+        25.0, 60.0, 3.0
+    )
+
+    with patch.object(core, "vapour_pressure") as vapour_pressure:
+        core.comfort_indices(25.0, 60.0, 3.0, [INDEX_HEAT_INDEX, INDEX_WIND_CHILL])
+    vapour_pressure.assert_not_called()
+
+
+def test_comfort_indices_array_matches_scalar() -> None:
+    """The vectorized indices must agree with the scalar pipeline."""
+    rng = random.Random(11)
+    ta = [rng.uniform(-30, 45) for _ in range(500)]
+    rh = [rng.uniform(0, 100) for _ in range(500)]
+    va = [rng.uniform(0, 15) for _ in range(500)]
+
+    rows = [
+        core.comfort_indices(*values, INDICES)
+        for values in zip(ta, rh, va, strict=True)
+    ]
+    result = core.comfort_indices_array(ta, rh, va, INDICES)
+    with patch.object(core, "_numpy", lambda: None):
+        fallback = core.comfort_indices_array(ta, rh, va, INDICES)
+    for index in INDICES:
+        expected = [row[index] for row in rows]
+        assert list(result[index]) == pytest.approx(expected, abs=1e-9)
+        assert fallback[index] == pytest.approx(expected, abs=1e-9)
@@ -0,0 +1,98 @@
+"""Tests for the Felt Temperature diagnostics."""
+
+from __future__ import annotations
+
+import json
+
+from homeassistant.components.sensor import SensorDeviceClass
+from homeassistant.const import (
+    ATTR_DEVICE_CLASS,
+    ATTR_UNIT_OF_MEASUREMENT,
+    CONF_NAME,
+    PERCENTAGE,
+    UnitOfTemperature,
+)
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.felt_temperature.const import (
+    CONF_HUMIDITY_SOURCE,
+    CONF_MODE,
+    CONF_TEMPERATURE_SOURCE,
+    DOMAIN,
+    MODE_SEPARATE,
+)
+from custom_components.felt_temperature.diagnostics import (
+    async_get_config_entry_diagnostics,
+)
+from custom_components.felt_temperature.instrumentation import LatencyHistogram
+from custom_components.felt_temperature.tests.common import async_wait_for_updates
+
+TEMPERATURE_SOURCE = "sensor.garden_temperature"
+HUMIDITY_SOURCE = "sensor.garden_humidity"
+TEMPERATURE_ATTRIBUTES = {
+    ATTR_DEVICE_CLASS: SensorDeviceClass.TEMPERATURE,
+    ATTR_UNIT_OF_MEASUREMENT: UnitOfTemperature.CELSIUS,
+}
+
+
+def test_latency_histogram_buckets() -> None:
+    """Durations land in the first bucket whose bound they do not exceed."""
+    histogram = LatencyHistogram()
+    for seconds in (5e-6, 10e-6, 30e-6, 1.0):
+        histogram.record(seconds)
+
+    result = histogram.as_dict()
+    assert result["count"] == 4
+    assert result["max_us"] == 1e6
+    assert result["buckets"]["<=10us"] == 2
+    assert result["buckets"]["<=50us"] == 1
+    assert result["buckets"][">10000us"] == 1
+
+
+async def test_diagnostics_report_hot_path_counters(hass) -> None:
+    """Diagnostics must report events, recalculations, writes and latencies."""
+    hass.states.async_set(TEMPERATURE_SOURCE, "20", TEMPERATURE_ATTRIBUTES)
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="Garden",
+        data={
+            CONF_NAME: "Garden",
+            CONF_MODE: MODE_SEPARATE,
+            CONF_TEMPERATURE_SOURCE: TEMPERATURE_SOURCE,
+            CONF_HUMIDITY_SOURCE: HUMIDITY_SOURCE,
+        },
+        version=2,
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await async_wait_for_updates(hass)
+
+    stats = (await async_get_config_entry_diagnostics(hass, entry))["sensor"]["stats"]
+    assert stats["events"] == 0
+
+    hass.states.async_set(
+        HUMIDITY_SOURCE,
+        "50",
+        {
+            ATTR_DEVICE_CLASS: SensorDeviceClass.HUMIDITY,
+            ATTR_UNIT_OF_MEASUREMENT: PERCENTAGE,
+        },
+    )
+    await async_wait_for_updates(hass)
+    for value in ("21", "21", "22"):
+        hass.states.async_set(TEMPERATURE_SOURCE, value, TEMPERATURE_ATTRIBUTES)
+        await async_wait_for_updates(hass)
+
+    diagnostics = await async_get_config_entry_diagnostics(hass, entry)
+    json.dumps(diagnostics)
+    stats = diagnostics["sensor"]["stats"]
+    # The repeated "21" is not a state change and never reaches the sensor.
+    assert stats["events"] == 3
+    assert stats["writes"] == 3
+    assert stats["latency"]["compute"]["count"] == 3
+    assert stats["latency"]["write"]["count"] == 3
+    assert diagnostics["sensor"]["sources"]["humidity"] == HUMIDITY_SOURCE
+    assert diagnostics["coordinator"]["sources"] == {
+        TEMPERATURE_SOURCE: 1,
+        HUMIDITY_SOURCE: 1,
+    }
@@ -0,0 +1,73 @@
+"""Tests for the downsampling filters."""
+
+from __future__ import annotations
+
+import math
+
+import pytest
+
+from custom_components.felt_temperature.const import (
+    FILTER_EMA,
+    FILTER_MAX,
+    FILTER_MEAN,
+    FILTER_NONE,
+)
+from custom_components.felt_temperature.filters import (
+    EmaFilter,
+    GustFilter,
+    InputFilter,
+    WindowMeanFilter,
+    create_filter,
+)
+
+
+def test_window_mean() -> None:
+    """The mean covers the samples of the window only."""
+    mean = WindowMeanFilter(10)
+    assert mean.value is None
+    for second in range(20):
+        mean.add(second, float(second))
+    assert mean.value == pytest.approx(14.5)
+
+
+def test_ema_weighs_by_elapsed_time() -> None:
+    """A burst of samples moves the average as much as its duration allows."""
+    ema = EmaFilter(10)
+    ema.add(0.0, 0.0)
+    for step in range(1, 101):
+        ema.add(step * 0.01, 10.0)
+    assert ema.value == pytest.approx(10.0 * (1 - math.exp(-0.1)))
+
+    ema.add(100.0, 10.0)
+    assert ema.value == pytest.approx(10.0, abs=1e-3)
+
+
+def test_gust_ignores_single_spikes() -> None:
+    """The gust is the highest 3 second mean, not the highest sample."""
+    gust = GustFilter(60)
+    for second in range(30):
+        gust.add(float(second), 20.0 if second == 10 else 5.0)
+    assert gust.value < 12.0
+
+    for second in range(30, 35):
+        gust.add(float(second), 12.0)
+    assert gust.value == pytest.approx(12.0)
+
+
+def test_create_filter() -> None:
+    """Filters are created by option value."""
+    assert create_filter(FILTER_NONE, 60) is None
+    assert isinstance(create_filter(FILTER_MEAN, 60), WindowMeanFilter)
+    assert isinstance(create_filter(FILTER_EMA, 60), EmaFilter)
+    assert isinstance(create_filter(FILTER_MAX, 60), GustFilter)
+
+
+def test_filter_must_implement_interface() -> None:
+    """A filter without a value cannot be created."""
+
+    class AddOnlyFilter(InputFilter):
+        def add(self, timestamp: float, value: float) -> None:
+            pass
+
+    with pytest.raises(TypeError, match="value"):
+        AddOnlyFilter()
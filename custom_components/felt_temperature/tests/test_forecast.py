@@ -0,0 +1,113 @@
+"""Tests for the felt temperature forecast."""
+
+from __future__ import annotations
+
+from unittest.mock import patch
+
+from homeassistant.const import CONF_NAME, UnitOfSpeed, UnitOfTemperature
+from homeassistant.core import HomeAssistant, ServiceCall, SupportsResponse
+from homeassistant.helpers import entity_registry as er
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.felt_temperature.const import (
+    CONF_FORECAST,
+    CONF_MODE,
+    CONF_TEMPERATURE_SOURCE,
+    DOMAIN,
+    FORECAST_HOURLY,
+    MODE_WEATHER,
+)
+from custom_components.felt_temperature.core import (
+    round_to_one_decimal,
+    simple_felt_temperature,
+)
+from custom_components.felt_temperature.forecast import ForecastCalculator
+
+WEATHER_SOURCE = "weather.home"
+
+
+def _slot(hour: int, temperature: float) -> dict:
+    return {
+        "datetime": f"2024-06-01T{hour:02d}:00:00+00:00",
+        "temperature": temperature,
+        "humidity": 50,
+        "wind_speed": 18.0,
+    }
+
+
+async def test_forecast_attribute_and_action(hass: HomeAssistant) -> None:
+    """Forecast slots are computed in batch and cached by slot time."""
+    hass.states.async_set(
+        WEATHER_SOURCE,
+        "sunny",
+        {
+            "temperature": 20,
+            "temperature_unit": UnitOfTemperature.CELSIUS,
+            "humidity": 50,
+            "wind_speed": 18.0,
+            "wind_speed_unit": UnitOfSpeed.KILOMETERS_PER_HOUR,
+        },
+    )
+    slots = [_slot(hour, 20 + hour) for hour in range(4)]
+
+    async def get_forecasts(call: ServiceCall) -> dict:
+        assert call.data["type"] == FORECAST_HOURLY
+        return {WEATHER_SOURCE: {"forecast": slots}}
+
+    hass.services.async_register(
+        "weather",
+        "get_forecasts",
+        get_forecasts,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="Home",
+        data={
+            CONF_NAME: "Home",
+            CONF_MODE: MODE_WEATHER,
+            CONF_TEMPERATURE_SOURCE: WEATHER_SOURCE,
+        },
+        options={CONF_FORECAST: FORECAST_HOURLY},
+        version=2,
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    entity_id = er.async_get(hass).async_get_entity_id("sensor", DOMAIN, entry.entry_id)
+    expected = [
+        round_to_one_decimal(simple_felt_temperature(20 + hour, 50, 5.0))
+        for hour in range(4)
+    ]
+    forecast = hass.states.get(entity_id).attributes["forecast"]
+    assert [slot["felt_temperature"] for slot in forecast] == expected
+    assert forecast[0]["datetime"] == slots[0]["datetime"]
+
+    # A provider refresh that changes one slot and adds one recomputes two.
+    slots[1] = _slot(1, 30)
+    slots.append(_slot(4, 24))
+    with patch.object(
+        ForecastCalculator,
+        "_calculate_batch",
+        side_effect=ForecastCalculator._calculate_batch,
+    ) as calculate_batch:
+        response = await hass.services.async_call(
+            DOMAIN,
+            "get_forecasts",
+            {"entity_id": entity_id, "type": FORECAST_HOURLY},
+            blocking=True,
+            return_response=True,
+        )
+
+    assert calculate_batch.call_count == 1
+    assert len(calculate_batch.call_args.args[0]) == 2
+    values = [slot["felt_temperature"] for slot in response[entity_id]["forecast"]]
+    assert values == [
+        expected[0],
+        round_to_one_decimal(simple_felt_temperature(30, 50, 5.0)),
+        expected[2],
+        expected[3],
+        round_to_one_decimal(simple_felt_temperature(24, 50, 5.0)),
+    ]
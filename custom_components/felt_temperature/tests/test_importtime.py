@@ -0,0 +1,77 @@
+"""Import time guard for the modules loaded when an entry is set up."""
+
+from __future__ import annotations
+
+from pathlib import Path
+import subprocess
+import sys
+
+ROOT = Path(__file__).parents[3]
+MODULES = (
+    "custom_components.felt_temperature",
+    "custom_components.felt_temperature.config_flow",
+    "custom_components.felt_temperature.diagnostics",
+    "custom_components.felt_temperature.sensor",
+)
+# Preloaded so their cost is not attributed to the integration.
+BASELINE = (
+    "homeassistant.components.sensor",
+    "homeassistant.helpers.entity_platform",
+    "homeassistant.helpers.event",
+    "homeassistant.helpers.selector",
+)
+# Import time of the integration may be at most this share of the import
+# time of the sensor component, which keeps the guard independent of the
+# speed of the machine. It is about 5 % today.
+MAX_IMPORT_SHARE = 0.1
+# The fastest of a few runs is compared, a single run is noisy.
+RUNS = 3
+FORBIDDEN = (
+    "homeassistant.components.climate",
+    "homeassistant.components.recorder",
+    "homeassistant.components.weather",
+    "numpy",
+)
+
+
+def _importtime() -> dict[str, int]:
+    """Import the integration in a fresh interpreter, return cumulative µs."""
+    code = f"import {', '.join(BASELINE)}\nimport {', '.join(MODULES)}"
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    timings = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.removeprefix("import time:").split("|")
+        if cumulative.strip().isdigit():
+            timings[name.strip()] = int(cumulative)
+    return timings
+
+
+def test_setup_does_not_import_unrelated_components() -> None:
+    """Loading the integration must not import other platforms or NumPy."""
+    timings = _importtime()
+    baseline = {name for name in timings if name.startswith(BASELINE)}
+
+    imported = {
+        name for name in timings if name not in baseline and name.startswith(FORBIDDEN)
+    }
+    assert not imported
+
+    assert "custom_components.felt_temperature.sensor" in timings
+
+
+def test_import_time_stays_small() -> None:
+    """The integration must import in a fraction of the sensor component."""
+    share = min(
+        sum(timings.get(name, 0) for name in MODULES)
+        / timings["homeassistant.components.sensor"]
+        for timings in (_importtime() for _ in range(RUNS))
+    )
+    assert share < MAX_IMPORT_SHARE
@@ -22,6 +22,7 @@ from custom_components.felt_temperature.const import (
     DOMAIN,
     MODE_SEPARATE,
 )
+from custom_components.felt_temperature.tests.common import async_wait_for_updates
 
 TEMPERATURE_SOURCE = "sensor.living_room_temperature"
 HUMIDITY_SOURCE = "sensor.living_room_humidity"
@@ -70,7 +71,7 @@ async def test_late_sources_are_tracked_after_setup(hass) -> None:
     entry = _entry()
     entry.add_to_hass(hass)
     assert await hass.config_entries.async_setup(entry.entry_id)
-    await hass.async_block_till_done()
+    await async_wait_for_updates(hass)
 
     entity_id = er.async_get(hass).async_get_entity_id("sensor", DOMAIN, entry.entry_id)
     assert entity_id is not None
@@ -92,7 +93,7 @@ async def test_late_sources_are_tracked_after_setup(hass) -> None:
             ATTR_UNIT_OF_MEASUREMENT: PERCENTAGE,
         },
     )
-    await hass.async_block_till_done()
+    await async_wait_for_updates(hass)
 
     assert hass.states.get(entity_id).state == "19.8"
 
@@ -104,6 +105,6 @@ async def test_late_sources_are_tracked_after_setup(hass) -> None:
             ATTR_UNIT_OF_MEASUREMENT: UnitOfTemperature.CELSIUS,
         },
     )
-    await hass.async_block_till_done()
+    await async_wait_for_updates(hass)
 
     assert hass.states.get(entity_id).state == "26.2"
@@ -0,0 +1,62 @@
+"""Tests for the incremental rolling window."""
+
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from custom_components.felt_temperature.rolling import RollingWindow
+
+
+def test_matches_brute_force() -> None:
+    """Aggregates equal a recomputation over the samples inside the window."""
+    rng = random.Random(3)
+    window = RollingWindow(600, max_buckets=600)
+    samples: list[tuple[float, float]] = []
+    timestamp = 0.0
+    for _ in range(5000):
+        timestamp += rng.choice((0.2, 1.0, 1.0, 7.0, 45.0))
+        value = rng.uniform(-20, 35)
+        window.add(timestamp, value)
+        samples.append((timestamp, value))
+
+        # With one second buckets a sample is dropped between 599 and 600 s
+        # after it was added, depending on where in its bucket it fell.
+        inside = [v for t, v in samples if t > timestamp - 599]
+        assert window.minimum <= min(inside)
+        assert window.maximum >= max(inside)
+        kept = [v for t, v in samples if t > timestamp - 600]
+        assert min(kept) <= window.minimum
+        assert max(kept) >= window.maximum
+        assert len(inside) <= len(window) <= len(kept)
+
+
+def test_exact_with_whole_samples_per_bucket() -> None:
+    """Samples one bucket apart give exact results."""
+    window = RollingWindow(3, max_buckets=3)
+    for timestamp, value in enumerate((5.0, 1.0, 4.0, 3.0, 2.0)):
+        window.add(timestamp, value)
+    assert (window.minimum, window.maximum, window.mean) == (2.0, 4.0, 3.0)
+
+
+def test_memory_is_bounded() -> None:
+    """Frequent samples are merged into at most max_buckets + 1 buckets."""
+    window = RollingWindow(3600, max_buckets=60)
+    for step in range(100_000):
+        window.add(step * 0.1, (step % 100) - 50.0)
+    assert len(window._buckets) <= 61
+    assert len(window._minima) <= 61
+    assert len(window._maxima) <= 61
+    assert window.minimum == -50.0
+    assert window.maximum == 49.0
+    assert window.mean == pytest.approx(-0.5, abs=0.1)
+
+
+def test_empty_after_expiry() -> None:
+    """A window without recent values has no aggregates."""
+    window = RollingWindow(60)
+    window.add(0.0, 10.0)
+    window.expire(120.0)
+    assert len(window) == 0
+    assert window.minimum is window.maximum is window.mean is None
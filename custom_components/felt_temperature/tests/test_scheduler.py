@@ -0,0 +1,196 @@
+"""Tests for coalescing source updates."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+
+from homeassistant.components.sensor import SensorDeviceClass
+from homeassistant.const import (
+    ATTR_DEVICE_CLASS,
+    ATTR_UNIT_OF_MEASUREMENT,
+    CONF_NAME,
+    EVENT_STATE_CHANGED,
+    PERCENTAGE,
+    UnitOfTemperature,
+)
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.core import callback
+from homeassistant.helpers import entity_registry as er
+import homeassistant.util.dt as dt_util
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from custom_components.felt_temperature.const import (
+    CONF_FILTER_WINDOW,
+    CONF_HUMIDITY_SOURCE,
+    CONF_MAX_AGE,
+    CONF_MIN_INTERVAL,
+    CONF_MODE,
+    CONF_TEMPERATURE_FILTER,
+    CONF_TEMPERATURE_SOURCE,
+    DOMAIN,
+    FILTER_MEAN,
+    MODE_SEPARATE,
+)
+from custom_components.felt_temperature.scheduler import (
+    TimerWheel,
+    async_get_timer_wheel,
+)
+from custom_components.felt_temperature.tests.common import async_wait_for_updates
+
+TEMPERATURE_SOURCE = "sensor.outdoor_temperature"
+HUMIDITY_SOURCE = "sensor.outdoor_humidity"
+TEMPERATURE_ATTRIBUTES = {
+    ATTR_DEVICE_CLASS: SensorDeviceClass.TEMPERATURE,
+    ATTR_UNIT_OF_MEASUREMENT: UnitOfTemperature.CELSIUS,
+}
+HUMIDITY_ATTRIBUTES = {
+    ATTR_DEVICE_CLASS: SensorDeviceClass.HUMIDITY,
+    ATTR_UNIT_OF_MEASUREMENT: PERCENTAGE,
+}
+
+
+async def _setup(hass, options: dict | None = None) -> tuple[str, list]:
+    """Set up a separate-source entry and collect its state writes."""
+    hass.states.async_set(TEMPERATURE_SOURCE, "20", TEMPERATURE_ATTRIBUTES)
+    hass.states.async_set(HUMIDITY_SOURCE, "50", HUMIDITY_ATTRIBUTES)
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="Outdoor",
+        data={
+            CONF_NAME: "Outdoor",
+            CONF_MODE: MODE_SEPARATE,
+            CONF_TEMPERATURE_SOURCE: TEMPERATURE_SOURCE,
+            CONF_HUMIDITY_SOURCE: HUMIDITY_SOURCE,
+        },
+        options=options or {},
+        version=2,
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await async_wait_for_updates(hass)
+
+    entity_id = er.async_get(hass).async_get_entity_id("sensor", DOMAIN, entry.entry_id)
+    writes = []
+
+    @callback
+    def _collect(event) -> None:
+        if event.data["entity_id"] == entity_id:
+            writes.append(event.data["new_state"])
+
+    hass.bus.async_listen(EVENT_STATE_CHANGED, _collect)
+    return entity_id, writes
+
+
+async def test_simultaneous_sources_write_once(hass) -> None:
+    """Temperature and humidity arriving together must give one write."""
+    entity_id, writes = await _setup(hass)
+
+    hass.states.async_set(TEMPERATURE_SOURCE, "25", TEMPERATURE_ATTRIBUTES)
+    hass.states.async_set(HUMIDITY_SOURCE, "60", HUMIDITY_ATTRIBUTES)
+    await async_wait_for_updates(hass)
+
+    assert len(writes) == 1
+    assert hass.states.get(entity_id).state == "27.3"
+
+
+async def test_min_interval_delivers_trailing_edge(hass) -> None:
+    """Updates inside the minimum interval are delivered once afterwards."""
+    entity_id, writes = await _setup(hass, {CONF_MIN_INTERVAL: 30})
+
+    hass.states.async_set(TEMPERATURE_SOURCE, "21", TEMPERATURE_ATTRIBUTES)
+    await async_wait_for_updates(hass)
+    assert len(writes) == 1
+
+    for value in ("22", "23", "25"):
+        hass.states.async_set(TEMPERATURE_SOURCE, value, TEMPERATURE_ATTRIBUTES)
+        await async_wait_for_updates(hass)
+    assert len(writes) == 1
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=31))
+    await async_wait_for_updates(hass)
+
+    assert len(writes) == 2
+    assert hass.states.get(entity_id).state == "26.2"
+
+
+async def test_filter_downsamples_high_rate_source(hass) -> None:
+    """A filtered source recalculates once per window with the window mean."""
+    entity_id, writes = await _setup(
+        hass, {CONF_TEMPERATURE_FILTER: FILTER_MEAN, CONF_FILTER_WINDOW: 10}
+    )
+
+    for value in ("21", "22", "23", "25"):
+        hass.states.async_set(TEMPERATURE_SOURCE, value, TEMPERATURE_ATTRIBUTES)
+        await async_wait_for_updates(hass)
+    # The first change is calculated at once from the mean of 20 and 21.
+    assert len(writes) == 1
+    assert writes[0].attributes["temperature_source_value"] == 20.5
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=11))
+    await async_wait_for_updates(hass)
+
+    assert len(writes) == 2
+    # The mean of 20, 21, 22, 23 and 25.
+    assert hass.states.get(entity_id).attributes["temperature_source_value"] == 22.2
+
+
+async def _advance(hass, freezer: FrozenDateTimeFactory, seconds: float) -> None:
+    freezer.tick(timedelta(seconds=seconds))
+    async_fire_time_changed(hass)
+    await async_wait_for_updates(hass)
+
+
+async def test_timer_wheel_runs_due_actions(hass, freezer) -> None:
+    """Actions run once their deadline passed, moved deadlines are honoured."""
+    wheel = TimerWheel(hass, resolution=1.0, slots=8)
+    fired = []
+    now = dt_util.utcnow().timestamp()
+    wheel.async_schedule("a", now + 3, lambda: fired.append("a"))
+    wheel.async_schedule("b", now + 5, lambda: fired.append("b"))
+    wheel.async_schedule("c", now + 20, lambda: fired.append("c"))
+    wheel.async_schedule("d", now + 2, lambda: fired.append("d"))
+    wheel.async_cancel("d")
+    # Rescheduling a key later keeps a single entry for it.
+    for step in range(10):
+        wheel.async_schedule("b", now + 5 + step, lambda: fired.append("b"))
+    assert len(wheel) == 3
+
+    for _ in range(4):
+        await _advance(hass, freezer, 1)
+    assert fired == ["a"]
+
+    await _advance(hass, freezer, 11)
+    assert fired == ["a", "b"]
+
+    # Several turns of the wheel later.
+    await _advance(hass, freezer, 6)
+    assert fired == ["a", "b", "c"]
+    assert len(wheel) == 0
+
+
+async def test_stale_source_makes_output_unknown(hass, freezer) -> None:
+    """A source silent for max age is ignored until it reports again."""
+    entity_id, _ = await _setup(hass, {CONF_MAX_AGE: 60})
+    wheel = async_get_timer_wheel(hass)
+    assert len(wheel) == 2
+
+    await _advance(hass, freezer, 40)
+    # Reporting the same value keeps the source fresh without a state change.
+    hass.states.async_set(
+        HUMIDITY_SOURCE, "50", HUMIDITY_ATTRIBUTES, force_update=False
+    )
+    hass.states.async_set(TEMPERATURE_SOURCE, "21", TEMPERATURE_ATTRIBUTES)
+    await async_wait_for_updates(hass)
+    await _advance(hass, freezer, 40)
+    assert hass.states.get(entity_id).state == "21.1"
+
+    await _advance(hass, freezer, 30)
+    assert hass.states.get(entity_id).state == "unknown"
+
+    hass.states.async_set(HUMIDITY_SOURCE, "50", HUMIDITY_ATTRIBUTES)
+    hass.states.async_set(TEMPERATURE_SOURCE, "21", TEMPERATURE_ATTRIBUTES)
+    await async_wait_for_updates(hass)
+    assert hass.states.get(entity_id).state == "21.1"
@@ -0,0 +1,343 @@
+"""Tests for the Felt Temperature sensor."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+from time import monotonic
+from unittest.mock import patch
+
+from homeassistant.components.sensor import SensorDeviceClass
+from homeassistant.const import (
+    ATTR_DEVICE_CLASS,
+    ATTR_UNIT_OF_MEASUREMENT,
+    CONF_NAME,
+    EVENT_HOMEASSISTANT_STARTED,
+    EVENT_STATE_CHANGED,
+    PERCENTAGE,
+    UnitOfTemperature,
+)
+from homeassistant.core import State, callback
+from homeassistant.helpers import entity_registry as er
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+    mock_restore_cache_with_extra_data,
+)
+
+from custom_components.felt_temperature.const import (
+    AGGREGATION_MEDIAN,
+    CONF_ADDITIONAL_TEMPERATURE_SOURCES,
+    CONF_AGGREGATION,
+    CONF_HUMIDITY_SOURCE,
+    CONF_INDICES,
+    CONF_MIN_INTERVAL,
+    CONF_MODE,
+    CONF_ROLLING_WINDOWS,
+    CONF_SOURCE_VALUE_ATTRIBUTES,
+    CONF_TEMPERATURE_SOURCE,
+    DOMAIN,
+    INDEX_DEW_POINT,
+    INDEX_HEAT_INDEX,
+    MODE_SEPARATE,
+)
+from custom_components.felt_temperature.core import simple_felt_temperature
+from custom_components.felt_temperature.tests.common import async_wait_for_updates
+
+TEMPERATURE_SOURCE = "sensor.porch_temperature"
+HUMIDITY_SOURCE = "sensor.porch_humidity"
+TEMPERATURE_ATTRIBUTES = {
+    ATTR_DEVICE_CLASS: SensorDeviceClass.TEMPERATURE,
+    ATTR_UNIT_OF_MEASUREMENT: UnitOfTemperature.CELSIUS,
+}
+HUMIDITY_ATTRIBUTES = {
+    ATTR_DEVICE_CLASS: SensorDeviceClass.HUMIDITY,
+    ATTR_UNIT_OF_MEASUREMENT: PERCENTAGE,
+}
+
+
+def _entry(options: dict | None = None) -> MockConfigEntry:
+    return MockConfigEntry(
+        domain=DOMAIN,
+        title="Porch",
+        data={
+            CONF_NAME: "Porch",
+            CONF_MODE: MODE_SEPARATE,
+            CONF_TEMPERATURE_SOURCE: TEMPERATURE_SOURCE,
+            CONF_HUMIDITY_SOURCE: HUMIDITY_SOURCE,
+        },
+        options=options or {},
+        version=2,
+    )
+
+
+async def test_unchanged_output_is_not_written(hass) -> None:
+    """Source changes that leave value and attributes alone skip the write."""
+    hass.states.async_set(TEMPERATURE_SOURCE, "20", TEMPERATURE_ATTRIBUTES)
+    hass.states.async_set(HUMIDITY_SOURCE, "50", HUMIDITY_ATTRIBUTES)
+    entry = _entry()
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await async_wait_for_updates(hass)
+
+    entity_id = er.async_get(hass).async_get_entity_id("sensor", DOMAIN, entry.entry_id)
+    entity = hass.data["sensor"].get_entity(entity_id)
+    writes = []
+
+    @callback
+    def _collect(event) -> None:
+        if event.data["entity_id"] == entity_id:
+            writes.append(event.data["new_state"])
+
+    hass.bus.async_listen(EVENT_STATE_CHANGED, _collect)
+
+    hass.states.async_set(TEMPERATURE_SOURCE, "21", TEMPERATURE_ATTRIBUTES)
+    await async_wait_for_updates(hass)
+    assert len(writes) == 1
+
+    # The source changes, but both the output and the rounded source value stay.
+    hass.states.async_set(TEMPERATURE_SOURCE, "21.01", TEMPERATURE_ATTRIBUTES)
+    await async_wait_for_updates(hass)
+
+    assert len(writes) == 1
+    assert entity.stats.writes_skipped == 1
+    assert hass.states.get(entity_id).state == "21.1"
+
+
+async def test_missing_source_is_awaited_without_polling(hass) -> None:
+    """A missing source is not polled, its first valid state gives a value."""
+    hass.states.async_set(TEMPERATURE_SOURCE, "20", TEMPERATURE_ATTRIBUTES)
+    entry = _entry()
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await async_wait_for_updates(hass)
+
+    entity_id = er.async_get(hass).async_get_entity_id("sensor", DOMAIN, entry.entry_id)
+    entity = hass.data["sensor"].get_entity(entity_id)
+    recalculations = entity.stats.recalculations
+    assert entity.diagnostics()["waiting_for"] == [HUMIDITY_SOURCE]
+
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_STARTED)
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(minutes=5))
+    await async_wait_for_updates(hass)
+    assert entity.stats.recalculations == recalculations
+    assert hass.states.get(entity_id).state == "unknown"
+
+    hass.states.async_set(HUMIDITY_SOURCE, "50", HUMIDITY_ATTRIBUTES)
+    await async_wait_for_updates(hass)
+
+    assert hass.states.get(entity_id).state == "19.8"
+    assert entity.diagnostics()["waiting_for"] == []
+
+
+async def test_startup_restores_value_until_sources_report(hass) -> None:
+    """The last value is available at once after a restart, then replaced."""
+    entry = _entry()
+    entry.add_to_hass(hass)
+    entity_id = (
+        er.async_get(hass)
+        .async_get_or_create(
+            "sensor", DOMAIN, entry.entry_id, suggested_object_id="porch"
+        )
+        .entity_id
+    )
+    mock_restore_cache_with_extra_data(
+        hass,
+        [
+            (
+                State(entity_id, "18.3"),
+                {
+                    "native_value": 18.3,
+                    "native_unit_of_measurement": UnitOfTemperature.CELSIUS,
+                    "inputs": {"temperature": 18.0, "humidity": 60.0, "wind_speed": 0},
+                },
+            )
+        ],
+    )
+
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await async_wait_for_updates(hass)
+    state = hass.states.get(entity_id)
+
+    # The restored value is shown as soon as the entry is set up, before
+    # any source has reported.
+    assert hass.states.get(TEMPERATURE_SOURCE) is None
+    assert hass.states.get(HUMIDITY_SOURCE) is None
+    assert state.state == "18.3"
+    assert state.attributes["temperature_source_value"] == 18.0
+    assert state.attributes["humidity_source_value"] == 60.0
+
+    # One fresh input alone does not replace the restored value.
+    hass.states.async_set(TEMPERATURE_SOURCE, "20", TEMPERATURE_ATTRIBUTES)
+    await async_wait_for_updates(hass)
+    assert hass.states.get(entity_id).state == "18.3"
+
+    hass.states.async_set(HUMIDITY_SOURCE, "50", HUMIDITY_ATTRIBUTES)
+    await async_wait_for_updates(hass)
+    assert hass.states.get(entity_id).state == "19.8"
+
+    entity = hass.data["sensor"].get_entity(entity_id)
+    assert entity.extra_restore_state_data.as_dict()["inputs"] == {
+        "temperature": 20.0,
+        "humidity": 50.0,
+        "wind_speed": 0.0,
+    }
+
+
+async def test_indices_are_computed_with_the_felt_temperature(hass) -> None:
+    """Index sensors follow the sources through the felt temperature sensor."""
+    hass.states.async_set(TEMPERATURE_SOURCE, "20", TEMPERATURE_ATTRIBUTES)
+    hass.states.async_set(HUMIDITY_SOURCE, "50", HUMIDITY_ATTRIBUTES)
+    entry = _entry({CONF_INDICES: [INDEX_DEW_POINT, INDEX_HEAT_INDEX]})
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await async_wait_for_updates(hass)
+
+    registry = er.async_get(hass)
+    dew_point = registry.async_get_entity_id(
+        "sensor", DOMAIN, f"{entry.entry_id}_{INDEX_DEW_POINT}"
+    )
+    heat_index = registry.async_get_entity_id(
+        "sensor", DOMAIN, f"{entry.entry_id}_{INDEX_HEAT_INDEX}"
+    )
+    assert hass.states.get(dew_point).state == "9.3"
+    assert hass.states.get(heat_index).state == "19.4"
+    assert hass.states.get(dew_point).name == "Porch Dew point"
+
+    hass.states.async_set(HUMIDITY_SOURCE, "80", HUMIDITY_ATTRIBUTES)
+    await async_wait_for_updates(hass)
+    assert hass.states.get(dew_point).state == "16.4"
+
+    hass.states.async_set(HUMIDITY_SOURCE, "unavailable", HUMIDITY_ATTRIBUTES)
+    await async_wait_for_updates(hass)
+    assert hass.states.get(dew_point).state == "unknown"
+
+
+async def test_rolling_statistics_attributes(hass) -> None:
+    """Rolling minimum, maximum and mean follow the calculated values."""
+    hass.states.async_set(TEMPERATURE_SOURCE, "20", TEMPERATURE_ATTRIBUTES)
+    hass.states.async_set(HUMIDITY_SOURCE, "50", HUMIDITY_ATTRIBUTES)
+    entry = _entry({CONF_ROLLING_WINDOWS: ["1h"]})
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await async_wait_for_updates(hass)
+
+    entity_id = er.async_get(hass).async_get_entity_id("sensor", DOMAIN, entry.entry_id)
+    for value in ("25", "15"):
+        hass.states.async_set(TEMPERATURE_SOURCE, value, TEMPERATURE_ATTRIBUTES)
+        await async_wait_for_updates(hass)
+
+    attributes = hass.states.get(entity_id).attributes
+    assert attributes["min_1h"] == 13.8
+    assert attributes["max_1h"] == 26.2
+    # The mean of the unrounded values, 19.85, 26.21 and 13.81.
+    assert attributes["mean_1h"] == 20.0
+    assert "min_24h" not in attributes
+
+    # Without recalculations the values still leave the window.
+    entity = hass.data["sensor"].get_entity(entity_id)
+    with patch(
+        "custom_components.felt_temperature.sensor.monotonic",
+        return_value=monotonic() + 3700,
+    ):
+        entity.async_write_ha_state()
+    attributes = hass.states.get(entity_id).attributes
+    assert attributes["min_1h"] is None
+    assert attributes["max_1h"] is None
+    assert attributes["mean_1h"] is None
+
+
+async def test_several_temperature_sources_are_combined(hass) -> None:
+    """The median of the temperature sources is used, unavailable ones drop out."""
+    extra = ["sensor.shed_temperature", "sensor.garden_temperature"]
+    hass.states.async_set(TEMPERATURE_SOURCE, "20", TEMPERATURE_ATTRIBUTES)
+    hass.states.async_set(extra[0], "26", TEMPERATURE_ATTRIBUTES)
+    hass.states.async_set(extra[1], "21", TEMPERATURE_ATTRIBUTES)
+    hass.states.async_set(HUMIDITY_SOURCE, "50", HUMIDITY_ATTRIBUTES)
+    entry = _entry(
+        {
+            CONF_ADDITIONAL_TEMPERATURE_SOURCES: extra,
+            CONF_AGGREGATION: AGGREGATION_MEDIAN,
+        }
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await async_wait_for_updates(hass)
+
+    entity_id = er.async_get(hass).async_get_entity_id("sensor", DOMAIN, entry.entry_id)
+    state = hass.states.get(entity_id)
+    assert float(state.state) == round(simple_felt_temperature(21.0, 50.0, 0.0), 1)
+    assert state.attributes["temperature_source"] == [TEMPERATURE_SOURCE, *extra]
+
+    hass.states.async_set(extra[1], "unavailable", TEMPERATURE_ATTRIBUTES)
+    await async_wait_for_updates(hass)
+    state = hass.states.get(entity_id)
+    assert float(state.state) == round(simple_felt_temperature(23.0, 50.0, 0.0), 1)
+
+
+async def test_sources_are_switched_in_place(hass) -> None:
+    """Changing a source keeps the entity and writes the new value at once."""
+    hass.states.async_set(TEMPERATURE_SOURCE, "20", TEMPERATURE_ATTRIBUTES)
+    hass.states.async_set(HUMIDITY_SOURCE, "50", HUMIDITY_ATTRIBUTES)
+    hass.states.async_set("sensor.shed_temperature", "26", TEMPERATURE_ATTRIBUTES)
+    entry = _entry()
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await async_wait_for_updates(hass)
+
+    entity_id = er.async_get(hass).async_get_entity_id("sensor", DOMAIN, entry.entry_id)
+    entity = hass.data["sensor"].get_entity(entity_id)
+    coordinator = entity._coordinator
+    states = []
+
+    @callback
+    def _collect(event) -> None:
+        if event.data["entity_id"] == entity_id:
+            states.append(event.data["new_state"].state)
+
+    hass.bus.async_listen(EVENT_STATE_CHANGED, _collect)
+    hass.config_entries.async_update_entry(
+        entry, data={**entry.data, CONF_TEMPERATURE_SOURCE: "sensor.shed_temperature"}
+    )
+    await async_wait_for_updates(hass)
+
+    assert hass.data["sensor"].get_entity(entity_id) is entity
+    assert states == [str(round(simple_felt_temperature(26.0, 50.0, 0.0), 1))]
+    tracked = coordinator.diagnostics()["sources"]
+    assert TEMPERATURE_SOURCE not in tracked
+    assert "sensor.shed_temperature" in tracked
+
+    # Only the new source drives the sensor now.
+    hass.states.async_set(TEMPERATURE_SOURCE, "10", TEMPERATURE_ATTRIBUTES)
+    await async_wait_for_updates(hass)
+    assert len(states) == 1
+
+    # Other settings still reload the entry.
+    hass.config_entries.async_update_entry(entry, options={CONF_MIN_INTERVAL: 5})
+    await async_wait_for_updates(hass)
+    assert hass.data["sensor"].get_entity(entity_id) is not entity
+
+
+async def test_lean_attributes(hass) -> None:
+    """Source ids are not recorded, source values can be left out."""
+    hass.states.async_set(TEMPERATURE_SOURCE, "20", TEMPERATURE_ATTRIBUTES)
+    hass.states.async_set(HUMIDITY_SOURCE, "50", HUMIDITY_ATTRIBUTES)
+    entry = _entry({CONF_SOURCE_VALUE_ATTRIBUTES: False})
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await async_wait_for_updates(hass)
+
+    entity_id = er.async_get(hass).async_get_entity_id("sensor", DOMAIN, entry.entry_id)
+    entity = hass.data["sensor"].get_entity(entity_id)
+    attributes = hass.states.get(entity_id).attributes
+    assert attributes["temperature_source"] == TEMPERATURE_SOURCE
+    assert not [name for name in attributes if name.endswith("_source_value")]
+    assert {"temperature_source", "humidity_source", "wind_speed_source"} <= (
+        entity._state_info["unrecorded_attributes"]
+    )
+
+    # An unchanged mapping is handed out again, even if the inputs moved.
+    attributes = entity.extra_state_attributes
+    hass.states.async_set(TEMPERATURE_SOURCE, "21", TEMPERATURE_ATTRIBUTES)
+    await async_wait_for_updates(hass)
+    assert entity.extra_state_attributes is attributes
@@ -0,0 +1,128 @@
+"""Tests for resolving and persisting source roles."""
+
+from __future__ import annotations
+
+from homeassistant.components.sensor import SensorDeviceClass
+from homeassistant.const import (
+    ATTR_DEVICE_CLASS,
+    ATTR_UNIT_OF_MEASUREMENT,
+    CONF_NAME,
+    CONF_SOURCE,
+    PERCENTAGE,
+    UnitOfTemperature,
+)
+from homeassistant.helpers import entity_registry as er
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.felt_temperature.const import (
+    CONF_HUMIDITY_SOURCE,
+    CONF_MODE,
+    CONF_TEMPERATURE_SOURCE,
+    CONF_WIND_SOURCE,
+    DOMAIN,
+    MODE_SEPARATE,
+)
+from custom_components.felt_temperature.tests.common import async_wait_for_updates
+
+
+def _legacy_entry(sources: list[str]) -> MockConfigEntry:
+    return MockConfigEntry(
+        domain=DOMAIN,
+        title="Legacy",
+        data={CONF_NAME: "Legacy", CONF_SOURCE: sources},
+        version=2,
+    )
+
+
+async def test_legacy_source_list_is_migrated(hass) -> None:
+    """Roles of a legacy list are resolved once, from the registry at startup."""
+    registry = er.async_get(hass)
+    outdoor = registry.async_get_or_create(
+        "sensor",
+        "test",
+        "outdoor",
+        suggested_object_id="outdoor",
+        original_device_class=SensorDeviceClass.TEMPERATURE,
+        unit_of_measurement=UnitOfTemperature.CELSIUS,
+    )
+    moisture = registry.async_get_or_create(
+        "sensor",
+        "test",
+        "moisture",
+        suggested_object_id="moisture",
+        unit_of_measurement=PERCENTAGE,
+    )
+    entry = _legacy_entry([outdoor.entity_id, moisture.entity_id])
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await async_wait_for_updates(hass)
+
+    assert entry.version == 3
+    assert entry.data[CONF_MODE] == MODE_SEPARATE
+    assert entry.data[CONF_TEMPERATURE_SOURCE] == outdoor.entity_id
+    assert entry.data[CONF_HUMIDITY_SOURCE] == moisture.entity_id
+    assert entry.data[CONF_WIND_SOURCE] is None
+
+    hass.states.async_set(
+        outdoor.entity_id,
+        "20",
+        {
+            ATTR_DEVICE_CLASS: SensorDeviceClass.TEMPERATURE,
+            ATTR_UNIT_OF_MEASUREMENT: UnitOfTemperature.CELSIUS,
+        },
+    )
+    hass.states.async_set(
+        moisture.entity_id, "50", {ATTR_UNIT_OF_MEASUREMENT: PERCENTAGE}
+    )
+    await async_wait_for_updates(hass)
+
+    entity_id = registry.async_get_entity_id("sensor", DOMAIN, entry.entry_id)
+    assert hass.states.get(entity_id).state == "19.8"
+
+
+async def test_missing_role_is_resolved_on_registry_update(hass) -> None:
+    """A legacy source registered later fills the role that was missing."""
+    entry = _legacy_entry(["sensor.outdoor_temperature", "sensor.outdoor_rh"])
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await async_wait_for_updates(hass)
+    assert entry.data[CONF_TEMPERATURE_SOURCE] == "sensor.outdoor_temperature"
+    assert entry.data[CONF_HUMIDITY_SOURCE] is None
+
+    er.async_get(hass).async_get_or_create(
+        "sensor",
+        "test",
+        "outdoor_rh",
+        suggested_object_id="outdoor_rh",
+        original_device_class=SensorDeviceClass.HUMIDITY,
+    )
+    await async_wait_for_updates(hass)
+
+    assert entry.data[CONF_HUMIDITY_SOURCE] == "sensor.outdoor_rh"
+
+
+async def test_renamed_source_is_replaced(hass) -> None:
+    """Renaming a source entity updates the config entry."""
+    registry = er.async_get(hass)
+    humidity = registry.async_get_or_create(
+        "sensor", "test", "humidity", suggested_object_id="porch_humidity"
+    )
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="Porch",
+        data={
+            CONF_NAME: "Porch",
+            CONF_MODE: MODE_SEPARATE,
+            CONF_TEMPERATURE_SOURCE: "sensor.porch_temperature",
+            CONF_HUMIDITY_SOURCE: humidity.entity_id,
+        },
+        version=3,
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await async_wait_for_updates(hass)
+
+    registry.async_update_entity(humidity.entity_id, new_entity_id="sensor.porch_rh")
+    await async_wait_for_updates(hass)
+
+    assert entry.data[CONF_HUMIDITY_SOURCE] == "sensor.porch_rh"
@@ -0,0 +1,111 @@
+"""Tests for the UTCI polynomial and lookup grid."""
+
+from __future__ import annotations
+
+import random
+from unittest.mock import patch
+
+from homeassistant.const import CONF_NAME, UnitOfSpeed, UnitOfTemperature
+from homeassistant.helpers import entity_registry as er
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.felt_temperature.const import (
+    CONF_MODE,
+    CONF_MODEL,
+    CONF_TEMPERATURE_SOURCE,
+    DOMAIN,
+    MODE_WEATHER,
+    MODEL_UTCI,
+)
+from custom_components.felt_temperature.utci import (
+    UtciGrid,
+    hardy_saturation_vapour_pressure,
+    utci,
+)
+
+
+@pytest.fixture(scope="module")
+def grid() -> UtciGrid:
+    """Return a freshly built lookup grid."""
+    return UtciGrid.build()
+
+
+@pytest.mark.parametrize(
+    ("ta", "tmrt", "va", "rh", "expected"),
+    [
+        (25.0, 25.0, 1.0, 50.0, 24.6),
+        (26.27, 26.27, 1.0, 50.0, 26.0),
+        (40.0, 40.0, 1.0, 50.0, 43.6),
+    ],
+)
+def test_utci_reference_values(ta, tmrt, va, rh, expected) -> None:
+    """The polynomial must reproduce published reference values."""
+    assert round(utci(ta, tmrt, va, rh), 1) == expected
+
+
+def test_utci_clamps_inputs() -> None:
+    """Inputs outside the validity range are clamped to it."""
+    assert utci(25.0, 25.0, 0.0, 50.0) == utci(25.0, 25.0, 0.5, 50.0)
+    assert utci(60.0, 60.0, 1.0, 10.0) == utci(50.0, 50.0, 1.0, 10.0)
+
+
+def test_grid_matches_polynomial(grid: UtciGrid, tmp_path) -> None:
+    """Interpolated values must stay close to the direct polynomial."""
+    rng = random.Random(37)
+    errors = []
+    while len(errors) < 5000:
+        ta = rng.uniform(-50, 50)
+        rh = rng.uniform(0, 100)
+        if hardy_saturation_vapour_pressure(ta) * rh / 1000 > 5:
+            continue
+        va = rng.uniform(0.5, 17)
+        delta_tmrt = rng.uniform(-30, 70)
+        errors.append(
+            abs(grid(ta, rh, va, delta_tmrt) - utci(ta, ta + delta_tmrt, va, rh))
+        )
+
+    assert sum(errors) / len(errors) < 0.02
+    assert sorted(errors)[int(len(errors) * 0.99)] < 0.15
+
+    path = tmp_path / "grid.bin"
+    grid.save(path)
+    loaded = UtciGrid.load(path)
+    assert loaded is not None
+    assert loaded(21.3, 47.0, 3.2, 4.0) == grid(21.3, 47.0, 3.2, 4.0)
+
+    path.write_bytes(b"stale")
+    assert UtciGrid.load(path) is None
+
+
+async def test_sensor_uses_utci_model(hass) -> None:
+    """A sensor with the UTCI model must report the UTCI value."""
+    hass.states.async_set(
+        "weather.home",
+        "sunny",
+        {
+            "temperature": 77,
+            "temperature_unit": UnitOfTemperature.FAHRENHEIT,
+            "humidity": 50,
+            "wind_speed": 3.6,
+            "wind_speed_unit": UnitOfSpeed.KILOMETERS_PER_HOUR,
+        },
+    )
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="Home",
+        data={
+            CONF_NAME: "Home",
+            CONF_MODE: MODE_WEATHER,
+            CONF_TEMPERATURE_SOURCE: "weather.home",
+        },
+        options={CONF_MODEL: MODEL_UTCI},
+        version=2,
+    )
+    entry.add_to_hass(hass)
+    with patch("custom_components.felt_temperature.sensor._async_load_utci_grid"):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+    entity_id = er.async_get(hass).async_get_entity_id("sensor", DOMAIN, entry.entry_id)
+    assert hass.states.get(entity_id).state == "24.6"